@@ -6,7 +6,6 @@ import pandas as pd
 from tqdm import tqdm
 import yfinance as yf
 from dotenv import load_dotenv
-from pycountry_convert import country_name_to_country_alpha2, country_alpha2_to_continent_code
 
 
 # Ruta base = carpeta del proyecto
@@ -14,31 +13,35 @@ BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 
 # Ruta para almacenar los datos de la empresa obtenidos de yfinance
 sDATA_OUTPUT_PATH = os.path.join(BASE_DIR, "OutputDatosEmpresa.xlsx")
+# Ruta del proyecto BestStockExplorer, cuya caché de `.info` se comparte
+sBEST_STOCK_EXPLORER_DIR = os.path.abspath(os.path.join(BASE_DIR, "..", "BestStockExplorer"))
+sys.path.append(sBEST_STOCK_EXPLORER_DIR)
+
+from Lib.CacheInfo import fCrearCacheInfo
+from Lib.DatosDeReferencia import fObtenerContinente, fObtenerMonedaPorDefecto
 
 # Cargar el archivo .env
 load_dotenv()
 
 # Diccionario global para almacenar tipos de cambio ya consultados
 dTiposDeCambio = {}
+# Caché persistente de `.info` compartida con BestStockExplorer: se abre en la primera consulta (None si está desactivada)
+oCacheInfo = None
+bCacheInfoAbierta = False
 
 
-def fObtenerContinente(sPais):
-   try:
-      sCodigoPais = country_name_to_country_alpha2(sPais)
-      sCodigoContinente = country_alpha2_to_continent_code(sCodigoPais)
-      lContinentes = {
-         "NA": "North America",
-         "SA": "South America",
-         "EU": "Europe",
-         "AF": "Africa",
-         "AS": "Asia",
-         "OC": "Oceania"
-      }
-
-      return lContinentes.get(sCodigoContinente, "Desconocido")
-   except:
-      return "Desconocido"
+def fObtenerCacheInfo():
+   """
+   Abre la caché compartida la primera vez que se necesita, no al importar el módulo.
 
+   Retorna:
+      CacheInfo: La caché, o None si está desactivada en Config.json de BestStockExplorer.
+   """
+   global oCacheInfo, bCacheInfoAbierta
+   if not bCacheInfoAbierta:
+      oCacheInfo = fCrearCacheInfo()
+      bCacheInfoAbierta = True
+   return oCacheInfo
 
 
 def fObtenerCambioFixer(sMonedaOrigen, sMonedaDestino="USD"):
@@ -95,9 +98,14 @@ def fEvaluarAccion(sTicker: str) -> tuple:
    """
    try:
       # Obtener los datos de la acción desde Yahoo Finance
-      lAccion = yf.Ticker(sTicker)
-      time.sleep(1)  # Pausa para evitar bloqueos
-      lDatos = lAccion.info
+      def fDescargarInfo(sTickerDescarga):
+         lAccion = yf.Ticker(sTickerDescarga)
+         time.sleep(1)  # Pausa para evitar bloqueos
+         return lAccion.info
+
+      # Leer a través de la caché compartida: solo se descarga si el `.info` guardado ha caducado
+      oCache = fObtenerCacheInfo()
+      lDatos = oCache.fObtener(sTicker, fDescargarInfo) if oCache is not None else fDescargarInfo(sTicker)
 
       # Validar que se haya obtenido información útil
       if not lDatos or lDatos.get("longName") is None:
@@ -106,7 +114,7 @@ def fEvaluarAccion(sTicker: str) -> tuple:
       # Obtener información de la empresa
       sName = lDatos.get("longName", "Nombre no disponible")
       sSector = lDatos.get("sector", "Sector no disponible")
-      sMoneda = lDatos.get("financialCurrency", "USD")  # Moneda original
+      sMoneda = lDatos.get("financialCurrency") or fObtenerMonedaPorDefecto(sTicker)  # Moneda original (o la de su bolsa)
       sPais = lDatos.get("country", "Desconocido")
       sContinente = fObtenerContinente(sPais)
 
@@ -327,3 +335,7 @@ if dfResultado:
    fGuardarResultadoEnExcel(dfResultado)
 else:
    print("ERROR   - No se pudo evaluar la acción.")
+
+if oCacheInfo is not None:
+   print(f"INFO    - {oCacheInfo.fResumen()}")
+   oCacheInfo.fCerrar()
@@ -0,0 +1,73 @@
+# Benchmarks\BenchmarkAgregados.py
+import sys, os, time
+import numpy as np
+import pandas as pd
+
+"""
+================================================================================
+Benchmark de las Tablas Agregadas del Listado
+--------------------------------------------------------------------------------
+
+Sobre listados sintéticos (con unos 200 países):
+   - Compara el groupby del panel de países del visualizador con la lectura de
+     la tabla de agregados, y comprueba que dan el mismo P/E promedio.
+   - Mide el cálculo completo de la tabla, el que hace GenerarMetricas con
+     cada listado.
+
+Uso:
+   python Benchmarks/BenchmarkAgregados.py [iNumeroDeFilas ...]
+
+================================================================================
+"""
+
+# Ruta base = carpeta del proyecto
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from Lib.AgregadosDelListado import fCalcularTodos
+from ListadoSintetico import fGenerarListado
+
+
+def fConPaises(iNumeroDeFilas: int) -> pd.DataFrame:
+   dfListado = fGenerarListado(iNumeroDeFilas)
+   oAleatorio = np.random.default_rng(3)
+   dfListado["País"] = pd.array([f"País {i}" for i in oAleatorio.integers(0, 200, iNumeroDeFilas)], dtype="string")
+   return dfListado
+
+
+def fPanelAnterior(dfOriginal: pd.DataFrame) -> pd.DataFrame:
+   """
+   Cálculo anterior del panel de valoración por país del visualizador.
+   """
+   df_PER_Paises = dfOriginal[dfOriginal["P/E"] <= 100]
+   df_Paises = df_PER_Paises.groupby("País").agg(pe_promedio=("P/E", "mean"), num_empresas=("Nombre", "count")).reset_index()
+   return df_Paises[df_Paises["num_empresas"] >= 3]
+
+
+def fMedir(fFuncion, iRepeticiones: int = 5):
+   fMejor = float("inf")
+   for _ in range(iRepeticiones):
+      fInicio = time.perf_counter()
+      oResultado = fFuncion()
+      fMejor = min(fMejor, time.perf_counter() - fInicio)
+   return oResultado, fMejor
+
+
+if __name__ == "__main__":
+   lTamanos = [int(sArgumento) for sArgumento in sys.argv[1:]] or [2_500, 100_000]
+
+   print(f"{'Filas':>8} {'Panel groupby (ms)':>19} {'Panel tabla (ms)':>17} {'Tabla completa (ms)':>20} {'Grupos':>7}")
+   for iNumeroDeFilas in lTamanos:
+      dfListado = fConPaises(iNumeroDeFilas)
+      dfAgregados, fCompleto = fMedir(lambda: fCalcularTodos(dfListado), 3)
+
+      # Panel de países: groupby en cada rerun frente a filtrar la tabla ya calculada
+      dfPanel, fPanelGroupby = fMedir(lambda: fPanelAnterior(dfListado))
+      dfTabla, fPanelTabla = fMedir(lambda: dfAgregados.loc[(dfAgregados["Dimension"] == "País") & (dfAgregados["num_pe"] >= 3), ["Grupo", "pe_promedio", "num_pe"]])
+      assert dfPanel["País"].tolist() == dfTabla["Grupo"].tolist()
+      assert np.allclose(dfPanel["pe_promedio"].to_numpy(), dfTabla["pe_promedio"].to_numpy())
+
+      print(f"{iNumeroDeFilas:>8} {fPanelGroupby * 1000:>19.2f} {fPanelTabla * 1000:>17.2f} {fCompleto * 1000:>20.1f} {len(dfAgregados):>7}")
+
+   print("INFO    - OK")
@@ -0,0 +1,70 @@
+# Benchmarks\BenchmarkAlmacenDeDatos.py
+import sys, os, time
+import shutil
+import tempfile
+
+"""
+================================================================================
+Benchmark de Carga del Listado: Excel frente a Parquet
+--------------------------------------------------------------------------------
+
+Genera listados sintéticos con las columnas de lCOLUMNAS_RESULTADO y compara el
+tiempo de carga de cada consumidor:
+   - Excel: pd.read_excel (openpyxl), como antes.
+   - Parquet: fCargarListado, completo y solo con las columnas del heatmap.
+Comprueba además que el Parquet conserva los tipos y los valores del listado.
+
+Uso:
+   python Benchmarks/BenchmarkAlmacenDeDatos.py [iNumeroDeFilas ...]
+
+================================================================================
+"""
+
+# Ruta base = carpeta del proyecto
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.dirname(__file__))
+
+import pandas as pd
+import Lib.AlmacenDeDatos as AlmacenDeDatos
+from ListadoSintetico import fGenerarListado
+
+
+def fMedir(fFuncion, iRepeticiones: int = 3) -> tuple:
+   fMejor = float("inf")
+   for _ in range(iRepeticiones):
+      fInicio = time.perf_counter()
+      oResultado = fFuncion()
+      fMejor = min(fMejor, time.perf_counter() - fInicio)
+   return fMejor, oResultado
+
+
+if __name__ == "__main__":
+   lTamanos = [int(sArgumento) for sArgumento in sys.argv[1:]] or [2_500, 100_000]
+   lColumnasHeatmap = ["Sector", "Continente", "País", "Puntuación", "P/E", "ROE (%)", "Beta", "PEG"]
+
+   # Trabajar sobre ficheros temporales para no tocar los datos del proyecto
+   sCarpetaTemporal = tempfile.mkdtemp()
+   AlmacenDeDatos.sLISTADO_PATH = os.path.join(sCarpetaTemporal, "ListadoDeMejoresAcciones.parquet")
+   AlmacenDeDatos.sLISTADO_EXCEL_PATH = os.path.join(sCarpetaTemporal, "ListadoDeMejoresAcciones.xlsx")
+
+   print(f"{'Filas':>8} {'Excel (s)':>10} {'Parquet (s)':>12} {'Columnas (s)':>13} {'Aceleración':>12} {'Tamaño xlsx/parquet':>20}")
+   for iNumeroDeFilas in lTamanos:
+      dfListado = fGenerarListado(iNumeroDeFilas)
+      AlmacenDeDatos.fGuardarListado(dfListado, bExportarExcel=True)
+
+      iRepeticiones = 1 if iNumeroDeFilas > 10_000 else 3
+      fExcel, _ = fMedir(lambda: pd.read_excel(AlmacenDeDatos.sLISTADO_EXCEL_PATH, engine="openpyxl"), iRepeticiones)
+      fParquet, dfCargado = fMedir(AlmacenDeDatos.fCargarListado)
+      fColumnas, _ = fMedir(lambda: AlmacenDeDatos.fCargarListado(lColumnasHeatmap))
+
+      # Los tipos y valores se conservan tal cual
+      assert dfCargado.equals(AlmacenDeDatos.fNormalizarListado(dfListado)), "El Parquet no conserva el listado"
+      assert isinstance(dfCargado["Calificación"].dtype, pd.CategoricalDtype) and dfCargado["Puntuación"].dtype == "int64"
+
+      iBytesExcel = os.path.getsize(AlmacenDeDatos.sLISTADO_EXCEL_PATH)
+      iBytesParquet = os.path.getsize(AlmacenDeDatos.sLISTADO_PATH)
+      print(f"{iNumeroDeFilas:>8} {fExcel:>10.3f} {fParquet:>12.4f} {fColumnas:>13.4f} {fExcel / fParquet:>11.0f}x {iBytesExcel / 1e6:>9.1f}MB/{iBytesParquet / 1e6:.1f}MB")
+
+   shutil.rmtree(sCarpetaTemporal, ignore_errors=True)
+   print("INFO    - OK")
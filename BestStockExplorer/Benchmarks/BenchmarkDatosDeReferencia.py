@@ -0,0 +1,83 @@
+# Benchmarks\BenchmarkDatosDeReferencia.py
+import sys, os, time
+import random
+
+"""
+================================================================================
+Microbenchmark de Consultas de Datos de Referencia
+--------------------------------------------------------------------------------
+
+Compara el coste por ticker de obtener el continente con la función clásica
+(dos llamadas a pycountry_convert, un diccionario literal y un try/except) y
+con las tablas precompiladas de Lib/DatosDeReferencia.py, comprobando que
+ambas dan el mismo resultado. También mide la consulta sufijo -> moneda.
+
+Uso:
+   python Benchmarks/BenchmarkDatosDeReferencia.py [iRepeticiones]
+
+================================================================================
+"""
+
+# Ruta base = carpeta del proyecto
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+
+import pandas as pd
+from pycountry_convert import country_name_to_country_alpha2, country_alpha2_to_continent_code
+
+fInicioCarga = time.perf_counter()
+from Lib.DatosDeReferencia import fObtenerContinente, fObtenerMonedaPorDefecto
+fTiempoCarga = time.perf_counter() - fInicioCarga
+
+
+def fObtenerContinenteClasico(sPais):
+   # Copia literal de la función original de GenerarMetricas
+   try:
+      sCodigoPais = country_name_to_country_alpha2(sPais)
+      sCodigoContinente = country_alpha2_to_continent_code(sCodigoPais)
+      lContinentes = {
+         "NA": "North America",
+         "SA": "South America",
+         "EU": "Europe",
+         "AF": "Africa",
+         "AS": "Asia",
+         "OC": "Oceania"
+      }
+
+      return lContinentes.get(sCodigoContinente, "Desconocido")
+   except:
+      return "Desconocido"
+
+
+def fMedir(fFuncion, lEntradas, iRepeticiones):
+   fInicio = time.perf_counter()
+   for _ in range(iRepeticiones):
+      for sEntrada in lEntradas:
+         fFuncion(sEntrada)
+   return (time.perf_counter() - fInicio) / (iRepeticiones * len(lEntradas)) * 1e9
+
+
+if __name__ == "__main__":
+   iRepeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+   # Países tal y como los devuelve Yahoo, incluidos algunos desconocidos o vacíos
+   lPaises = ["United States", "Canada", "Brazil", "Mexico", "Germany", "United Kingdom", "France", "Netherlands",
+              "Spain", "Italy", "Switzerland", "Portugal", "Ireland", "Belgium", "Austria", "Sweden", "Norway",
+              "Finland", "Denmark", "Russia", "Poland", "Hungary", "Greece", "Turkey", "Israel", "Japan",
+              "Australia", "China", "India", "Hong Kong", "Taiwan", "South Korea", "Bermuda", "Desconocido", ""]
+   oAleatorio = random.Random(0)
+   lEntradasPais = [oAleatorio.choice(lPaises) for _ in range(2540)]
+   lTickers = pd.read_csv(os.path.join(BASE_DIR, "Data", "TickersDeEmpresas.csv"))["Ticker"].astype(str).tolist()
+
+   lDiferencias = [sPais for sPais in lPaises if fObtenerContinente(sPais) != fObtenerContinenteClasico(sPais)]
+   assert not lDiferencias, f"Resultados distintos para: {lDiferencias}"
+
+   fAntes = fMedir(fObtenerContinenteClasico, lEntradasPais, iRepeticiones)
+   fDespues = fMedir(fObtenerContinente, lEntradasPais, iRepeticiones)
+   fMoneda = fMedir(fObtenerMonedaPorDefecto, lTickers, iRepeticiones)
+
+   print(f"INFO    - Carga de tablas al importar: {fTiempoCarga * 1000:.2f} ms")
+   print(f"INFO    - País -> continente (pycountry_convert): {fAntes:8.0f} ns/ticker")
+   print(f"INFO    - País -> continente (precompilado):      {fDespues:8.0f} ns/ticker  ({fAntes / fDespues:.0f}x)")
+   print(f"INFO    - Sufijo -> moneda por defecto:           {fMoneda:8.0f} ns/ticker")
+   print("INFO    - OK")
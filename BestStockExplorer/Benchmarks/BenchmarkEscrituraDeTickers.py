@@ -0,0 +1,113 @@
+# Benchmarks\BenchmarkEscrituraDeTickers.py
+import sys, os, time
+import shutil
+import tempfile
+import pandas as pd
+
+"""
+================================================================================
+Benchmark de la Escritura del CSV de Tickers
+--------------------------------------------------------------------------------
+
+Simula la escritura de un scraping completo de iNumeroDeEmpresas empresas
+nuevas (sin navegador ni red):
+   - Anterior: pd.concat sobre todo el DataFrame y to_csv del CSV entero con
+     cada empresa nueva (O(n²) en filas escritas).
+   - EscritorDeTickers: anexado por lotes y compactación única al final.
+Comprueba que los dos CSV son idénticos y que, tras un corte simulado (lotes
+ya volcados, filas pendientes perdidas y una última línea incompleta), al
+reanudar se conservan los lotes volcados, se descarta la línea incompleta y la
+compactación final elimina los tickers repetidos.
+
+Uso:
+   python Benchmarks/BenchmarkEscrituraDeTickers.py [iNumeroDeEmpresas]
+
+================================================================================
+"""
+
+# Ruta base = carpeta del proyecto
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+
+from Lib.EscritorDeTickers import EscritorDeTickers
+
+
+def fGenerarEmpresas(iNumeroDeEmpresas: int) -> list:
+   """
+   Empresas sintéticas en el orden en que las encuentra el scraper (con nombres con comas y comillas, que van entre comillas en el CSV).
+   """
+   return [
+      {"Nombre": f'Empresa {i}, "Holding" SA' if i % 7 == 0 else f"Empresa {i} SA", "Ticker": f"T{i}.MC", "Indice": f"indice-{i // 100}"}
+      for i in range(iNumeroDeEmpresas)
+   ]
+
+
+def fEscrituraAnterior(sRuta: str, lEmpresas: list) -> int:
+   """
+   Lo que hacía fObtenerTickers con cada empresa nueva. Retorna los bytes escritos.
+   """
+   dfEmpresasExistentes = pd.DataFrame(columns=['Indice', 'Nombre', 'Ticker'])
+   iBytes = 0
+   for dEmpresa in lEmpresas:
+      dfEmpresasExistentes = pd.concat([dfEmpresasExistentes, pd.DataFrame([dEmpresa])], ignore_index=True)
+      dfEmpresasExistentes.to_csv(sRuta, index=False, encoding='utf-8')
+      iBytes += os.path.getsize(sRuta)
+   return iBytes
+
+
+def fEscrituraNueva(sRuta: str, lEmpresas: list) -> int:
+   with EscritorDeTickers(sRuta) as oEscritor:
+      for dEmpresa in lEmpresas:
+         oEscritor.fAnadir(dEmpresa)
+   return os.path.getsize(sRuta)
+
+
+def fLeer(sRuta: str) -> pd.DataFrame:
+   return pd.read_csv(sRuta, dtype=str, keep_default_na=False)
+
+
+if __name__ == "__main__":
+   iNumeroDeEmpresas = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+   lEmpresas = fGenerarEmpresas(iNumeroDeEmpresas)
+   sCarpetaTemporal = tempfile.mkdtemp()
+
+   sRutaAnterior = os.path.join(sCarpetaTemporal, "TickersAnterior.csv")
+   fInicio = time.perf_counter()
+   iBytesAnterior = fEscrituraAnterior(sRutaAnterior, lEmpresas)
+   fAnterior = time.perf_counter() - fInicio
+
+   sRutaNueva = os.path.join(sCarpetaTemporal, "TickersNuevo.csv")
+   fInicio = time.perf_counter()
+   iBytesNuevo = fEscrituraNueva(sRutaNueva, lEmpresas)
+   fNuevo = time.perf_counter() - fInicio
+
+   pd.testing.assert_frame_equal(fLeer(sRutaNueva), fLeer(sRutaAnterior))
+   print(f"{'Método':<18} {'Tiempo (s)':>11} {'Escrito (MB)':>13}")
+   print(f"{'Anterior':<18} {fAnterior:>11.2f} {iBytesAnterior / 1e6:>13.1f}")
+   print(f"{'EscritorDeTickers':<18} {fNuevo:>11.2f} {iBytesNuevo / 1e6:>13.1f}")
+   print(f"INFO    - {iNumeroDeEmpresas} empresas: {fAnterior / fNuevo:.0f}x más rápido")
+
+   # Corte simulado: 2 lotes volcados, filas pendientes sin volcar y una línea a medio escribir
+   sRutaCorte = os.path.join(sCarpetaTemporal, "TickersCorte.csv")
+   oEscritor = EscritorDeTickers(sRutaCorte, iLote=100, fSegundosEntreVolcados=3600)
+   oEscritor.fAbrir()
+   for dEmpresa in lEmpresas[:250]:
+      oEscritor.fAnadir(dEmpresa)
+   os.write(oEscritor.iDescriptor, b'indice-2,"Empresa a medio')
+   os.close(oEscritor.iDescriptor)
+
+   # Reanudar: el scraper vuelve a encontrar todas las empresas (algunas repetidas, como entre índices)
+   oEscritor = EscritorDeTickers(sRutaCorte)
+   setTickersExistentes = oEscritor.fTickersExistentes()
+   assert len(setTickersExistentes) == 200
+   with oEscritor:
+      for dEmpresa in lEmpresas:
+         if dEmpresa["Ticker"] not in setTickersExistentes:
+            oEscritor.fAnadir(dEmpresa)
+      # Filas repetidas que solo elimina la compactación
+      for dEmpresa in lEmpresas[:10]:
+         oEscritor.fAnadir(dEmpresa)
+   pd.testing.assert_frame_equal(fLeer(sRutaCorte), fLeer(sRutaAnterior))
+
+   shutil.rmtree(sCarpetaTemporal, ignore_errors=True)
+   print("INFO    - OK")
@@ -0,0 +1,101 @@
+# Benchmarks\BenchmarkEstadisticas.py
+import sys, os, time
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+
+"""
+================================================================================
+Benchmark del Fichero de Estadísticas del Listado
+--------------------------------------------------------------------------------
+
+Sobre listados sintéticos guardados en una carpeta temporal:
+   - Compara el cálculo anterior de las opciones y rangos de la barra lateral
+     (reemplazar infinitos, quitar vacíos y buscar mínimo y máximo en cada
+     columna) con leerlos del fichero de estadísticas, y comprueba que son
+     idénticos.
+   - Comprueba que los valores de los combos del heatmap coinciden con los
+     valores distintos del listado.
+Muestra también el tamaño del fichero y lo que cuesta generarlo.
+
+Uso:
+   python Benchmarks/BenchmarkEstadisticas.py [iNumeroDeFilas ...]
+
+================================================================================
+"""
+
+# Ruta base = carpeta del proyecto
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.dirname(__file__))
+
+import Lib.AlmacenDeDatos as AlmacenDeDatos
+import Lib.EstadisticasDelListado as EstadisticasDelListado
+from Lib.FiltradoDeOutliers import fFiltrarOutliers, fAplicarFiltrosExplicitos
+from Lib.DatosDelVisualizador import fOpcionesSidebar, lCOLUMNAS_TEXTO, lCOLUMNAS_NUMERICAS
+from ListadoSintetico import fGenerarListado
+
+
+def fOpcionesAnteriores(dfFiltradoExplicito: pd.DataFrame) -> tuple:
+   """
+   Cálculo anterior de las opciones y rangos de la barra lateral.
+   """
+   dOpcionesTexto = {col: ["Todos"] + sorted(dfFiltradoExplicito[col].dropna().unique().tolist()) for col in lCOLUMNAS_TEXTO}
+   dRangosNumericos = {}
+   for col in lCOLUMNAS_NUMERICAS:
+      if col in dfFiltradoExplicito.columns:
+         serie = dfFiltradoExplicito[col].replace([np.inf, -np.inf], np.nan).dropna()
+         min_val = int(serie.min()) if not serie.empty else 0
+         max_val = int(serie.max()) if not serie.empty else 1
+         dRangosNumericos[col] = (min_val, max_val)
+   return dOpcionesTexto, dRangosNumericos
+
+
+def fMedir(fFuncion, iRepeticiones: int = 5):
+   fMejor = float("inf")
+   for _ in range(iRepeticiones):
+      fInicio = time.perf_counter()
+      oResultado = fFuncion()
+      fMejor = min(fMejor, time.perf_counter() - fInicio)
+   return oResultado, fMejor
+
+
+if __name__ == "__main__":
+   lTamanos = [int(sArgumento) for sArgumento in sys.argv[1:]] or [2_500, 100_000]
+
+   # Trabajar sobre ficheros temporales para no tocar los datos del proyecto
+   sCarpetaTemporal = tempfile.mkdtemp()
+   AlmacenDeDatos.sLISTADO_PATH = os.path.join(sCarpetaTemporal, "ListadoDeMejoresAcciones.parquet")
+   EstadisticasDelListado.sESTADISTICAS_PATH = os.path.join(sCarpetaTemporal, "EstadisticasDelListado.json")
+
+   print(f"{'Filas':>8} {'Recorrido (ms)':>15} {'Fichero (ms)':>13} {'Fichero (KB)':>13} {'Generar (ms)':>13}")
+   for iNumeroDeFilas in lTamanos:
+      dfListado = fGenerarListado(iNumeroDeFilas)
+      # Algunos infinitos y una columna sin valores finitos, como en los datos reales
+      dfListado.loc[dfListado.index[:3], "PEG"] = np.inf
+      dfListado["Valor Intrínseco ($)"] = np.nan
+      AlmacenDeDatos.fGuardarListado(dfListado)
+
+      # Lo que hace GenerarMetricas al guardar el listado
+      dEstadisticas, fGenerar = fMedir(lambda: EstadisticasDelListado.fCalcularEstadisticas(AlmacenDeDatos.fNormalizarListado(dfListado)), 1)
+      EstadisticasDelListado.fGuardarEstadisticas(dEstadisticas)
+      assert EstadisticasDelListado.fEstadisticasAlDia()
+
+      # Lo que hacía el visualizador: recorrer la vista filtrada del listado cargado
+      dfCargado = AlmacenDeDatos.fCargarListado()
+      dfFiltradoExplicito = fAplicarFiltrosExplicitos(fFiltrarOutliers(dfCargado))
+      tAnterior, fRecorrido = fMedir(lambda: fOpcionesAnteriores(dfFiltradoExplicito))
+      tFichero, fFichero = fMedir(lambda: fOpcionesSidebar(EstadisticasDelListado.fObtenerVista("Visualizador", dfFiltradoExplicito)))
+      assert tFichero == tAnterior
+
+      # Combos del heatmap
+      dListado = EstadisticasDelListado.fObtenerVista("Listado", dfCargado)
+      for sColumna in ["Continente", "País", "Sector"]:
+         assert dListado["dCategoricas"][sColumna]["lValores"] == sorted(dfCargado[sColumna].dropna().unique().tolist())
+
+      iBytes = os.path.getsize(EstadisticasDelListado.sESTADISTICAS_PATH)
+      print(f"{iNumeroDeFilas:>8} {fRecorrido * 1000:>15.2f} {fFichero * 1000:>13.2f} {iBytes / 1024:>13.1f} {fGenerar * 1000:>13.1f}")
+
+   shutil.rmtree(sCarpetaTemporal, ignore_errors=True)
+   print("INFO    - OK")
@@ -0,0 +1,89 @@
+# Benchmarks\BenchmarkExportacion.py
+import sys, os, time
+import io
+import shutil
+import logging
+import tempfile
+
+"""
+================================================================================
+Benchmark de la Exportación de Resultados del Visualizador
+--------------------------------------------------------------------------------
+
+Compara, sobre listados sintéticos:
+   - El Excel que se generaba en cada rerun (to_excel a un BytesIO).
+   - La exportación por bloques en CSV, Parquet y Excel (constant_memory).
+Y comprueba con AppTest que un rerun del visualizador ya no genera ningún
+fichero mientras no se pulsa el botón de descarga.
+
+Uso:
+   python Benchmarks/BenchmarkExportacion.py [iNumeroDeFilas ...]
+
+================================================================================
+"""
+
+# Ruta base = carpeta del proyecto
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.dirname(__file__))
+
+import streamlit as st
+import streamlit.logger
+from streamlit.testing.v1 import AppTest
+import Lib.AlmacenDeDatos as AlmacenDeDatos
+import Lib.AgregadosDelListado as AgregadosDelListado
+import Lib.EstadisticasDelListado as EstadisticasDelListado
+import Lib.ExportacionDelVisualizador as ExportacionDelVisualizador
+from ListadoSintetico import fGenerarListado
+
+sVISUALIZADOR_PATH = os.path.join(BASE_DIR, "Lib", "VisualizadorDeAcciones.py")
+
+
+def fMedir(fFuncion, dfDatos) -> tuple:
+   fInicio = time.perf_counter()
+   iBytes = len(fFuncion(dfDatos))
+   return iBytes, time.perf_counter() - fInicio
+
+
+def fExcelAnterior(dfDatos) -> bytes:
+   oSalida = io.BytesIO()
+   dfDatos.to_excel(oSalida, index=False)
+   return oSalida.getvalue()
+
+
+if __name__ == "__main__":
+   lTamanos = [int(sArgumento) for sArgumento in sys.argv[1:]] or [2_500, 50_000]
+   # Silenciar los avisos de Streamlit por ejecutarse sin servidor
+   streamlit.logger.set_log_level(logging.ERROR)
+
+   print(f"{'Filas':>8} {'Formato':>16} {'Tamaño (KB)':>12} {'Tiempo (s)':>11}")
+   for iNumeroDeFilas in lTamanos:
+      dfDatos = fGenerarListado(iNumeroDeFilas)
+      lFormatos = [("Excel (anterior)", fExcelAnterior)] + [(sNombre, tFormato[2]) for sNombre, tFormato in ExportacionDelVisualizador.dFORMATOS_EXPORTACION.items()]
+      for sNombre, fFuncion in lFormatos:
+         iBytes, fSegundos = fMedir(fFuncion, dfDatos)
+         print(f"{iNumeroDeFilas:>8} {sNombre:>16} {iBytes / 1024:>12.1f} {fSegundos:>11.2f}")
+
+   # Un rerun sin pulsar el botón no debe exportar nada
+   sCarpetaTemporal = tempfile.mkdtemp()
+   AlmacenDeDatos.sLISTADO_PATH = os.path.join(sCarpetaTemporal, "ListadoDeMejoresAcciones.parquet")
+   AgregadosDelListado.sAGREGADOS_PATH = os.path.join(sCarpetaTemporal, "AgregadosDelListado.parquet")
+   EstadisticasDelListado.sESTADISTICAS_PATH = os.path.join(sCarpetaTemporal, "EstadisticasDelListado.json")
+   AlmacenDeDatos.sLISTADO_EXCEL_PATH = os.path.join(sCarpetaTemporal, "ListadoDeMejoresAcciones.xlsx")
+   AlmacenDeDatos.fGuardarListado(fGenerarListado(lTamanos[0]))
+   st.cache_data.clear()
+   st.cache_resource.clear()
+
+   lLlamadas = []
+   for sNombre, (sExtension, sMime, fFuncion) in list(ExportacionDelVisualizador.dFORMATOS_EXPORTACION.items()):
+      ExportacionDelVisualizador.dFORMATOS_EXPORTACION[sNombre] = (sExtension, sMime, lambda dfDatos, fFuncion=fFuncion: lLlamadas.append(1) or fFuncion(dfDatos))
+   oApp = AppTest.from_file(sVISUALIZADOR_PATH, default_timeout=600).run()
+   assert not oApp.exception, oApp.exception[0].message
+   oSlider = next(oWidget for oWidget in oApp.slider if oWidget.label.endswith("Puntuación:"))
+   oSlider.set_value((oSlider.min + 1, oSlider.max)).run()
+   assert not oApp.exception, oApp.exception[0].message
+   assert not lLlamadas, "Se ha generado la exportación sin pulsar el botón"
+   print("INFO    - Reruns sin pulsar el botón: 0 exportaciones generadas")
+
+   shutil.rmtree(sCarpetaTemporal, ignore_errors=True)
+   print("INFO    - OK")
@@ -0,0 +1,94 @@
+# Benchmarks\BenchmarkFiltradoDeOutliers.py
+import sys, os, time
+import numpy as np
+import pandas as pd
+
+"""
+================================================================================
+Benchmark del Filtrado de Outliers
+--------------------------------------------------------------------------------
+
+Compara el bucle anterior del visualizador (dos quantile() por columna,
+asignaciones con .loc y dropna) con Lib/FiltradoDeOutliers.py (una sola pasada
+de cuantiles y una matriz de máscaras), comprueba que el resultado es idéntico
+y mide la respuesta memorizada de fObtenerSinOutliers.
+
+Uso:
+   python Benchmarks/BenchmarkFiltradoDeOutliers.py [iNumeroDeFilas ...]
+
+================================================================================
+"""
+
+# Ruta base = carpeta del proyecto
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from Lib.FiltradoDeOutliers import fFiltrarOutliers, fObtenerSinOutliers, lReglasOutliers, UMBRAL_PUNTUACION, UMBRAL_CAPITALIZACION
+from ListadoSintetico import fGenerarListado
+
+
+def fFiltrarOutliersAnterior(dfOriginal: pd.DataFrame) -> pd.DataFrame:
+   """
+   Implementación anterior (la del visualizador), como referencia.
+   """
+   dfProtegidas = dfOriginal[
+      (dfOriginal["Puntuación"] > UMBRAL_PUNTUACION) |
+      (dfOriginal["Capitalización ($)"] > UMBRAL_CAPITALIZACION)
+   ]
+   dfFiltrables = dfOriginal.drop(dfProtegidas.index)
+   for col, reglas in lReglasOutliers.items():
+      if col in dfFiltrables.columns:
+         q10 = dfFiltrables[col].quantile(0.10)
+         q90 = dfFiltrables[col].quantile(0.90)
+         iqr = q90 - q10
+         factor = 1.5
+         lower_bound = q10 - factor * iqr
+         upper_bound = q90 + factor * iqr
+         if reglas["min"] and reglas["max"]:
+            dfFiltrables.loc[(dfFiltrables[col] < lower_bound) | (dfFiltrables[col] > upper_bound), col] = None
+         elif reglas["min"]:
+            dfFiltrables.loc[(dfFiltrables[col] < lower_bound), col] = None
+         elif reglas["max"]:
+            dfFiltrables.loc[(dfFiltrables[col] > upper_bound), col] = None
+   dfFiltrables = dfFiltrables.dropna(subset=list(lReglasOutliers.keys()))
+   return pd.concat([dfProtegidas, dfFiltrables], ignore_index=True)
+
+
+def fConOutliers(iNumeroDeFilas: int) -> pd.DataFrame:
+   """
+   Listado sintético con algunos valores extremos y vacíos para que el filtrado tenga trabajo.
+   """
+   dfListado = fGenerarListado(iNumeroDeFilas)
+   oAleatorio = np.random.default_rng(2)
+   for sColumna in lReglasOutliers:
+      aFilas = oAleatorio.choice(iNumeroDeFilas, max(1, iNumeroDeFilas // 50), replace=False)
+      dfListado.loc[dfListado.index[aFilas], sColumna] = oAleatorio.choice([-1e4, 1e4, np.nan], len(aFilas))
+   return dfListado
+
+
+def fMedir(fFuncion, dfDatos, iRepeticiones: int = 3) -> tuple:
+   fMejor = float("inf")
+   for _ in range(iRepeticiones):
+      fInicio = time.perf_counter()
+      dfResultado = fFuncion(dfDatos)
+      fMejor = min(fMejor, time.perf_counter() - fInicio)
+   return dfResultado, fMejor
+
+
+if __name__ == "__main__":
+   lTamanos = [int(sArgumento) for sArgumento in sys.argv[1:]] or [2_500, 100_000, 1_000_000]
+
+   print(f"{'Filas':>9} {'Conservadas':>12} {'Anterior (ms)':>14} {'Nuevo (ms)':>11} {'Memorizado (ms)':>16}")
+   for iNumeroDeFilas in lTamanos:
+      dfDatos = fConOutliers(iNumeroDeFilas)
+      dfAnterior, fAnterior = fMedir(fFiltrarOutliersAnterior, dfDatos)
+      dfNuevo, fNuevo = fMedir(fFiltrarOutliers, dfDatos)
+      pd.testing.assert_frame_equal(dfNuevo, dfAnterior)
+
+      fObtenerSinOutliers(dfDatos, iNumeroDeFilas)
+      _, fMemorizado = fMedir(lambda dfDatos: fObtenerSinOutliers(dfDatos, iNumeroDeFilas), dfDatos)
+
+      print(f"{iNumeroDeFilas:>9} {len(dfNuevo):>12} {fAnterior * 1000:>14.1f} {fNuevo * 1000:>11.1f} {fMemorizado * 1000:>16.3f}")
+
+   print("INFO    - OK")
@@ -0,0 +1,129 @@
+# Benchmarks\BenchmarkFragmentos.py
+import sys, os, time
+import shutil
+import logging
+import tempfile
+
+"""
+================================================================================
+Benchmark de los Fragmentos del Visualizador de Acciones
+--------------------------------------------------------------------------------
+
+Con las secciones del visualizador como fragmentos, un widget de una sección
+solo vuelve a ejecutar esa sección. Para listados sintéticos compara:
+   - Rerun completo: lo que costaba antes cambiar la selección de "Comparar
+     Acciones" (AppTest ejecuta siempre el script entero).
+   - Rerun de cada sección: el trabajo que hace su fragmento por sí solo, con
+     las cachés calientes (tabla paginada, comparación, gráficos avanzados y
+     análisis por país), incluida la serialización de sus figuras.
+
+Uso:
+   python Benchmarks/BenchmarkFragmentos.py [iNumeroDeFilas ...]
+
+================================================================================
+"""
+
+# Ruta base = carpeta del proyecto
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.dirname(__file__))
+
+import plotly.express as px
+import streamlit as st
+import streamlit.logger
+from streamlit.testing.v1 import AppTest
+import Lib.AlmacenDeDatos as AlmacenDeDatos
+import Lib.AgregadosDelListado as AgregadosDelListado
+import Lib.EstadisticasDelListado as EstadisticasDelListado
+import Lib.DatosDelVisualizador as DatosDelVisualizador
+from Lib.GraficosDelVisualizador import fEsModoLigero
+from ListadoSintetico import fGenerarListado
+
+sVISUALIZADOR_PATH = os.path.join(BASE_DIR, "Lib", "VisualizadorDeAcciones.py")
+
+
+def fMejorTiempo(fFuncion, iRepeticiones: int = 3) -> float:
+   fMejor = float("inf")
+   for _ in range(iRepeticiones):
+      fInicio = time.perf_counter()
+      fFuncion()
+      fMejor = min(fMejor, time.perf_counter() - fInicio)
+   return fMejor
+
+
+def fMedirSecciones(dDatos: dict) -> dict:
+   """
+   Retorna:
+      dict: Segundos del trabajo de cada fragmento con las cachés calientes y sin filtros en la barra lateral.
+   """
+   oIndice = dDatos["oIndiceDeFiltros"]
+   dfFiltradoExplicito = dDatos["dfFiltradoExplicito"]
+   dFiltrosTexto = {sColumna: "Todos" for sColumna in dDatos["dOpcionesTexto"]}
+   dFiltrosNumericos = dict(dDatos["dRangosNumericos"])
+   aFilas = oIndice.fFiltrar(dFiltrosTexto, dFiltrosNumericos)
+   dfFiltrado = dfFiltradoExplicito.take(aFilas)
+   tFirmaFiltros = DatosDelVisualizador.fFirmaDeFiltros(dFiltrosTexto, dFiltrosNumericos)
+   bLigero = fEsModoLigero(len(dfFiltrado))
+   lSeleccion = dfFiltrado["Nombre"].unique()[:5].tolist()
+
+   def fTabla():
+      aFilasTabla = oIndice.fBuscar(oIndice.fOrdenar(aFilas, "Puntuación", False), "Nombre", "")
+      dfFiltradoExplicito.take(aFilasTabla[:50])
+
+   def fComparacion():
+      dfComparacion = dfFiltrado[dfFiltrado["Nombre"].isin(lSeleccion)]
+      px.bar(dfComparacion, x="Nombre", y="Puntuación", color="Sector", title="Comparación de Puntuación").to_json()
+
+   def fGraficos():
+      for oFigura in DatosDelVisualizador.fObtenerGraficosAvanzados(dDatos["sHash"], tFirmaFiltros, bLigero, dfFiltrado):
+         oFigura.to_json()
+
+   def fPais():
+      DatosDelVisualizador.fObtenerGraficoPorDimension(dDatos["sHash"], "País", dDatos["dfAgregados"]).to_json()
+
+   dSecciones = {"Tabla": fTabla, "Comparación": fComparacion, "Gráficos": fGraficos, "País": fPais}
+   for fSeccion in dSecciones.values():
+      fSeccion()  # Calentar las cachés
+   return {sSeccion: fMejorTiempo(fSeccion) for sSeccion, fSeccion in dSecciones.items()}
+
+
+if __name__ == "__main__":
+   lTamanos = [int(sArgumento) for sArgumento in sys.argv[1:]] or [2_500, 20_000]
+   # Silenciar los avisos de Streamlit por ejecutarse sin servidor
+   streamlit.logger.set_log_level(logging.ERROR)
+
+   # Trabajar sobre ficheros temporales para no tocar los datos del proyecto
+   sCarpetaTemporal = tempfile.mkdtemp()
+   AlmacenDeDatos.sLISTADO_PATH = os.path.join(sCarpetaTemporal, "ListadoDeMejoresAcciones.parquet")
+   AgregadosDelListado.sAGREGADOS_PATH = os.path.join(sCarpetaTemporal, "AgregadosDelListado.parquet")
+   EstadisticasDelListado.sESTADISTICAS_PATH = os.path.join(sCarpetaTemporal, "EstadisticasDelListado.json")
+   AlmacenDeDatos.sLISTADO_EXCEL_PATH = os.path.join(sCarpetaTemporal, "ListadoDeMejoresAcciones.xlsx")
+
+   print(f"{'Filas':>8} {'Completo (s)':>13} {'Tabla (s)':>10} {'Comparación (s)':>16} {'Gráficos (s)':>13} {'País (s)':>9}")
+   for iNumeroDeFilas in lTamanos:
+      AlmacenDeDatos.fGuardarListado(fGenerarListado(iNumeroDeFilas))
+      st.cache_data.clear()
+      st.cache_resource.clear()
+
+      oApp = AppTest.from_file(sVISUALIZADOR_PATH, default_timeout=600).run()
+      assert not oApp.exception, oApp.exception[0].message
+      oComparar = oApp.multiselect[0]
+      lOpciones = list(oComparar.options)
+
+      # Rerun completo al cambiar la selección de la comparación (alternando para que siempre cambie)
+      lTiempos = []
+      for iRepeticion in range(3):
+         oComparar.set_value(lOpciones[:2 + iRepeticion % 2])
+         fInicio = time.perf_counter()
+         oApp.run()
+         lTiempos.append(time.perf_counter() - fInicio)
+         assert not oApp.exception, oApp.exception[0].message
+      fCompleto = min(lTiempos)
+
+      dSecciones = fMedirSecciones(DatosDelVisualizador.fObtenerDatos())
+      assert dSecciones["Comparación"] < fCompleto
+      print(f"{iNumeroDeFilas:>8} {fCompleto:>13.3f} {dSecciones['Tabla']:>10.4f} {dSecciones['Comparación']:>16.4f} "
+            f"{dSecciones['Gráficos']:>13.4f} {dSecciones['País']:>9.4f}")
+
+   shutil.rmtree(sCarpetaTemporal, ignore_errors=True)
+   print("INFO    - OK")
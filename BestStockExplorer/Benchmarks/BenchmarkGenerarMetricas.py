@@ -0,0 +1,55 @@
+# Benchmarks\BenchmarkGenerarMetricas.py
+import sys, os, time
+import io
+import contextlib
+
+"""
+================================================================================
+Benchmark del Motor Concurrente de GenerarMetricas
+--------------------------------------------------------------------------------
+
+Evalúa un universo sintético de tickers contra un proveedor de datos falso con
+latencia simulada y muestra cómo escala el tiempo total con el número de hilos.
+
+Uso:
+   python Benchmarks/BenchmarkGenerarMetricas.py [iNumeroDeTickers] [fLatencia]
+
+================================================================================
+"""
+
+# Ruta base = carpeta del proyecto
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from Lib.GenerarMetricas import fObtenerDatosDeTickers
+from Lib.LimitadorDePeticiones import LimitadorTokenBucket
+from ProveedorDeDatosFalso import ProveedorDeDatosFalso
+
+
+if __name__ == "__main__":
+   iNumeroDeTickers = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+   fLatencia = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+   # Presupuesto alto para que el cuello de botella sea la latencia y no el limitador
+   fPeticionesPorSegundo = 1000.0
+
+   lListaDeTickers = [f"FAKE{i}" for i in range(iNumeroDeTickers)]
+
+   print(f"INFO    - {iNumeroDeTickers} tickers, latencia simulada {fLatencia}s, límite {fPeticionesPorSegundo} peticiones/s\n")
+   print(f"{'Workers':>8} {'Tiempo (s)':>12} {'Tickers/s':>10} {'Aceleración':>12}")
+
+   fTiempoBase = None
+   for iNumeroDeWorkers in [1, 2, 4, 8, 16, 32]:
+      oProveedor = ProveedorDeDatosFalso(fLatencia)
+      oLimitador = LimitadorTokenBucket(fPeticionesPorSegundo)
+
+      fInicio = time.perf_counter()
+      # Silenciar los mensajes por ticker para no distorsionar la medida
+      with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+         lResultados, iExitos, iErrores = fObtenerDatosDeTickers(lListaDeTickers, iNumeroDeWorkers, oLimitador, oProveedor)
+      fTiempo = time.perf_counter() - fInicio
+
+      fTiempoBase = fTiempoBase or fTiempo
+      print(f"{iNumeroDeWorkers:>8} {fTiempo:>12.2f} {iNumeroDeTickers / fTiempo:>10.1f} {fTiempoBase / fTiempo:>11.1f}x")
+
+      assert iExitos == iNumeroDeTickers and iErrores == 0, f"Resultados inesperados: {iExitos} éxitos, {iErrores} errores"
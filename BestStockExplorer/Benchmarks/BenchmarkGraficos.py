@@ -0,0 +1,52 @@
+# Benchmarks\BenchmarkGraficos.py
+import sys, os, time
+
+"""
+================================================================================
+Benchmark de los Gráficos del Visualizador (Modo Completo vs Ligero)
+--------------------------------------------------------------------------------
+
+Construye y serializa a JSON (lo que Streamlit envía al navegador) los cinco
+gráficos del visualizador sobre listados sintéticos, en modo completo y en modo
+ligero, y muestra el tamaño total del payload y el tiempo en el servidor.
+
+El tiempo de dibujo en el navegador no se puede medir aquí; es proporcional al
+número de puntos enviados (y WebGL lo reduce aún más en los de dispersión).
+
+Uso:
+   python Benchmarks/BenchmarkGraficos.py [iNumeroDeFilas ...]
+
+================================================================================
+"""
+
+# Ruta base = carpeta del proyecto
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from Lib.GraficosDelVisualizador import fGraficosAvanzados
+from ListadoSintetico import fGenerarListado
+
+
+def fMedir(dfDatos, bLigero: bool) -> tuple:
+   """
+   Retorna:
+      tuple: (iBytes, fSegundos) de construir y serializar los cinco gráficos.
+   """
+   fInicio = time.perf_counter()
+   iBytes = sum(len(oFigura.to_json()) for oFigura in fGraficosAvanzados(dfDatos, bLigero))
+   return iBytes, time.perf_counter() - fInicio
+
+
+if __name__ == "__main__":
+   lTamanos = [int(sArgumento) for sArgumento in sys.argv[1:]] or [2_500, 20_000, 100_000]
+
+   print(f"{'Filas':>8} {'Completo (KB)':>14} {'Ligero (KB)':>12} {'Completo (s)':>13} {'Ligero (s)':>11}")
+   for iNumeroDeFilas in lTamanos:
+      dfDatos = fGenerarListado(iNumeroDeFilas)
+      iBytesCompleto, fCompleto = fMedir(dfDatos, False)
+      iBytesLigero, fLigero = fMedir(dfDatos, True)
+      assert iBytesLigero < iBytesCompleto
+      print(f"{iNumeroDeFilas:>8} {iBytesCompleto / 1024:>14.1f} {iBytesLigero / 1024:>12.1f} {fCompleto:>13.2f} {fLigero:>11.2f}")
+
+   print("INFO    - OK")
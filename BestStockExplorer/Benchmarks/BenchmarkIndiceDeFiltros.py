@@ -0,0 +1,90 @@
+# Benchmarks\BenchmarkIndiceDeFiltros.py
+import sys, os, time
+import numpy as np
+
+"""
+================================================================================
+Benchmark de los Filtros de la Barra Lateral del Visualizador
+--------------------------------------------------------------------------------
+
+Compara, sobre listados sintéticos de distintos tamaños, el coste de resolver
+combinaciones aleatorias de selectbox y sliders:
+   - Encadenado: copias sucesivas con máscaras booleanas (como antes).
+   - Índice: IndiceDeFiltros (searchsorted + AND de bitsets) y un único take.
+Comprueba además que ambos devuelven exactamente las mismas filas.
+
+Uso:
+   python Benchmarks/BenchmarkIndiceDeFiltros.py [iNumeroDeFilas ...]
+
+================================================================================
+"""
+
+# Ruta base = carpeta del proyecto
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from Lib.DatosDelVisualizador import fAplicarFiltrosExplicitos, fCalcularOpcionesSidebar, lCOLUMNAS_TEXTO, lCOLUMNAS_NUMERICAS
+from Lib.IndiceDeFiltros import IndiceDeFiltros
+from ListadoSintetico import fGenerarListado
+
+
+def fFiltrarEncadenado(dfDatos, dFiltrosTexto: dict, dFiltrosNumericos: dict):
+   dfFiltrado = dfDatos.copy()
+   for col, filtro in dFiltrosTexto.items():
+      if filtro != "Todos":
+         dfFiltrado = dfFiltrado[dfFiltrado[col] == filtro]
+   for col, (min_val, max_val) in dFiltrosNumericos.items():
+      dfFiltrado = dfFiltrado[(dfFiltrado[col] >= min_val) & (dfFiltrado[col] <= max_val)]
+   return dfFiltrado
+
+
+def fCombinaciones(dOpcionesTexto: dict, dRangosNumericos: dict, iNumero: int) -> list:
+   """
+   Combinaciones deterministas: cada rerun mueve un slider y a veces cambia un selectbox.
+   """
+   oAleatorio = np.random.default_rng(1)
+   dTexto = {col: "Todos" for col in dOpcionesTexto}
+   dNumericos = dict(dRangosNumericos)
+   lCombinaciones = []
+   for _ in range(iNumero):
+      if oAleatorio.random() < 0.3:
+         sColumna = oAleatorio.choice(list(dOpcionesTexto))
+         dTexto[sColumna] = oAleatorio.choice(dOpcionesTexto[sColumna])
+      sColumna = oAleatorio.choice(list(dRangosNumericos))
+      iMinimo, iMaximo = dRangosNumericos[sColumna]
+      iDesde, iHasta = sorted(oAleatorio.integers(iMinimo, iMaximo + 1, 2).tolist())
+      dNumericos[sColumna] = (iDesde, iHasta)
+      lCombinaciones.append((dict(dTexto), dict(dNumericos)))
+   return lCombinaciones
+
+
+if __name__ == "__main__":
+   lTamanos = [int(sArgumento) for sArgumento in sys.argv[1:]] or [2_500, 100_000, 1_000_000]
+   iCombinaciones = 40
+
+   print(f"{'Filas':>9} {'Construir índice (s)':>21} {'Encadenado (ms)':>16} {'Índice (ms)':>12}")
+   for iNumeroDeFilas in lTamanos:
+      dfDatos = fAplicarFiltrosExplicitos(fGenerarListado(iNumeroDeFilas))
+      dOpcionesTexto, dRangosNumericos = fCalcularOpcionesSidebar(dfDatos)
+      lCombinaciones = fCombinaciones(dOpcionesTexto, dRangosNumericos, iCombinaciones)
+
+      fInicio = time.perf_counter()
+      oIndice = IndiceDeFiltros(dfDatos, lCOLUMNAS_TEXTO, lCOLUMNAS_NUMERICAS)
+      fConstruir = time.perf_counter() - fInicio
+
+      fEncadenado = fIndice = 0.0
+      for dTexto, dNumericos in lCombinaciones:
+         fInicio = time.perf_counter()
+         dfEsperado = fFiltrarEncadenado(dfDatos, dTexto, dNumericos)
+         fEncadenado += time.perf_counter() - fInicio
+
+         fInicio = time.perf_counter()
+         dfObtenido = dfDatos.take(oIndice.fFiltrar(dTexto, dNumericos))
+         fIndice += time.perf_counter() - fInicio
+
+         assert dfObtenido.index.equals(dfEsperado.index), (dTexto, dNumericos)
+
+      print(f"{iNumeroDeFilas:>9} {fConstruir:>21.3f} {fEncadenado / iCombinaciones * 1000:>16.2f} {fIndice / iCombinaciones * 1000:>12.2f}")
+
+   print("INFO    - OK")
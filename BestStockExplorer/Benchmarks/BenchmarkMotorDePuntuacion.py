@@ -0,0 +1,321 @@
+# Benchmarks\BenchmarkMotorDePuntuacion.py
+import sys, os, time
+import random
+import numpy as np
+import pandas as pd
+
+"""
+================================================================================
+Paridad y Benchmark del Motor de Puntuación
+--------------------------------------------------------------------------------
+
+1. Paridad: compara el motor por tabla de reglas con la cadena if/elif
+   original de fEvaluarAccion sobre filas sintéticas que incluyen NaN y todos
+   los valores frontera de los tramos.
+2. Paridad de extremo a extremo: pasa `.info` sintéticos (ratios de 5
+   decimales como los de Yahoo, fronteras, None, NaN, textos y campos
+   ausentes) por el cálculo original por ticker y por fObtenerDatosBrutos +
+   fCalcularIndicadores + fPuntuarAcciones, y exige el mismo resultado.
+3. Benchmark: mide el tiempo de repuntuar 100k filas sintéticas con NumPy.
+
+Uso:
+   python Benchmarks/BenchmarkMotorDePuntuacion.py [iNumeroDeFilas]
+
+================================================================================
+"""
+
+# Ruta base = carpeta del proyecto
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+
+from Lib.MotorDePuntuacion import dREGLAS_PUNTUACION, fPuntuarAcciones
+from Lib.DatosDeReferencia import fObtenerContinente
+from Lib.LimitadorDePeticiones import LimitadorTokenBucket
+from Lib.GenerarMetricas import lCOLUMNAS_RESULTADO, fObtenerDatosBrutos, fNormalizarDatosBrutos, fCalcularIndicadores
+
+# Factores de cambio a USD de los `.info` sintéticos
+dFACTORES_CAMBIO = {"USD": 1, "EUR": 1.087}
+
+
+def fPuntuacionOriginal(lIndicadores: dict) -> tuple:
+   """
+   Copia literal de la cadena if/elif que usaba fEvaluarAccion, como referencia de paridad.
+   """
+   iPuntuacion = 0
+
+   if not np.isnan(lIndicadores["PEG"]):
+      if lIndicadores["PEG"] < 0:
+         iPuntuacion -= 1
+      elif lIndicadores["PEG"] < 1:
+         iPuntuacion += 3
+      elif 1 <= lIndicadores["PEG"] <= 2:
+         iPuntuacion += 2
+      elif lIndicadores["PEG"] > 2:
+         iPuntuacion += 0
+
+   if not np.isnan(lIndicadores["EV/EBITDA"]): 
+      if lIndicadores["EV/EBITDA"] < 8:
+         iPuntuacion += 3
+      elif 8 <= lIndicadores["EV/EBITDA"] <= 12:
+         iPuntuacion += 2
+      else:
+         iPuntuacion += 0
+
+   if not np.isnan(lIndicadores["P/E"]):
+      if lIndicadores["P/E"] < 15:
+         iPuntuacion += 3
+      elif 15 <= lIndicadores["P/E"] <= 20:
+         iPuntuacion += 2
+      elif 20 < lIndicadores["P/E"] <= 50:
+         iPuntuacion += 0
+      else:  # P/E > 50
+         iPuntuacion -= 1
+
+   if lIndicadores["Dividend Yield (%)"] > 3:
+      iPuntuacion += 2
+   elif 1 <= lIndicadores["Dividend Yield (%)"] <= 3:
+      iPuntuacion += 1
+   else:
+      iPuntuacion += 0
+
+   if lIndicadores["Deuda/Capital (%)"] < 50:
+      iPuntuacion += 2
+   elif 50 <= lIndicadores["Deuda/Capital (%)"] <= 100:
+      iPuntuacion += 1
+   else:  # Deuda/Capital > 100
+      iPuntuacion -= 1
+
+   if lIndicadores["Crecimiento de Ingresos (%)"] > 10:
+      iPuntuacion += 3
+   elif 5 <= lIndicadores["Crecimiento de Ingresos (%)"] <= 10:
+      iPuntuacion += 2
+   elif 0 <= lIndicadores["Crecimiento de Ingresos (%)"] < 5:
+      iPuntuacion += 1
+   else:  # Crecimiento negativo
+      iPuntuacion += 0
+
+   if lIndicadores["FCF/Acción ($)"] > 0:
+      iPuntuacion += 2
+
+   if lIndicadores["ROE (%)"] > 15:
+      iPuntuacion += 3
+   elif 10 <= lIndicadores["ROE (%)"] <= 15:
+      iPuntuacion += 2
+   elif 5 <= lIndicadores["ROE (%)"] < 10:
+      iPuntuacion += 1
+   else:
+      iPuntuacion += 0
+
+   if lIndicadores["Beta"] < 1:
+      iPuntuacion += 2
+   elif 1 <= lIndicadores["Beta"] <= 1.5:
+      iPuntuacion += 1
+   else:
+      iPuntuacion += 0
+
+   if iPuntuacion >= 18:
+      sCalificacion = "Excelente"
+   elif iPuntuacion >= 14:
+      sCalificacion = "Muy Buena"
+   elif iPuntuacion >= 10:
+      sCalificacion = "Buena"
+   elif iPuntuacion >= 6:
+      sCalificacion = "Regular"
+   else:
+      sCalificacion = "Débil"
+
+   return iPuntuacion, sCalificacion
+
+
+def fEvaluacionOriginal(sTicker: str, lDatos: dict) -> tuple:
+   """
+   Copia literal del cálculo de indicadores de fEvaluarAccion (sin la descarga ni la consulta a Fixer), seguida
+   de fPuntuacionOriginal, como referencia de paridad de extremo a extremo.
+   """
+   sName = lDatos.get("longName", "Nombre no disponible")
+   sSector = lDatos.get("sector", "Sector no disponible")
+   sMoneda = lDatos.get("financialCurrency", "USD")  # Moneda original
+   sPais = lDatos.get("country", "Desconocido")
+   sContinente = fObtenerContinente(sPais)
+   dFactorCambio = dFACTORES_CAMBIO[sMoneda]
+
+   # Función para convertir valores usando el tipo de cambio calculado
+   def fConvertirMoneda(valor):
+      # Solo convierte si es número (int o float), si no, devuelve NaN
+      return valor * dFactorCambio if isinstance(valor, (int, float)) else np.nan
+
+   # Extraer indicadores financieros clave
+   lIndicadores = {
+      "Precio ($)": round(fConvertirMoneda(lDatos.get("currentPrice")), 2),
+      "Valor en Libros ($)": round(fConvertirMoneda(lDatos.get("bookValue")), 2),
+      "P/E": round(lDatos.get("trailingPE"), 2) if isinstance(lDatos.get("trailingPE"), (int, float)) else np.nan,
+      "PEG": np.nan,  # Se calcula más adelante si hay datos suficientes
+      "EV/EBITDA": round(lDatos.get("enterpriseToEbitda"), 2) if isinstance(lDatos.get("enterpriseToEbitda"), (int, float)) else np.nan,
+      "ROE (%)": round(lDatos.get("returnOnEquity") * 100, 2) if isinstance(lDatos.get("returnOnEquity"), (int, float)) else 0.0,
+      "Margen Neto (%)": round(lDatos.get("profitMargins") * 100, 2) if isinstance(lDatos.get("profitMargins"), (int, float)) else 0.0,
+      "Margen Operativo (%)": round(lDatos.get("operatingMargins") * 100, 2) if isinstance(lDatos.get("operatingMargins"), (int, float)) else 0.0,
+      "FCF/Acción ($)": round(fConvertirMoneda(lDatos.get("freeCashflow")), 2) if isinstance(lDatos.get("freeCashflow"), (int, float)) else 0.0,
+      "Dividend Yield (%)": round(lDatos.get("dividendYield") * 100, 2) if isinstance(lDatos.get("dividendYield"), (int, float)) else 0.0,
+      "Beta": round(lDatos.get("beta"), 2) if isinstance(lDatos.get("beta"), (int, float)) else 1.0,
+      "Deuda/Capital (%)": round(lDatos.get("debtToEquity"), 2) if isinstance(lDatos.get("debtToEquity"), (int, float)) else 0.0,
+      "Crecimiento de Ingresos (%)": round(lDatos.get("revenueGrowth") * 100, 2) if isinstance(lDatos.get("revenueGrowth"), (int, float)) else 0.0,
+      "Capitalización ($)": round(fConvertirMoneda(lDatos.get("marketCap", 0)) / 1e6, 2)
+   }
+
+   # Calcular valor intrínseco según fórmula de Benjamin Graham
+   EPS = lDatos.get("trailingEps")
+   G = lDatos.get("earningsGrowth")
+
+   if EPS is not None and G is not None and isinstance(EPS, (int, float)) and isinstance(G, (int, float)):
+      G_normalizado = max(min(G * 100, 20), 0)  # entre 0% y 20%
+      valor_intrinseco = round(EPS * (8.5 + 2 * G_normalizado), 2)
+   else:
+      valor_intrinseco = np.nan
+
+   # Agregar al diccionario de indicadores
+   lIndicadores["Valor Intrínseco ($)"] = valor_intrinseco
+
+   # Reemplazar valores None o no numéricos por np.nan directamente
+   for key, value in lIndicadores.items():
+      if value is None or not isinstance(value, (int, float)):
+         lIndicadores[key] = np.nan
+
+   # Calcular PEG si hay datos suficientes
+   if not np.isnan(lIndicadores["P/E"]) and lIndicadores["Crecimiento de Ingresos (%)"] != 0:
+      try:
+         lIndicadores["PEG"] = round(lIndicadores["P/E"] / lIndicadores["Crecimiento de Ingresos (%)"], 2)
+      except ZeroDivisionError:
+         lIndicadores["PEG"] = np.nan
+   else:
+      lIndicadores["PEG"] = np.nan
+
+   iPuntuacion, sCalificacion = fPuntuacionOriginal(lIndicadores)
+
+   # Orden consistente según columnas de Excel
+   lColumnasOrdenadas = [
+      "Precio ($)", "Valor en Libros ($)", "Valor Intrínseco ($)", "P/E", "PEG", "EV/EBITDA", "ROE (%)", 
+      "Margen Neto (%)", "Margen Operativo (%)", "FCF/Acción ($)", "Dividend Yield (%)", "Beta", 
+      "Deuda/Capital (%)", "Crecimiento de Ingresos (%)", "Capitalización ($)"
+   ]
+
+   lValoresOrdenados = [lIndicadores.get(clave, np.nan) for clave in lColumnasOrdenadas]
+
+   return (sTicker, sName, sSector, sContinente, sPais, sCalificacion, iPuntuacion, *lValoresOrdenados)
+
+
+def fGenerarInfoSintetico(iNumeroDeTickers: int, iSemilla: int = 42) -> list:
+   """
+   Genera `.info` sintéticos: ratios con 5 decimales (como los de Yahoo, con muchos empates a 2 decimales al
+   multiplicar por 100), valores frontera de las reglas y, en parte de los campos, None, NaN, texto o ausencia.
+
+   Retorna:
+      list: [(sTicker, lDatos)]
+   """
+   oAleatorio = random.Random(iSemilla)
+   # Campo -> (mínimo, máximo, decimales, valores frontera)
+   dCampos = {
+      "currentPrice": (1, 500, 3, []),
+      "bookValue": (1, 200, 3, []),
+      "trailingPE": (-10, 80, 5, [15, 20, 50]),
+      "enterpriseToEbitda": (-5, 30, 3, [8, 12]),
+      "returnOnEquity": (-0.2, 0.4, 5, [0.15, 0.1, 0.05]),
+      "profitMargins": (-0.1, 0.3, 5, []),
+      "operatingMargins": (-0.1, 0.4, 5, []),
+      "freeCashflow": (-1e9, 5e9, 0, [0]),
+      "dividendYield": (0, 0.06, 5, [0.03, 0.01]),
+      "beta": (0.2, 2.5, 3, [1, 1.5]),
+      "debtToEquity": (0, 250, 3, [50, 100]),
+      "revenueGrowth": (-0.2, 0.4, 5, [0.1, 0.05, 0]),
+      "marketCap": (1e8, 2e12, 0, []),
+      "trailingEps": (-2, 20, 3, []),
+      "earningsGrowth": (-0.3, 0.5, 5, [0, 0.2]),
+   }
+
+   lInfo = []
+   for iTicker in range(iNumeroDeTickers):
+      lDatos = {
+         "longName": f"Empresa {iTicker}",
+         "sector": oAleatorio.choice(["Technology", "Healthcare", "Energy"]),
+         "financialCurrency": oAleatorio.choice(list(dFACTORES_CAMBIO)),
+         "country": oAleatorio.choice(["United States", "Spain", "Japan"]),
+      }
+      for sCampo, (fMinimo, fMaximo, iDecimales, lFronteras) in dCampos.items():
+         fAzar = oAleatorio.random()
+         if fAzar < 0.04:
+            continue  # Campo ausente
+         elif fAzar < 0.08:
+            lDatos[sCampo] = oAleatorio.choice([None, float("nan"), "Infinity"])
+         elif fAzar < 0.2 and lFronteras:
+            lDatos[sCampo] = oAleatorio.choice(lFronteras)
+         else:
+            lDatos[sCampo] = round(oAleatorio.uniform(fMinimo, fMaximo), iDecimales)
+      lInfo.append((f"FAKE{iTicker}", lDatos))
+   return lInfo
+
+
+def fGenerarIndicadoresSinteticos(iNumeroDeFilas: int, iSemilla: int = 42) -> pd.DataFrame:
+   """
+   Genera indicadores aleatorios mezclados con NaN y con los límites exactos de cada tramo.
+   """
+   oGenerador = np.random.default_rng(iSemilla)
+   dColumnas = {}
+   for sIndicador, dRegla in dREGLAS_PUNTUACION.items():
+      aValores = oGenerador.uniform(-60, 160, iNumeroDeFilas).round(2)
+      # Forzar valores frontera (y sus vecinos) y NaN en parte de las filas
+      aFronteras = np.array([fLimite + fDelta for _, fLimite, _ in dRegla["lTramos"] for fDelta in (-0.01, 0, 0.01)])
+      aMascaraFrontera = oGenerador.random(iNumeroDeFilas) < 0.3
+      aValores[aMascaraFrontera] = oGenerador.choice(aFronteras, aMascaraFrontera.sum())
+      aValores[oGenerador.random(iNumeroDeFilas) < 0.1] = np.nan
+      dColumnas[sIndicador] = aValores
+   return pd.DataFrame(dColumnas)
+
+
+if __name__ == "__main__":
+   iNumeroDeFilas = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+   ########################## PARIDAD ##########################
+   dfParidad = fGenerarIndicadoresSinteticos(20_000)
+   dfVectorizado = fPuntuarAcciones(dfParidad)
+   iDiferencias = 0
+   for iFila, dIndicadores in enumerate(dfParidad.to_dict("records")):
+      tOriginal = fPuntuacionOriginal(dIndicadores)
+      tVectorizado = (int(dfVectorizado["Puntuación"].iat[iFila]), dfVectorizado["Calificación"].iat[iFila])
+      if tOriginal != tVectorizado:
+         iDiferencias += 1
+         print(f"ERROR   - Fila {iFila}: original {tOriginal}, vectorizado {tVectorizado}")
+   assert iDiferencias == 0, f"{iDiferencias} filas sin paridad"
+   print(f"INFO    - Paridad OK en {len(dfParidad)} filas (original == vectorizado)")
+
+   ################ PARIDAD DE EXTREMO A EXTREMO ###############
+   lInfo = fGenerarInfoSintetico(20_000)
+   oLimitador = LimitadorTokenBucket(0)
+   dInfo = dict(lInfo)
+   dfCrudo = fNormalizarDatosBrutos([fObtenerDatosBrutos(sTicker, oLimitador, dInfo.get) for sTicker, _ in lInfo])
+   dfPuntuado = fPuntuarAcciones(fCalcularIndicadores(dfCrudo, dFACTORES_CAMBIO))[lCOLUMNAS_RESULTADO]
+   iDiferencias = 0
+   for (sTicker, lDatos), tVectorizado in zip(lInfo, dfPuntuado.itertuples(index=False, name=None)):
+      tOriginal = fEvaluacionOriginal(sTicker, lDatos)
+      # Mismo valor en cada columna (dos NaN cuentan como iguales)
+      if not all(oOriginal == oNuevo or (oOriginal != oOriginal and oNuevo != oNuevo) for oOriginal, oNuevo in zip(tOriginal, tVectorizado)):
+         iDiferencias += 1
+         print(f"ERROR   - {sTicker}: original {tOriginal}, vectorizado {tVectorizado}")
+   assert iDiferencias == 0, f"{iDiferencias} tickers sin paridad"
+   print(f"INFO    - Paridad de extremo a extremo OK en {len(lInfo)} tickers (`.info` -> indicadores -> puntuación)")
+
+   ######################### BENCHMARK #########################
+   dfIndicadores = fGenerarIndicadoresSinteticos(iNumeroDeFilas)
+   fPuntuarAcciones(dfIndicadores.head(100))  # Calentamiento
+
+   lTiempos = []
+   for _ in range(5):
+      fInicio = time.perf_counter()
+      fPuntuarAcciones(dfIndicadores)
+      lTiempos.append(time.perf_counter() - fInicio)
+   print(f"INFO    - Vectorizado: {iNumeroDeFilas} filas en {min(lTiempos) * 1000:.1f} ms (mejor de 5)")
+
+   lMuestra = dfIndicadores.head(10_000).to_dict("records")
+   fInicio = time.perf_counter()
+   for dIndicadores in lMuestra:
+      fPuntuacionOriginal(dIndicadores)
+   fTiempoEscalar = (time.perf_counter() - fInicio) * iNumeroDeFilas / len(lMuestra)
+   print(f"INFO    - if/elif por ticker (extrapolado): {iNumeroDeFilas} filas en {fTiempoEscalar * 1000:.1f} ms")
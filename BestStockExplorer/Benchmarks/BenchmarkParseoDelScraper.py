@@ -0,0 +1,162 @@
+# Benchmarks\BenchmarkParseoDelScraper.py
+import sys, os, time
+import io
+import shutil
+import tempfile
+import functools
+import contextlib
+import lxml.html
+import pandas as pd
+from bs4 import BeautifulSoup, SoupStrainer
+
+"""
+================================================================================
+Benchmark del Parseo del Scraper de Tickers (Grabación y Reproducción)
+--------------------------------------------------------------------------------
+
+1. Graba con NavegadorGrabador un scraping completo contra el simulador local
+   de Investing.com (páginas de componentes de los índices y de empresas).
+2. Apaga el simulador y reproduce el scraping con NavegadorDeReproduccion,
+   sin navegador ni red; comprueba que el CSV de tickers es el mismo.
+3. Mide las páginas por segundo al extraer enlaces y tickers de las páginas
+   grabadas con cada variante de parseo, y comprueba que todas dan el mismo
+   resultado:
+   - BeautifulSoup (lxml), el documento completo (la del scraper).
+   - BeautifulSoup con SoupStrainer: solo el tbody datatable-v2 y los <h1>.
+   - lxml con XPath directo sobre el tbody datatable-v2 y los <h1>.
+
+Uso:
+   python Benchmarks/BenchmarkParseoDelScraper.py [iEmpresasPorIndice] [iRellenoKB]
+
+================================================================================
+"""
+
+# Ruta base = carpeta del proyecto
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.dirname(__file__))
+
+import Lib.ObtenerTickers as ObtenerTickers
+import Lib.MapaDeEnlaces as MapaDeEnlaces
+from Lib.FixturesDelScraper import AlmacenDeFixtures, NavegadorGrabador, NavegadorDeReproduccion
+from NavegadorHttp import NavegadorHttp
+from SimuladorInvesting import SimuladorInvesting, fGenerarComponentes
+
+# Clases de la tabla de componentes
+sCLASE_TABLA = "datatable-v2_body__8TXQk"
+sXPATH_ENLACES = (
+   f'//tbody[contains(concat(" ", normalize-space(@class), " "), " {sCLASE_TABLA} ")]'
+   '/tr[contains(concat(" ", normalize-space(@class), " "), " datatable-v2_row__hkEus ")]'
+   '/td[contains(concat(" ", normalize-space(@class), " "), " dynamic-table-v2_col-name__Xhsxv ")]'
+)
+
+
+def fEjecutar(sNombre: str, sCarpetaTemporal: str, fAbrirNavegador) -> tuple:
+   """
+   Retorna:
+      tuple: (dfTickers, fSegundos) de un scraping completo (sin ruta rápida HTTP, CSV y mapa de enlaces vacíos).
+   """
+   ObtenerTickers.sTICKER_LIST_PATH = os.path.join(sCarpetaTemporal, f"TickersDeEmpresas_{sNombre}.csv")
+   MapaDeEnlaces.sMAPA_DE_ENLACES_PATH = os.path.join(sCarpetaTemporal, f"MapaDeEnlaces_{sNombre}.sqlite")
+   fInicio = time.perf_counter()
+   with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+      ObtenerTickers.fObtenerTickers(iNumeroDeNavegadores=1, fAbrirNavegador=fAbrirNavegador, bRutaRapidaHttp=False)
+   return pd.read_csv(ObtenerTickers.sTICKER_LIST_PATH), time.perf_counter() - fInicio
+
+
+# ================= VARIANTES DE PARSEO =================
+def fEnlacesBeautifulSoup(sHtml: str) -> list:
+   return ObtenerTickers.fObtenerEmpresasDelIndice(BeautifulSoup(sHtml, 'lxml'), None, 0)
+
+
+def fEmpresaBeautifulSoup(sHtml: str) -> dict:
+   return ObtenerTickers.fObtenerDatosEmpresas(BeautifulSoup(sHtml, 'lxml'), "", "")
+
+
+def fEnlacesSoupStrainer(sHtml: str) -> list:
+   oSoup = BeautifulSoup(sHtml, 'lxml', parse_only=SoupStrainer('tbody', class_=sCLASE_TABLA))
+   return ObtenerTickers.fObtenerEmpresasDelIndice(oSoup, None, 0)
+
+
+def fEmpresaSoupStrainer(sHtml: str) -> dict:
+   return ObtenerTickers.fObtenerDatosEmpresas(BeautifulSoup(sHtml, 'lxml', parse_only=SoupStrainer('h1')), "", "")
+
+
+def fEnlacesLxml(bHtml: bytes) -> list:
+   lEnlaces = []
+   for oCeldaNombre in lxml.html.fromstring(bHtml).xpath(sXPATH_ENLACES):
+      oEnlace = oCeldaNombre.find('.//a')
+      if oEnlace is not None and oEnlace.get('href') is not None:
+         lEnlaces.append(oEnlace.get('href').strip())
+   return lEnlaces
+
+
+def fEmpresaLxml(bHtml: bytes) -> dict:
+   return ObtenerTickers.fObtenerDatosEmpresasLxml(bHtml, "")
+
+
+def fMedir(fParsear, lPaginas: list, iRepeticiones: int = 3) -> tuple:
+   """
+   Retorna:
+      tuple: (lResultados, fSegundos) con la mejor de iRepeticiones pasadas sobre todas las páginas.
+   """
+   fMejor = float("inf")
+   for _ in range(iRepeticiones):
+      fInicio = time.perf_counter()
+      lResultados = [fParsear(oPagina) for oPagina in lPaginas]
+      fMejor = min(fMejor, time.perf_counter() - fInicio)
+   return lResultados, fMejor
+
+
+if __name__ == "__main__":
+   iEmpresasPorIndice = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+   iRellenoKB = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+   lIndices = pd.read_csv(ObtenerTickers.sMAYOR_WORLD_INDICES_PATH, encoding="utf-8")["Indice"].tolist()
+   dComponentes = fGenerarComponentes(lIndices, iEmpresasPorIndice)
+   sCarpetaTemporal = tempfile.mkdtemp()
+   oAlmacen = AlmacenDeFixtures(os.path.join(sCarpetaTemporal, "Fixtures"))
+
+   # 1. Grabación
+   with SimuladorInvesting(dComponentes, fLatencia=0.0, iRellenoKB=iRellenoKB) as oInvesting:
+      os.environ["INVESTING_URL"] = oInvesting.sUrl
+      dfGrabado, fGrabacion = fEjecutar("Grabacion", sCarpetaTemporal, functools.partial(NavegadorGrabador, NavegadorHttp, oAlmacen))
+      iPeticiones = oInvesting.iPeticiones
+
+   lIndicesGrabados, lEmpresasGrabadas = oAlmacen.fListar("indice"), oAlmacen.fListar("empresa")
+   assert len(lIndicesGrabados) + len(lEmpresasGrabadas) == iPeticiones
+   print(f"INFO    - Grabadas {len(lIndicesGrabados)} páginas de índices y {len(lEmpresasGrabadas)} de empresas en {fGrabacion:.1f} s")
+
+   # 2. Reproducción, con el simulador ya apagado
+   dfReproducido, fReproduccion = fEjecutar("Reproduccion", sCarpetaTemporal, functools.partial(NavegadorDeReproduccion, oAlmacen))
+   pd.testing.assert_frame_equal(dfReproducido, dfGrabado)
+   print(f"INFO    - Reproducción sin red: {len(dfReproducido)} tickers idénticos en {fReproduccion:.1f} s")
+
+   # 3. Parseo de las páginas grabadas
+   lHtmlIndices = [oAlmacen.fLeer(dMetadatos["sUrl"]) for dMetadatos in lIndicesGrabados]
+   lHtmlEmpresas = [oAlmacen.fLeer(dMetadatos["sUrl"]) for dMetadatos in lEmpresasGrabadas]
+   lBytesIndices = [sHtml.encode("utf-8") for sHtml in lHtmlIndices]
+   lBytesEmpresas = [sHtml.encode("utf-8") for sHtml in lHtmlEmpresas]
+   iPaginas = len(lHtmlIndices) + len(lHtmlEmpresas)
+   fKBPorPagina = sum(len(bHtml) for bHtml in lBytesIndices + lBytesEmpresas) / iPaginas / 1024
+   print(f"INFO    - Parseo de {iPaginas} páginas (~{fKBPorPagina:.0f} KB por página)")
+
+   lVariantes = [
+      ("BeautifulSoup (lxml)", fEnlacesBeautifulSoup, fEmpresaBeautifulSoup, lHtmlIndices, lHtmlEmpresas),
+      ("SoupStrainer", fEnlacesSoupStrainer, fEmpresaSoupStrainer, lHtmlIndices, lHtmlEmpresas),
+      ("lxml XPath", fEnlacesLxml, fEmpresaLxml, lBytesIndices, lBytesEmpresas),
+   ]
+   print(f"{'Variante':<22} {'Índices/s':>10} {'Empresas/s':>11} {'Páginas/s':>10} {'Aceleración':>12}")
+   tReferencia, fReferencia = None, None
+   for sNombre, fEnlaces, fEmpresa, lPaginasIndices, lPaginasEmpresas in lVariantes:
+      lEnlaces, fSegundosIndices = fMedir(fEnlaces, lPaginasIndices)
+      lEmpresas, fSegundosEmpresas = fMedir(fEmpresa, lPaginasEmpresas)
+      fSegundos = fSegundosIndices + fSegundosEmpresas
+      if tReferencia is None:
+         tReferencia, fReferencia = (lEnlaces, lEmpresas), fSegundos
+      assert (lEnlaces, lEmpresas) == tReferencia
+      print(f"{sNombre:<22} {len(lPaginasIndices) / fSegundosIndices:>10.1f} {len(lPaginasEmpresas) / fSegundosEmpresas:>11.1f} "
+            f"{iPaginas / fSegundos:>10.1f} {fReferencia / fSegundos:>11.1f}x")
+
+   shutil.rmtree(sCarpetaTemporal, ignore_errors=True)
+   print("INFO    - OK")
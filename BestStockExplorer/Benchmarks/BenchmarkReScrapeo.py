@@ -0,0 +1,117 @@
+# Benchmarks\BenchmarkReScrapeo.py
+import sys, os, time
+import io
+import shutil
+import tempfile
+import functools
+import contextlib
+import pandas as pd
+
+"""
+================================================================================
+Benchmark del Re-Scrapeo con el Mapa de Enlaces
+--------------------------------------------------------------------------------
+
+Ejecuta fObtenerTickers varias veces seguidas contra el simulador local de
+Investing.com, con el mismo CSV de tickers y el mismo mapa de enlaces:
+   1. Scraping inicial (mapa vacío): índices y una vez cada empresa (las
+      repetidas entre índices ya están en el mapa al llegar a la segunda).
+   2. Re-scrapeo sin cambios: solo las páginas de componentes de los índices.
+   3. Re-scrapeo tras añadir empresas nuevas a algunos índices: índices y
+      solo las empresas nuevas.
+   4. Re-scrapeo sin CSV de tickers (mapa conservado): se reconstruye el CSV
+      sin cargar ninguna página de empresa.
+   5. Igual que 2, con 4 navegadores en paralelo.
+Comprueba las páginas pedidas al simulador en cada paso y que el CSV es el
+mismo que el de un scraping completo desde cero.
+
+Uso:
+   python Benchmarks/BenchmarkReScrapeo.py [iEmpresasPorIndice] [fRenderizado]
+
+================================================================================
+"""
+
+# Ruta base = carpeta del proyecto
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.dirname(__file__))
+
+import Lib.ObtenerTickers as ObtenerTickers
+import Lib.MapaDeEnlaces as MapaDeEnlaces
+from NavegadorHttp import NavegadorHttp
+from SimuladorInvesting import SimuladorInvesting, fGenerarComponentes
+
+
+def fEjecutar(oInvesting: SimuladorInvesting, fAbrirNavegador, iNumeroDeNavegadores: int = 1) -> tuple:
+   """
+   Retorna:
+      tuple: (dfTickers, fSegundos, iPeticiones) de una ejecución de fObtenerTickers.
+   """
+   iPeticionesPrevias = oInvesting.iPeticiones
+   fInicio = time.perf_counter()
+   with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+      ObtenerTickers.fObtenerTickers(iNumeroDeNavegadores=iNumeroDeNavegadores, fAbrirNavegador=fAbrirNavegador)
+   fSegundos = time.perf_counter() - fInicio
+   return pd.read_csv(ObtenerTickers.sTICKER_LIST_PATH), fSegundos, oInvesting.iPeticiones - iPeticionesPrevias
+
+
+if __name__ == "__main__":
+   iEmpresasPorIndice = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+   fRenderizado = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+   fAbrirNavegador = functools.partial(NavegadorHttp, fRenderizado=fRenderizado)
+
+   lIndices = pd.read_csv(ObtenerTickers.sMAYOR_WORLD_INDICES_PATH, encoding="utf-8")["Indice"].tolist()
+   dComponentes = fGenerarComponentes(lIndices, iEmpresasPorIndice)
+   iEnlaces = sum(len(lEmpresas) for lEmpresas in dComponentes.values())
+   iEmpresas = len({sSlug for lEmpresas in dComponentes.values() for sSlug, _, _ in lEmpresas})
+   # Empresas nuevas del paso 3, en 3 índices
+   dNuevas = {sIndice: [(f"nueva-{sIndice}-{i}", f"Nueva {sIndice} {i} SA", f"N{iIndice}X{i}") for i in range(2)]
+              for iIndice, sIndice in enumerate(lIndices[:3])}
+   iNuevas = sum(len(lEmpresas) for lEmpresas in dNuevas.values())
+
+   sCarpetaTemporal = tempfile.mkdtemp()
+   ObtenerTickers.sTICKER_LIST_PATH = os.path.join(sCarpetaTemporal, "TickersDeEmpresas.csv")
+   MapaDeEnlaces.sMAPA_DE_ENLACES_PATH = os.path.join(sCarpetaTemporal, "MapaDeEnlaces.sqlite")
+
+   with SimuladorInvesting(dComponentes, fLatencia=0.03) as oInvesting:
+      os.environ["INVESTING_URL"] = oInvesting.sUrl
+      print(f"INFO    - {len(lIndices)} índices, {iEnlaces} enlaces de empresas ({iEmpresas} distintas), navegador a {fRenderizado * 1000:.0f} ms por página")
+      print(f"{'Paso':<34} {'Páginas':>8} {'Tiempo (s)':>11} {'Tickers':>8}")
+
+      dfInicial, fSegundos, iPeticiones = fEjecutar(oInvesting, fAbrirNavegador)
+      assert iPeticiones == len(lIndices) + iEmpresas
+      print(f"{'1. Inicial (mapa vacío)':<34} {iPeticiones:>8} {fSegundos:>11.2f} {len(dfInicial):>8}")
+
+      dfTickers, fSegundos, iPeticiones = fEjecutar(oInvesting, fAbrirNavegador)
+      assert iPeticiones == len(lIndices)
+      pd.testing.assert_frame_equal(dfTickers, dfInicial)
+      print(f"{'2. Re-scrapeo sin cambios':<34} {iPeticiones:>8} {fSegundos:>11.2f} {len(dfTickers):>8}")
+
+      for sIndice, lEmpresas in dNuevas.items():
+         oInvesting.fAnadirEmpresas(sIndice, lEmpresas)
+      dfTickers, fSegundos, iPeticiones = fEjecutar(oInvesting, fAbrirNavegador)
+      assert iPeticiones == len(lIndices) + iNuevas
+      assert len(dfTickers) == len(dfInicial) + iNuevas
+      print(f"{'3. Re-scrapeo con ' + str(iNuevas) + ' empresas nuevas':<34} {iPeticiones:>8} {fSegundos:>11.2f} {len(dfTickers):>8}")
+
+      # Referencia: scraping completo desde cero (sin CSV ni mapa) de los componentes actuales
+      dfActual = dfTickers
+      os.remove(ObtenerTickers.sTICKER_LIST_PATH)
+      MapaDeEnlaces.sMAPA_DE_ENLACES_PATH = os.path.join(sCarpetaTemporal, "MapaDeEnlacesReferencia.sqlite")
+      dfReferencia, _, _ = fEjecutar(oInvesting, fAbrirNavegador)
+      MapaDeEnlaces.sMAPA_DE_ENLACES_PATH = os.path.join(sCarpetaTemporal, "MapaDeEnlaces.sqlite")
+      assert sorted(dfActual["Ticker"]) == sorted(dfReferencia["Ticker"])
+
+      os.remove(ObtenerTickers.sTICKER_LIST_PATH)
+      dfTickers, fSegundos, iPeticiones = fEjecutar(oInvesting, fAbrirNavegador)
+      assert iPeticiones == len(lIndices)
+      pd.testing.assert_frame_equal(dfTickers, dfReferencia)
+      print(f"{'4. Sin CSV, con mapa':<34} {iPeticiones:>8} {fSegundos:>11.2f} {len(dfTickers):>8}")
+
+      dfTickers, fSegundos, iPeticiones = fEjecutar(oInvesting, NavegadorHttp, iNumeroDeNavegadores=4)
+      assert iPeticiones == len(lIndices)
+      pd.testing.assert_frame_equal(dfTickers, dfReferencia)
+      print(f"{'5. Re-scrapeo, 4 navegadores':<34} {iPeticiones:>8} {fSegundos:>11.2f} {len(dfTickers):>8}")
+
+   shutil.rmtree(sCarpetaTemporal, ignore_errors=True)
+   print("INFO    - OK")
@@ -0,0 +1,94 @@
+# Benchmarks\BenchmarkRefrescoIncremental.py
+import sys, os, time
+import io
+import shutil
+import tempfile
+import contextlib
+
+"""
+================================================================================
+Benchmark del Refresco Incremental de GenerarMetricas
+--------------------------------------------------------------------------------
+
+Simula un refresco diario sobre un universo sintético contra un proveedor de
+datos falso:
+   1. Ejecución completa inicial.
+   2. El scraper añade 30 tickers y 100 filas quedan caducadas.
+   3. Ejecución incremental: solo se deben descargar esos 130 tickers.
+   4. Se comprueba que el listado es idéntico al de una ejecución completa.
+
+Uso:
+   python Benchmarks/BenchmarkRefrescoIncremental.py [iNumeroDeTickers]
+
+================================================================================
+"""
+
+# Ruta base = carpeta del proyecto
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.dirname(__file__))
+
+import pandas as pd
+import Lib.GenerarMetricas as GenerarMetricas
+import Lib.AlmacenDeDatos as AlmacenDeDatos
+import Lib.AgregadosDelListado as AgregadosDelListado
+import Lib.EstadisticasDelListado as EstadisticasDelListado
+import Lib.DiarioDeResultados as DiarioDeResultados
+from ProveedorDeDatosFalso import ProveedorDeDatosFalso
+
+
+def fEjecutar(bIncremental):
+   oProveedor = ProveedorDeDatosFalso(0.0)
+   fInicio = time.perf_counter()
+   oSalida = io.StringIO()
+   with contextlib.redirect_stdout(oSalida), contextlib.redirect_stderr(io.StringIO()):
+      GenerarMetricas.fGenerarMetricas(8, 0, oProveedor, bIncremental=bIncremental)
+   fTiempo = time.perf_counter() - fInicio
+   lResumen = [sLinea for sLinea in oSalida.getvalue().splitlines() if "TOTAL" in sLinea or "Incremental:" in sLinea]
+   return oProveedor.iLlamadas, fTiempo, lResumen
+
+
+if __name__ == "__main__":
+   iNumeroDeTickers = int(sys.argv[1]) if len(sys.argv) > 1 else 2540
+
+   # Trabajar sobre ficheros temporales para no tocar los datos del proyecto
+   sCarpetaTemporal = tempfile.mkdtemp()
+   GenerarMetricas.sTICKER_LIST_PATH = os.path.join(sCarpetaTemporal, "TickersDeEmpresas.csv")
+   GenerarMetricas.sDATOS_BRUTOS_PATH = os.path.join(sCarpetaTemporal, "MetricasBrutas.parquet")
+   AlmacenDeDatos.sLISTADO_PATH = os.path.join(sCarpetaTemporal, "ListadoDeMejoresAcciones.parquet")
+   AgregadosDelListado.sAGREGADOS_PATH = os.path.join(sCarpetaTemporal, "AgregadosDelListado.parquet")
+   EstadisticasDelListado.sESTADISTICAS_PATH = os.path.join(sCarpetaTemporal, "EstadisticasDelListado.json")
+   DiarioDeResultados.sDIARIO_PATH = os.path.join(sCarpetaTemporal, "DiarioGenerarMetricas.jsonl")
+   GenerarMetricas.fCrearCacheInfo = lambda: None
+   GenerarMetricas.fCrearValidadorDeTickers = lambda fComprobarLote=None: None
+
+   def fEscribirTickers(iTotal):
+      pd.DataFrame({"Indice": "sintetico", "Nombre": "", "Ticker": [f"FAKE{i}" for i in range(iTotal)]}).to_csv(GenerarMetricas.sTICKER_LIST_PATH, index=False)
+
+   # 1. Ejecución completa inicial
+   fEscribirTickers(iNumeroDeTickers)
+   iLlamadas, fTiempo, _ = fEjecutar(False)
+   print(f"INFO    - Completa inicial:  {iLlamadas:5d} descargas en {fTiempo:.2f}s")
+
+   # 2. 30 tickers nuevos y 100 filas con más de un día de antigüedad
+   fEscribirTickers(iNumeroDeTickers + 30)
+   dfCrudo = pd.read_parquet(GenerarMetricas.sDATOS_BRUTOS_PATH)
+   dfCrudo.loc[dfCrudo.index[::len(dfCrudo) // 100][:100], "FechaDescarga"] -= 2 * 24 * 3600
+   dfCrudo.to_parquet(GenerarMetricas.sDATOS_BRUTOS_PATH, index=False)
+
+   # 3. Refresco incremental
+   iLlamadas, fTiempo, lResumen = fEjecutar(True)
+   print(f"INFO    - Incremental:       {iLlamadas:5d} descargas en {fTiempo:.2f}s")
+   for sLinea in lResumen:
+      print(f"          {sLinea}")
+   dfIncremental = AlmacenDeDatos.fCargarListado()
+   assert iLlamadas == 130, f"Se esperaban 130 descargas y se hicieron {iLlamadas}"
+
+   # 4. Ejecución completa de referencia
+   iLlamadas, fTiempo, _ = fEjecutar(False)
+   print(f"INFO    - Completa:          {iLlamadas:5d} descargas en {fTiempo:.2f}s")
+   dfCompleto = AlmacenDeDatos.fCargarListado()
+   assert dfIncremental.equals(dfCompleto), "El listado incremental no coincide con el de una ejecución completa"
+
+   shutil.rmtree(sCarpetaTemporal, ignore_errors=True)
+   print("INFO    - OK")
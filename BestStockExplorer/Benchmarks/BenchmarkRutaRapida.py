@@ -0,0 +1,85 @@
+# Benchmarks\BenchmarkRutaRapida.py
+import sys, os, time
+import io
+import shutil
+import tempfile
+import functools
+import contextlib
+import pandas as pd
+
+"""
+================================================================================
+Benchmark de la Ruta Rápida HTTP del Scraper de Tickers
+--------------------------------------------------------------------------------
+
+Ejecuta fObtenerTickers (un navegador) contra el simulador local de
+Investing.com con y sin la ruta rápida HTTP. El navegador es un NavegadorHttp
+que tarda fRenderizado segundos en cada página, como un Chrome real, y una
+parte de las empresas responde con una comprobación anti-bot a los clientes
+sin navegador (esas deben resolverse con el navegador).
+
+Comprueba que los dos modos generan el mismo TickersDeEmpresas.csv y muestra
+el tiempo, las páginas por segundo y la proporción de páginas de empresas
+resueltas por la ruta rápida.
+
+Uso:
+   python Benchmarks/BenchmarkRutaRapida.py [iEmpresasPorIndice] [fRenderizado] [fProporcionConDesafio]
+
+================================================================================
+"""
+
+# Ruta base = carpeta del proyecto
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.dirname(__file__))
+
+import Lib.ObtenerTickers as ObtenerTickers
+from NavegadorHttp import NavegadorHttp
+from SimuladorInvesting import SimuladorInvesting, fGenerarComponentes
+
+
+def fEjecutar(bRutaRapidaHttp: bool, fRenderizado: float, sCarpetaTemporal: str) -> tuple:
+   """
+   Retorna:
+      tuple: (dfTickers, fSegundos, lInforme) de un scraping completo desde un CSV de tickers vacío; lInforme son
+             las líneas de rendimiento que muestra fObtenerTickers al terminar.
+   """
+   ObtenerTickers.sTICKER_LIST_PATH = os.path.join(sCarpetaTemporal, f"TickersDeEmpresas_{bRutaRapidaHttp}.csv")
+   oSalida = io.StringIO()
+   fInicio = time.perf_counter()
+   with contextlib.redirect_stdout(oSalida):
+      ObtenerTickers.fObtenerTickers(iNumeroDeNavegadores=1, fAbrirNavegador=functools.partial(NavegadorHttp, fRenderizado=fRenderizado),
+                                     bRutaRapidaHttp=bRutaRapidaHttp, bMapaDeEnlaces=False)
+   fSegundos = time.perf_counter() - fInicio
+   lInforme = [sLinea for sLinea in oSalida.getvalue().splitlines() if sLinea.startswith("INFO    - ")]
+   return pd.read_csv(ObtenerTickers.sTICKER_LIST_PATH), fSegundos, lInforme
+
+
+if __name__ == "__main__":
+   iEmpresasPorIndice = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+   fRenderizado = float(sys.argv[2]) if len(sys.argv) > 2 else 0.3
+   fProporcionConDesafio = float(sys.argv[3]) if len(sys.argv) > 3 else 0.05
+
+   lIndices = pd.read_csv(ObtenerTickers.sMAYOR_WORLD_INDICES_PATH, encoding="utf-8")["Indice"].tolist()
+   dComponentes = fGenerarComponentes(lIndices, iEmpresasPorIndice)
+   lSlugs = sorted({sSlug for lEmpresas in dComponentes.values() for sSlug, _, _ in lEmpresas})
+   setConDesafio = set(lSlugs[::max(1, round(1 / fProporcionConDesafio))]) if fProporcionConDesafio > 0 else set()
+   sCarpetaTemporal = tempfile.mkdtemp()
+
+   with SimuladorInvesting(dComponentes, fLatencia=0.03, setConDesafio=setConDesafio) as oInvesting:
+      os.environ["INVESTING_URL"] = oInvesting.sUrl
+      print(f"INFO    - {len(lIndices)} índices, {len(lSlugs)} empresas ({len(setConDesafio)} con comprobación anti-bot), "
+            f"navegador a {fRenderizado * 1000:.0f} ms por página")
+
+      dfReferencia, fReferencia = None, None
+      for bRutaRapidaHttp in [False, True]:
+         dfTickers, fSegundos, lInforme = fEjecutar(bRutaRapidaHttp, fRenderizado, sCarpetaTemporal)
+         if dfReferencia is None:
+            dfReferencia, fReferencia = dfTickers, fSegundos
+         pd.testing.assert_frame_equal(dfTickers, dfReferencia)
+         print(f"\n{'Con' if bRutaRapidaHttp else 'Sin'} ruta rápida: {fSegundos:.1f} s ({fReferencia / fSegundos:.1f}x)")
+         for sLinea in lInforme:
+            print(sLinea)
+
+   shutil.rmtree(sCarpetaTemporal, ignore_errors=True)
+   print("INFO    - OK")
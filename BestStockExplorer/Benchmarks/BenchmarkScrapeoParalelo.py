@@ -0,0 +1,79 @@
+# Benchmarks\BenchmarkScrapeoParalelo.py
+import sys, os, time
+import io
+import shutil
+import tempfile
+import contextlib
+import pandas as pd
+
+"""
+================================================================================
+Benchmark del Scraper de Tickers en Paralelo
+--------------------------------------------------------------------------------
+
+Ejecuta fObtenerTickers contra el simulador local de Investing.com (los 29
+índices de IndicesGlobales.csv con empresas sintéticas, algunas repetidas
+entre índices), en modo secuencial y con 2, 4 y 8 navegadores. Cada
+navegador es un NavegadorHttp (sin Chrome) en su propio proceso.
+
+Comprueba que todos los modos generan exactamente el mismo
+TickersDeEmpresas.csv (mismo orden y sin tickers repetidos) y muestra el tiempo
+y las páginas por segundo de cada uno.
+
+Uso:
+   python Benchmarks/BenchmarkScrapeoParalelo.py [iEmpresasPorIndice] [fLatencia]
+
+================================================================================
+"""
+
+# Ruta base = carpeta del proyecto
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.dirname(__file__))
+
+import Lib.ObtenerTickers as ObtenerTickers
+from NavegadorHttp import NavegadorHttp
+from SimuladorInvesting import SimuladorInvesting, fGenerarComponentes
+
+
+def fEjecutar(iNumeroDeNavegadores: int, sCarpetaTemporal: str) -> tuple:
+   """
+   Retorna:
+      tuple: (dfTickers, fSegundos) de un scraping completo desde un CSV de tickers vacío.
+   """
+   ObtenerTickers.sTICKER_LIST_PATH = os.path.join(sCarpetaTemporal, f"TickersDeEmpresas_{iNumeroDeNavegadores}.csv")
+   fInicio = time.perf_counter()
+   # Sin la salida por empresa del modo secuencial
+   with contextlib.redirect_stdout(io.StringIO()):
+      # Sin mapa de enlaces: se carga cada enlace de cada índice, también las empresas repetidas entre índices
+      ObtenerTickers.fObtenerTickers(iNumeroDeNavegadores=iNumeroDeNavegadores, fAbrirNavegador=NavegadorHttp, bMapaDeEnlaces=False)
+   return pd.read_csv(ObtenerTickers.sTICKER_LIST_PATH), time.perf_counter() - fInicio
+
+
+if __name__ == "__main__":
+   iEmpresasPorIndice = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+   fLatencia = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+
+   lIndices = pd.read_csv(ObtenerTickers.sMAYOR_WORLD_INDICES_PATH, encoding="utf-8")["Indice"].tolist()
+   dComponentes = fGenerarComponentes(lIndices, iEmpresasPorIndice)
+   iPaginas = len(lIndices) + sum(len(lEmpresas) for lEmpresas in dComponentes.values())
+   sCarpetaTemporal = tempfile.mkdtemp()
+
+   with SimuladorInvesting(dComponentes, fLatencia=fLatencia) as oInvesting:
+      os.environ["INVESTING_URL"] = oInvesting.sUrl
+
+      print(f"INFO    - {len(lIndices)} índices, {iPaginas} páginas, {fLatencia * 1000:.0f} ms por página")
+      print(f"{'Navegadores':>12} {'Tiempo (s)':>11} {'Páginas/s':>10} {'Aceleración':>12} {'Tickers':>8}")
+      dfReferencia, fReferencia = None, None
+      for iNumeroDeNavegadores in [1, 2, 4, 8]:
+         iPeticionesPrevias = oInvesting.iPeticiones
+         dfTickers, fSegundos = fEjecutar(iNumeroDeNavegadores, sCarpetaTemporal)
+         assert oInvesting.iPeticiones - iPeticionesPrevias == iPaginas
+         assert dfTickers["Ticker"].is_unique
+         if dfReferencia is None:
+            dfReferencia, fReferencia = dfTickers, fSegundos
+         pd.testing.assert_frame_equal(dfTickers, dfReferencia)
+         print(f"{iNumeroDeNavegadores:>12} {fSegundos:>11.2f} {iPaginas / fSegundos:>10.1f} {fReferencia / fSegundos:>11.1f}x {len(dfTickers):>8}")
+
+   shutil.rmtree(sCarpetaTemporal, ignore_errors=True)
+   print("INFO    - OK")
@@ -0,0 +1,105 @@
+# Benchmarks\BenchmarkTablaPaginada.py
+import sys, os, time
+import shutil
+import logging
+import tempfile
+import numpy as np
+
+"""
+================================================================================
+Benchmark de la Tabla Paginada del Visualizador de Acciones
+--------------------------------------------------------------------------------
+
+Para listados sintéticos de distintos tamaños mide:
+   - Bytes que recibe el navegador por la tabla (datos Arrow del elemento) en
+     modo "Completa" y en modo "Paginada".
+   - Coste en el servidor de ordenar, buscar y extraer una página con el
+     IndiceDeFiltros, comparado con sort_values + str.contains sobre el frame.
+Comprueba además que la página coincide con la del orden hecho con pandas.
+
+Uso:
+   python Benchmarks/BenchmarkTablaPaginada.py [iNumeroDeFilas ...]
+
+================================================================================
+"""
+
+# Ruta base = carpeta del proyecto
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.dirname(__file__))
+
+import streamlit as st
+import streamlit.logger
+from streamlit.testing.v1 import AppTest
+import Lib.AlmacenDeDatos as AlmacenDeDatos
+import Lib.AgregadosDelListado as AgregadosDelListado
+import Lib.EstadisticasDelListado as EstadisticasDelListado
+import Lib.DatosDelVisualizador as DatosDelVisualizador
+from ListadoSintetico import fGenerarListado
+
+sVISUALIZADOR_PATH = os.path.join(BASE_DIR, "Lib", "VisualizadorDeAcciones.py")
+iFILAS_POR_PAGINA = 50
+
+
+def fBytesTabla(oApp) -> int:
+   return len(oApp.dataframe[0].proto.arrow_data.data)
+
+
+def fMedirServidor(dDatos: dict, iRepeticiones: int = 20) -> tuple:
+   """
+   Tiempo medio (s) de obtener una página ordenada por Capitalización y filtrada por nombre:
+   (pandas, índice). Ambos deben devolver las mismas filas.
+   """
+   dfDatos = dDatos["dfFiltradoExplicito"]
+   oIndice = dDatos["oIndiceDeFiltros"]
+   aFilas = np.arange(len(dfDatos))
+
+   fInicio = time.perf_counter()
+   for _ in range(iRepeticiones):
+      dfOrdenado = dfDatos.sort_values("Capitalización ($)", ascending=False, kind="stable")
+      dfOrdenado = dfOrdenado[dfOrdenado["Nombre"].str.contains("7", case=False, regex=False, na=False)]
+      dfPaginaPandas = dfOrdenado.iloc[:iFILAS_POR_PAGINA]
+   fPandas = (time.perf_counter() - fInicio) / iRepeticiones
+
+   oIndice.fPermutacion("Capitalización ($)", False)
+   fInicio = time.perf_counter()
+   for _ in range(iRepeticiones):
+      aOrdenadas = oIndice.fBuscar(oIndice.fOrdenar(aFilas, "Capitalización ($)", False), "Nombre", "7")
+      dfPaginaIndice = dfDatos.take(aOrdenadas[:iFILAS_POR_PAGINA])
+   fIndice = (time.perf_counter() - fInicio) / iRepeticiones
+
+   assert dfPaginaIndice["Capitalización ($)"].tolist() == dfPaginaPandas["Capitalización ($)"].tolist()
+   return fPandas, fIndice
+
+
+if __name__ == "__main__":
+   lTamanos = [int(sArgumento) for sArgumento in sys.argv[1:]] or [2_500, 50_000]
+   # Silenciar los avisos de Streamlit por ejecutarse sin servidor
+   streamlit.logger.set_log_level(logging.ERROR)
+
+   # Trabajar sobre ficheros temporales para no tocar los datos del proyecto
+   sCarpetaTemporal = tempfile.mkdtemp()
+   AlmacenDeDatos.sLISTADO_PATH = os.path.join(sCarpetaTemporal, "ListadoDeMejoresAcciones.parquet")
+   AgregadosDelListado.sAGREGADOS_PATH = os.path.join(sCarpetaTemporal, "AgregadosDelListado.parquet")
+   EstadisticasDelListado.sESTADISTICAS_PATH = os.path.join(sCarpetaTemporal, "EstadisticasDelListado.json")
+   AlmacenDeDatos.sLISTADO_EXCEL_PATH = os.path.join(sCarpetaTemporal, "ListadoDeMejoresAcciones.xlsx")
+
+   print(f"{'Filas':>8} {'Completa (KB)':>14} {'Paginada (KB)':>14} {'Página pandas (ms)':>19} {'Página índice (ms)':>19}")
+   for iNumeroDeFilas in lTamanos:
+      AlmacenDeDatos.fGuardarListado(fGenerarListado(iNumeroDeFilas))
+      st.cache_data.clear()
+      st.cache_resource.clear()
+
+      oApp = AppTest.from_file(sVISUALIZADOR_PATH, default_timeout=600).run()
+      assert not oApp.exception, oApp.exception[0].message
+      iBytesPaginada = fBytesTabla(oApp)
+      assert len(oApp.dataframe[0].value) <= iFILAS_POR_PAGINA
+      oApp.radio[0].set_value("Completa").run()
+      assert not oApp.exception, oApp.exception[0].message
+      iBytesCompleta = fBytesTabla(oApp)
+
+      fPandas, fIndice = fMedirServidor(DatosDelVisualizador.fObtenerDatos())
+      print(f"{iNumeroDeFilas:>8} {iBytesCompleta / 1024:>14.1f} {iBytesPaginada / 1024:>14.1f} {fPandas * 1000:>19.2f} {fIndice * 1000:>19.2f}")
+
+   shutil.rmtree(sCarpetaTemporal, ignore_errors=True)
+   print("INFO    - OK")
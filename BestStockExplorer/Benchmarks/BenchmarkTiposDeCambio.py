@@ -0,0 +1,79 @@
+# Benchmarks\BenchmarkTiposDeCambio.py
+import sys, os, time
+import random
+import tempfile
+
+"""
+================================================================================
+Comprobación de Llamadas a Fixer en una Ejecución Completa
+--------------------------------------------------------------------------------
+
+Construye el listado de un universo sintético con muchas monedas distintas
+contra un Fixer local y comprueba que:
+   1. La primera ejecución del día hace exactamente una petición HTTP de cambio.
+   2. Una segunda ejecución el mismo día no hace ninguna.
+   3. El CSV de tipos de cambio se escribe completo y de una vez.
+
+Uso:
+   python Benchmarks/BenchmarkTiposDeCambio.py [iNumeroDeTickers]
+
+================================================================================
+"""
+
+# Ruta base = carpeta del proyecto
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.dirname(__file__))
+
+import pandas as pd
+import Lib.TiposDeCambio as TiposDeCambio
+import Lib.GenerarMetricas as GenerarMetricas
+import Lib.AlmacenDeDatos as AlmacenDeDatos
+import Lib.AgregadosDelListado as AgregadosDelListado
+import Lib.EstadisticasDelListado as EstadisticasDelListado
+from ProveedorDeDatosFalso import ProveedorDeDatosFalso
+from SimuladorFixer import SimuladorFixer
+
+
+if __name__ == "__main__":
+   iNumeroDeTickers = int(sys.argv[1]) if len(sys.argv) > 1 else 2540
+   lMonedas = ["USD", "EUR", "GBP", "JPY", "CAD", "BRL", "MXN", "CHF", "SEK", "DKK", "NOK", "PLN",
+               "TRY", "ILS", "AUD", "NZD", "CNY", "HKD", "TWD", "KRW", "INR", "IDR", "THB", "RUB"]
+
+   # Universo sintético de datos brutos con monedas repartidas al azar
+   oAleatorio = random.Random(1)
+   lRegistros = []
+   for iTicker in range(iNumeroDeTickers):
+      dInfo = ProveedorDeDatosFalso(0, oAleatorio.choice(lMonedas))(f"FAKE{iTicker}")
+      lRegistros.append({"Ticker": f"FAKE{iTicker}", "FechaDescarga": time.time(), **dInfo})
+   dfCrudo = GenerarMetricas.fNormalizarDatosBrutos(lRegistros)
+
+   # Trabajar sobre ficheros temporales para no tocar los datos del proyecto
+   sCarpetaTemporal = tempfile.mkdtemp()
+   TiposDeCambio.sTIPOS_CAMBIO_PATH = os.path.join(sCarpetaTemporal, "TiposDeCambio.csv")
+   AlmacenDeDatos.sLISTADO_PATH = os.path.join(sCarpetaTemporal, "ListadoDeMejoresAcciones.parquet")
+   AgregadosDelListado.sAGREGADOS_PATH = os.path.join(sCarpetaTemporal, "AgregadosDelListado.parquet")
+   EstadisticasDelListado.sESTADISTICAS_PATH = os.path.join(sCarpetaTemporal, "EstadisticasDelListado.json")
+
+   with SimuladorFixer(lMonedas) as oFixer:
+      os.environ["FIXER_API_URL"] = oFixer.sUrl
+      os.environ["FIXER_API_KEY"] = "clave-de-prueba"
+
+      fInicio = time.perf_counter()
+      GenerarMetricas.fConstruirListado(dfCrudo)
+      fTiempo = time.perf_counter() - fInicio
+      iPeticionesPrimera = len(oFixer.lPeticiones)
+      print(f"INFO    - 1ª ejecución: {iNumeroDeTickers} tickers, {len(lMonedas)} monedas, {iPeticionesPrimera} petición(es) a Fixer, {fTiempo:.2f}s")
+      print(f"INFO    - Símbolos pedidos: {oFixer.lPeticiones[0]['symbols'][0]}")
+
+      GenerarMetricas.fConstruirListado(dfCrudo)
+      iPeticionesSegunda = len(oFixer.lPeticiones) - iPeticionesPrimera
+      print(f"INFO    - 2ª ejecución el mismo día: {iPeticionesSegunda} petición(es) a Fixer")
+
+   dfTipos = pd.read_csv(TiposDeCambio.sTIPOS_CAMBIO_PATH)
+   print(f"INFO    - CSV de tipos de cambio con {len(dfTipos)} filas")
+
+   assert iPeticionesPrimera == 1, f"Se esperaba 1 petición a Fixer y se hicieron {iPeticionesPrimera}"
+   assert iPeticionesSegunda == 0, f"Se esperaban 0 peticiones a Fixer y se hicieron {iPeticionesSegunda}"
+   assert len(dfTipos) == len(lMonedas) - 1, "El CSV no contiene todas las monedas"
+   print("INFO    - OK")
@@ -0,0 +1,129 @@
+# Benchmarks\BenchmarkValidadorDeTickers.py
+import sys, os, time
+import io
+import shutil
+import sqlite3
+import tempfile
+import contextlib
+
+"""
+================================================================================
+Benchmark de la Prevalidación de Tickers
+--------------------------------------------------------------------------------
+
+Ejecuta fGenerarMetricas sobre un universo sintético con un 15% de tickers
+deslistados, contra un proveedor de `.info` y un comprobador de lotes falsos.
+Como en producción, el cuello de botella es el limitador de peticiones (aquí a
+escala: 50 peticiones/s y 0.1s por lote, frente a 2 peticiones/s y varios
+segundos por lote con Yahoo):
+   1. Sin prevalidación: cada ticker muerto cuesta una llamada `.info` completa.
+   2. Con prevalidación: los muertos se detectan por lotes y no se consultan.
+   3. Segunda ejecución: los muertos se omiten desde la caché negativa, sin comprobarlos.
+Comprueba además el backoff exponencial de la caché negativa.
+
+Uso:
+   python Benchmarks/BenchmarkValidadorDeTickers.py [iNumeroDeTickers] [fPeticionesPorSegundo]
+
+================================================================================
+"""
+
+# Ruta base = carpeta del proyecto
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.dirname(__file__))
+
+import pandas as pd
+import Lib.GenerarMetricas as GenerarMetricas
+import Lib.AlmacenDeDatos as AlmacenDeDatos
+import Lib.AgregadosDelListado as AgregadosDelListado
+import Lib.EstadisticasDelListado as EstadisticasDelListado
+import Lib.DiarioDeResultados as DiarioDeResultados
+import Lib.ValidadorDeTickers as ValidadorDeTickers
+from ProveedorDeDatosFalso import ProveedorDeDatosFalso
+
+
+class ComprobadorDeLotesFalso:
+   """
+   Sustituto de fComprobarLoteYahoo: una "descarga" por lote con latencia fija.
+   """
+
+   def __init__(self, oProveedor: ProveedorDeDatosFalso, fLatencia: float = 0.1):
+      self.oProveedor = oProveedor
+      self.fLatencia = fLatencia
+      self.iLotes = 0
+      self.iTickers = 0
+
+   def __call__(self, lTickers: list) -> set:
+      self.iLotes += 1
+      self.iTickers += len(lTickers)
+      time.sleep(self.fLatencia)
+      return {sTicker for sTicker in lTickers if not self.oProveedor.fEstaMuerto(sTicker)}
+
+
+def fEjecutar(oProveedor, oComprobador, fPeticionesPorSegundo):
+   fInicio = time.perf_counter()
+   oSalida = io.StringIO()
+   with contextlib.redirect_stdout(oSalida), contextlib.redirect_stderr(io.StringIO()):
+      GenerarMetricas.fGenerarMetricas(8, fPeticionesPorSegundo, oProveedor, fComprobarLote=oComprobador)
+   lResumen = [sLinea for sLinea in oSalida.getvalue().splitlines() if "TOTAL" in sLinea or "Prevalidación" in sLinea]
+   return time.perf_counter() - fInicio, lResumen
+
+
+if __name__ == "__main__":
+   iNumeroDeTickers = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+   fPeticionesPorSegundo = float(sys.argv[2]) if len(sys.argv) > 2 else 50.0
+
+   # Trabajar sobre ficheros temporales para no tocar los datos del proyecto
+   sCarpetaTemporal = tempfile.mkdtemp()
+   GenerarMetricas.sTICKER_LIST_PATH = os.path.join(sCarpetaTemporal, "TickersDeEmpresas.csv")
+   GenerarMetricas.sDATOS_BRUTOS_PATH = os.path.join(sCarpetaTemporal, "MetricasBrutas.parquet")
+   AlmacenDeDatos.sLISTADO_PATH = os.path.join(sCarpetaTemporal, "ListadoDeMejoresAcciones.parquet")
+   AgregadosDelListado.sAGREGADOS_PATH = os.path.join(sCarpetaTemporal, "AgregadosDelListado.parquet")
+   EstadisticasDelListado.sESTADISTICAS_PATH = os.path.join(sCarpetaTemporal, "EstadisticasDelListado.json")
+   DiarioDeResultados.sDIARIO_PATH = os.path.join(sCarpetaTemporal, "DiarioGenerarMetricas.jsonl")
+   ValidadorDeTickers.sTICKERS_MUERTOS_PATH = os.path.join(sCarpetaTemporal, "TickersMuertos.sqlite")
+   GenerarMetricas.fCrearCacheInfo = lambda: None
+   pd.DataFrame({"Indice": "sintetico", "Nombre": "", "Ticker": [f"FAKE{i}" for i in range(iNumeroDeTickers)]}).to_csv(GenerarMetricas.sTICKER_LIST_PATH, index=False)
+
+   oProveedor = ProveedorDeDatosFalso(0.02, fProporcionMuertos=0.15)
+   iMuertos = sum(oProveedor.fEstaMuerto(f"FAKE{i}") for i in range(iNumeroDeTickers))
+   print(f"INFO    - {iNumeroDeTickers} tickers ({iMuertos} deslistados), {fPeticionesPorSegundo} peticiones/s, 8 workers\n")
+
+   # 1. Sin prevalidación
+   fCrearValidador = GenerarMetricas.fCrearValidadorDeTickers
+   GenerarMetricas.fCrearValidadorDeTickers = lambda fComprobarLote=None: None
+   fTiempo, _ = fEjecutar(oProveedor, None, fPeticionesPorSegundo)
+   print(f"INFO    - Sin prevalidación:    {oProveedor.iLlamadas:5d} llamadas `.info` en {fTiempo:.2f}s")
+   assert oProveedor.iLlamadas == iNumeroDeTickers
+   GenerarMetricas.fCrearValidadorDeTickers = fCrearValidador
+
+   # 2. Con prevalidación
+   oProveedor.iLlamadas = 0
+   oComprobador = ComprobadorDeLotesFalso(oProveedor)
+   fTiempo, lResumen = fEjecutar(oProveedor, oComprobador, fPeticionesPorSegundo)
+   print(f"INFO    - Con prevalidación:    {oProveedor.iLlamadas:5d} llamadas `.info` + {oComprobador.iLotes} lotes en {fTiempo:.2f}s")
+   for sLinea in lResumen:
+      print(f"          {sLinea}")
+   assert oProveedor.iLlamadas == iNumeroDeTickers - iMuertos
+
+   # 3. Segunda ejecución: los muertos ni siquiera se comprueban
+   oProveedor.iLlamadas = 0
+   oComprobador = ComprobadorDeLotesFalso(oProveedor)
+   fTiempo, _ = fEjecutar(oProveedor, oComprobador, fPeticionesPorSegundo)
+   print(f"INFO    - Caché negativa:       {oProveedor.iLlamadas:5d} llamadas `.info` + {oComprobador.iLotes} lotes ({oComprobador.iTickers} tickers comprobados) en {fTiempo:.2f}s")
+   assert oComprobador.iTickers == iNumeroDeTickers - iMuertos
+
+   # Backoff exponencial: vencido el primer plazo, un nuevo fallo duplica la espera
+   oConexion = sqlite3.connect(ValidadorDeTickers.sTICKERS_MUERTOS_PATH)
+   oConexion.execute("UPDATE muertos SET proxima = 0")
+   oConexion.commit()
+   oValidador = ValidadorDeTickers.ValidadorDeTickers(ValidadorDeTickers.sTICKERS_MUERTOS_PATH, 200, 24, 720, ComprobadorDeLotesFalso(oProveedor, 0))
+   oValidador.fValidar([f"FAKE{i}" for i in range(iNumeroDeTickers)])
+   oValidador.fCerrar()
+   lPlazos = [fProxima - fFecha for fProxima, fFecha in oConexion.execute("SELECT proxima, fecha FROM muertos WHERE fallos = 2")]
+   oConexion.close()
+   assert len(lPlazos) == iMuertos and all(abs(fPlazo - 48 * 3600) < 1 for fPlazo in lPlazos)
+   print(f"INFO    - Backoff tras el segundo fallo: {lPlazos[0] / 3600:.0f}h")
+
+   shutil.rmtree(sCarpetaTemporal, ignore_errors=True)
+   print("INFO    - OK")
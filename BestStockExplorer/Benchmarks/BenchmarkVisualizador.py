@@ -0,0 +1,100 @@
+# Benchmarks\BenchmarkVisualizador.py
+import sys, os, time
+import shutil
+import logging
+import tempfile
+
+"""
+================================================================================
+Benchmark de Latencia de Rerun del Visualizador de Acciones
+--------------------------------------------------------------------------------
+
+Ejecuta Lib/VisualizadorDeAcciones.py con el motor de pruebas de Streamlit
+(AppTest) sobre listados sintéticos y mide cuánto tarda un rerun al mover un
+slider:
+   - Sin caché: se vacían las cachés antes de cada rerun (carga, outliers,
+     filtros explícitos y rangos de los sliders se recalculan, como antes).
+   - Con caché: rerun normal, solo se reaplican los filtros de la barra lateral.
+Muestra también el coste aislado de la preparación de datos.
+
+Uso:
+   python Benchmarks/BenchmarkVisualizador.py [iNumeroDeFilas ...]
+
+================================================================================
+"""
+
+# Ruta base = carpeta del proyecto
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.dirname(__file__))
+
+import streamlit as st
+import streamlit.logger
+from streamlit.testing.v1 import AppTest
+import Lib.AlmacenDeDatos as AlmacenDeDatos
+import Lib.AgregadosDelListado as AgregadosDelListado
+import Lib.EstadisticasDelListado as EstadisticasDelListado
+import Lib.DatosDelVisualizador as DatosDelVisualizador
+from ListadoSintetico import fGenerarListado
+
+sVISUALIZADOR_PATH = os.path.join(BASE_DIR, "Lib", "VisualizadorDeAcciones.py")
+
+
+def fVaciarCaches():
+   st.cache_data.clear()
+   st.cache_resource.clear()
+
+
+def fMedirRerun(oApp, bVaciarCaches: bool, iRepeticiones: int = 2) -> float:
+   """
+   Mejor tiempo de un rerun tras mover el slider de Puntuación.
+   """
+   oSlider = next(oWidget for oWidget in oApp.slider if oWidget.label.endswith("Puntuación:"))
+   fMejor = float("inf")
+   for iRepeticion in range(iRepeticiones):
+      iMinimo, iMaximo = oSlider.min, oSlider.max
+      oSlider.set_value((iMinimo + iRepeticion % 2, iMaximo))
+      if bVaciarCaches:
+         fVaciarCaches()
+      fInicio = time.perf_counter()
+      oApp.run()
+      fMejor = min(fMejor, time.perf_counter() - fInicio)
+      assert not oApp.exception, oApp.exception[0].message
+      oSlider = next(oWidget for oWidget in oApp.slider if oWidget.label.endswith("Puntuación:"))
+   return fMejor
+
+
+if __name__ == "__main__":
+   lTamanos = [int(sArgumento) for sArgumento in sys.argv[1:]] or [2_500, 50_000]
+   # Silenciar los avisos de Streamlit por ejecutarse sin servidor
+   streamlit.logger.set_log_level(logging.ERROR)
+
+   # Trabajar sobre ficheros temporales para no tocar los datos del proyecto
+   sCarpetaTemporal = tempfile.mkdtemp()
+   AlmacenDeDatos.sLISTADO_PATH = os.path.join(sCarpetaTemporal, "ListadoDeMejoresAcciones.parquet")
+   AgregadosDelListado.sAGREGADOS_PATH = os.path.join(sCarpetaTemporal, "AgregadosDelListado.parquet")
+   EstadisticasDelListado.sESTADISTICAS_PATH = os.path.join(sCarpetaTemporal, "EstadisticasDelListado.json")
+   AlmacenDeDatos.sLISTADO_EXCEL_PATH = os.path.join(sCarpetaTemporal, "ListadoDeMejoresAcciones.xlsx")
+
+   print(f"{'Filas':>8} {'Preparar (s)':>13} {'Caché (s)':>10} {'Rerun sin caché (s)':>20} {'Rerun con caché (s)':>20}")
+   for iNumeroDeFilas in lTamanos:
+      AlmacenDeDatos.fGuardarListado(fGenerarListado(iNumeroDeFilas))
+      fVaciarCaches()
+
+      # Coste aislado de la preparación de datos: en frío y servida desde la caché
+      fInicio = time.perf_counter()
+      DatosDelVisualizador.fObtenerDatos()
+      fPreparar = time.perf_counter() - fInicio
+      fInicio = time.perf_counter()
+      DatosDelVisualizador.fObtenerDatos()
+      fCache = time.perf_counter() - fInicio
+
+      oApp = AppTest.from_file(sVISUALIZADOR_PATH, default_timeout=600).run()
+      assert not oApp.exception, oApp.exception[0].message
+      fSinCache = fMedirRerun(oApp, True)
+      fConCache = fMedirRerun(oApp, False)
+
+      print(f"{iNumeroDeFilas:>8} {fPreparar:>13.3f} {fCache:>10.4f} {fSinCache:>20.2f} {fConCache:>20.2f}")
+
+   shutil.rmtree(sCarpetaTemporal, ignore_errors=True)
+   print("INFO    - OK")
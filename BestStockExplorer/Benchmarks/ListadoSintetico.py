@@ -0,0 +1,45 @@
+# Benchmarks\ListadoSintetico.py
+import numpy as np
+import pandas as pd
+
+from Lib.GenerarMetricas import lCOLUMNAS_RESULTADO
+from Lib.MotorDePuntuacion import fPuntuarAcciones
+from Lib.AlmacenDeDatos import fNormalizarListado
+
+"""
+================================================================================
+Listado Sintético de Acciones
+--------------------------------------------------------------------------------
+
+Genera listados ficticios con las mismas columnas y tipos que el listado real
+(lCOLUMNAS_RESULTADO), de cualquier tamaño y deterministas, para los benchmarks
+de carga y del visualizador.
+
+================================================================================
+"""
+
+
+def fGenerarListado(iNumeroDeFilas: int) -> pd.DataFrame:
+   """
+   Listado puntuado y ordenado de iNumeroDeFilas empresas ficticias, con tipos de AlmacenDeDatos.
+   """
+   oAleatorio = np.random.default_rng(0)
+   dfListado = pd.DataFrame({
+      "Ticker": [f"FAKE{i}" for i in range(iNumeroDeFilas)],
+      "Nombre": [f"Empresa {i}" for i in range(iNumeroDeFilas)],
+      "Sector": oAleatorio.choice(["Technology", "Healthcare", "Energy", "Industrials", "Utilities"], iNumeroDeFilas),
+      "Continente": oAleatorio.choice(["North America", "Europe", "Asia", "South America"], iNumeroDeFilas),
+      "País": oAleatorio.choice(["United States", "Spain", "Germany", "Japan", "Brazil"], iNumeroDeFilas),
+   })
+   for sColumna in lCOLUMNAS_RESULTADO[7:]:
+      aValores = np.round(oAleatorio.normal(10, 20, iNumeroDeFilas), 2)
+      # Algunos huecos, como en los datos reales
+      aValores[oAleatorio.random(iNumeroDeFilas) < 0.05] = np.nan
+      dfListado[sColumna] = aValores
+   # La capitalización (millones de $) es siempre positiva y muy asimétrica
+   dfListado["Capitalización ($)"] = np.round(oAleatorio.lognormal(8, 2, iNumeroDeFilas))
+   dfListado["Calificación"] = None
+   dfListado["Puntuación"] = 0
+   dfListado = fPuntuarAcciones(dfListado[lCOLUMNAS_RESULTADO])
+   dfListado = dfListado.sort_values(by=["Puntuación", "ROE (%)", "P/E"], ascending=[False, False, True], ignore_index=True)
+   return fNormalizarListado(dfListado)
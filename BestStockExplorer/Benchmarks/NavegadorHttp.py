@@ -0,0 +1,71 @@
+# Benchmarks\NavegadorHttp.py
+import time
+import urllib.request
+import urllib.error
+
+"""
+================================================================================
+Navegador HTTP para Benchmarks
+--------------------------------------------------------------------------------
+
+Sustituto local de `SB(uc=True)` para los benchmarks del scraper de tickers:
+implementa los métodos de SeleniumBase que usa Lib/ObtenerTickers.py
+descargando cada página por HTTP (sin JavaScript ni Chrome). fArranque simula
+el tiempo de arrancar el navegador y fRenderizado el de cargar y renderizar
+cada página. Envía la cookie cf_clearance de un navegador que ya ha superado
+la comprobación anti-bot.
+
+================================================================================
+"""
+
+
+class NavegadorHttp:
+   """
+   Se usa como fábrica de navegador (fAbrirNavegador=NavegadorHttp) y como context manager.
+   """
+
+   def __init__(self, fArranque: float = 0.0, fRenderizado: float = 0.0):
+      self.fArranque = fArranque
+      self.fRenderizado = fRenderizado
+      self.sHtml = ""
+      self.iPaginas = 0
+
+
+   def __enter__(self):
+      time.sleep(self.fArranque)
+      return self
+
+
+   def __exit__(self, *args):
+      pass
+
+
+   def open(self, sUrl: str) -> None:
+      oPeticion = urllib.request.Request(sUrl, headers={"Cookie": "cf_clearance=navegador"})
+      try:
+         with urllib.request.urlopen(oPeticion, timeout=30) as oRespuesta:
+            self.sHtml = oRespuesta.read().decode("utf-8")
+      except urllib.error.HTTPError as e:
+         self.sHtml = e.read().decode("utf-8")
+      time.sleep(self.fRenderizado)
+      self.iPaginas += 1
+
+
+   def sleep(self, fSegundos: float) -> None:
+      time.sleep(fSegundos)
+
+
+   def is_element_visible(self, sSelector: str) -> bool:
+      return False
+
+
+   def get_page_source(self) -> str:
+      return self.sHtml
+
+
+   def wait_for_element(self, sSelector: str, timeout: float = None):
+      raise TimeoutError(f"NavegadorHttp no ejecuta JavaScript: {sSelector}")
+
+
+   def click(self, sSelector: str) -> None:
+      raise TimeoutError(f"NavegadorHttp no ejecuta JavaScript: {sSelector}")
@@ -0,0 +1,67 @@
+# Benchmarks\ProveedorDeDatosFalso.py
+import time
+import random
+
+"""
+================================================================================
+Proveedor de Datos Falso
+--------------------------------------------------------------------------------
+
+Sustituto local de `yf.Ticker(sTicker).info` para los benchmarks. Devuelve un
+diccionario `.info` determinista por ticker tras simular la latencia de red,
+sin hacer ninguna petición real.
+
+================================================================================
+"""
+
+
+class ProveedorDeDatosFalso:
+   """
+   Callable compatible con el parámetro `fProveedorDatos` de GenerarMetricas.
+   """
+
+   def __init__(self, fLatencia: float = 0.05, sMoneda: str = "USD", fProporcionMuertos: float = 0.0):
+      self.fLatencia = fLatencia
+      self.sMoneda = sMoneda
+      self.fProporcionMuertos = fProporcionMuertos
+      self.iLlamadas = 0
+
+
+   def fEstaMuerto(self, sTicker: str) -> bool:
+      """
+      Indica si el ticker simula estar deslistado (siempre el mismo resultado para cada ticker).
+      """
+      return random.Random(f"{sTicker}-muerto").random() < self.fProporcionMuertos
+
+
+   def __call__(self, sTicker: str) -> dict:
+      self.iLlamadas += 1
+      time.sleep(self.fLatencia)
+
+      # Yahoo devuelve un `.info` casi vacío para los tickers deslistados
+      if self.fEstaMuerto(sTicker):
+         return {"trailingPegRatio": None}
+
+      # Semilla por ticker para que cada ticker devuelva siempre los mismos datos
+      oAleatorio = random.Random(sTicker)
+      return {
+         "longName": f"Empresa {sTicker}",
+         "sector": oAleatorio.choice(["Technology", "Healthcare", "Energy", "Industrials", "Utilities"]),
+         "financialCurrency": self.sMoneda,
+         "country": oAleatorio.choice(["United States", "Spain", "Germany", "Japan", "Brazil"]),
+         "currentPrice": oAleatorio.uniform(1, 500),
+         "bookValue": oAleatorio.uniform(1, 200),
+         "trailingPE": oAleatorio.uniform(-10, 80),
+         "enterpriseToEbitda": oAleatorio.uniform(-5, 30),
+         "returnOnEquity": oAleatorio.uniform(-0.2, 0.4),
+         "profitMargins": oAleatorio.uniform(-0.1, 0.3),
+         "operatingMargins": oAleatorio.uniform(-0.1, 0.4),
+         "freeCashflow": oAleatorio.uniform(-1e9, 5e9),
+         "dividendYield": oAleatorio.uniform(0, 0.06),
+         "beta": oAleatorio.uniform(0.2, 2.5),
+         "debtToEquity": oAleatorio.uniform(0, 250),
+         "revenueGrowth": oAleatorio.uniform(-0.2, 0.4),
+         "marketCap": oAleatorio.uniform(1e8, 2e12),
+         "trailingEps": oAleatorio.uniform(-2, 20),
+         "earningsGrowth": oAleatorio.uniform(-0.3, 0.5),
+      }
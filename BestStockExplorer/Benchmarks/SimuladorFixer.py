@@ -0,0 +1,67 @@
+# Benchmarks\SimuladorFixer.py
+import json
+import random
+import threading
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+"""
+================================================================================
+Simulador Local de Fixer
+--------------------------------------------------------------------------------
+
+Servidor HTTP local que imita `GET /api/latest` de Fixer (base EUR) y cuenta
+cuántas peticiones recibe, para comprobar sin red cuántas llamadas hace el
+subsistema de tipos de cambio.
+
+================================================================================
+"""
+
+
+class SimuladorFixer:
+   """
+   Arranca el servidor en un hilo en segundo plano. Uso:
+      with SimuladorFixer(lMonedas) as oFixer:
+         os.environ["FIXER_API_URL"] = oFixer.sUrl
+   """
+
+   def __init__(self, lMonedas: list):
+      oAleatorio = random.Random(0)
+      self.dTasas = {sMoneda: round(oAleatorio.uniform(0.1, 150), 4) for sMoneda in lMonedas}
+      self.dTasas.update({"EUR": 1.0, "USD": 1.17})
+      self.lPeticiones = []
+
+      oSimulador = self
+
+      class Manejador(BaseHTTPRequestHandler):
+         def do_GET(self):
+            dParametros = parse_qs(urlparse(self.path).query)
+            oSimulador.lPeticiones.append(dParametros)
+            lSimbolos = dParametros.get("symbols", [""])[0].split(",")
+            dRespuesta = {
+               "success": True,
+               "base": "EUR",
+               "rates": {sSimbolo: oSimulador.dTasas[sSimbolo] for sSimbolo in lSimbolos if sSimbolo in oSimulador.dTasas},
+            }
+            bCuerpo = json.dumps(dRespuesta).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(bCuerpo)))
+            self.end_headers()
+            self.wfile.write(bCuerpo)
+
+         def log_message(self, *args):
+            pass
+
+      self.oServidor = ThreadingHTTPServer(("127.0.0.1", 0), Manejador)
+      self.sUrl = f"http://127.0.0.1:{self.oServidor.server_address[1]}/api/latest"
+
+
+   def __enter__(self):
+      threading.Thread(target=self.oServidor.serve_forever, daemon=True).start()
+      return self
+
+
+   def __exit__(self, *args):
+      self.oServidor.shutdown()
+      self.oServidor.server_close()
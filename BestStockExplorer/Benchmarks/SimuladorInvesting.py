@@ -0,0 +1,151 @@
+# Benchmarks\SimuladorInvesting.py
+import json
+import time
+import random
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+"""
+================================================================================
+Simulador Local de Investing.com
+--------------------------------------------------------------------------------
+
+Servidor HTTP local que sirve páginas con la misma estructura que las de
+Investing.com que lee el scraper de tickers:
+   - /indices/<indice>-components: tabla de componentes (tbody
+     datatable-v2_body__8TXQk, una fila por empresa con su enlace).
+   - /equities/<empresa>: página de la empresa con el <h1> "Nombre (TICKER)".
+Cada página lleva un relleno parecido al de las reales (navegación y el JSON
+de __NEXT_DATA__) y cada petición espera fLatencia segundos. Cuenta las
+peticiones recibidas.
+
+Las empresas de setConDesafio responden con una comprobación anti-bot (403)
+salvo a los clientes con la cookie cf_clearance, como un navegador que ya la
+ha superado (NavegadorHttp la envía).
+
+================================================================================
+"""
+
+
+def fGenerarComponentes(lIndices: list, iEmpresasPorIndice: int, fProporcionRepetidas: float = 0.1, iSemilla: int = 0) -> dict:
+   """
+   Componentes sintéticos: {sIndice: [(sSlug, sNombre, sTicker), ...]}. Una parte de las empresas de cada índice
+   se repite de otro índice (como las que cotizan en varios índices).
+   """
+   oAleatorio = random.Random(iSemilla)
+   dComponentes = {}
+   lTodas = []
+   for iIndice, sIndice in enumerate(lIndices):
+      lEmpresas = []
+      for iEmpresa in range(iEmpresasPorIndice):
+         if lTodas and oAleatorio.random() < fProporcionRepetidas:
+            lEmpresas.append(oAleatorio.choice(lTodas))
+         else:
+            lEmpresas.append((f"empresa-{iIndice}-{iEmpresa}", f"Empresa {iIndice}-{iEmpresa} SA", f"T{iIndice}X{iEmpresa}"))
+      lTodas.extend(lEmpresas)
+      dComponentes[sIndice] = lEmpresas
+   return dComponentes
+
+
+def fRelleno(iRellenoKB: int) -> str:
+   """
+   Relleno de una página: menús de navegación y un bloque __NEXT_DATA__ de unos iRellenoKB KB.
+   """
+   sNavegacion = "".join(f'<li class="navbar_item__x"><a href="/news/{i}">Noticia {i}</a></li>' for i in range(300))
+   sDatos = json.dumps({"props": {"pageProps": {"lista": ["x" * 100] * max(1, iRellenoKB * 10)}}})
+   return f'<nav><ul class="navbar_list__y">{sNavegacion}</ul></nav><script id="__NEXT_DATA__" type="application/json">{sDatos}</script>'
+
+
+class SimuladorInvesting:
+   """
+   Arranca el servidor en un hilo en segundo plano. Uso:
+      with SimuladorInvesting(dComponentes) as oInvesting:
+         os.environ["INVESTING_URL"] = oInvesting.sUrl
+
+   Las empresas de setConDesafio devuelven una página de comprobación anti-bot sin <h1> de empresa a los clientes
+   sin la cookie cf_clearance.
+   """
+
+   def __init__(self, dComponentes: dict, fLatencia: float = 0.02, iRellenoKB: int = 200, setConDesafio: set = None):
+      self.dComponentes = dict(dComponentes)
+      self.fLatencia = fLatencia
+      self.setConDesafio = set(setConDesafio or ())
+      self.dEmpresas = {sSlug: (sNombre, sTicker) for lEmpresas in dComponentes.values() for sSlug, sNombre, sTicker in lEmpresas}
+      self.sRelleno = fRelleno(iRellenoKB)
+      self.iPeticiones = 0
+      self.oCerrojo = threading.Lock()
+
+      oSimulador = self
+
+      class Manejador(BaseHTTPRequestHandler):
+         protocol_version = "HTTP/1.1"
+
+         def do_GET(self):
+            with oSimulador.oCerrojo:
+               oSimulador.iPeticiones += 1
+            time.sleep(oSimulador.fLatencia)
+            iEstado, sHtml = oSimulador.fPagina(self.path, "cf_clearance=" in self.headers.get("Cookie", ""))
+            bCuerpo = sHtml.encode("utf-8")
+            self.send_response(iEstado)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(bCuerpo)))
+            self.end_headers()
+            self.wfile.write(bCuerpo)
+
+         def log_message(self, *args):
+            pass
+
+      self.oServidor = ThreadingHTTPServer(("127.0.0.1", 0), Manejador)
+      self.oServidor.daemon_threads = True
+      self.sUrl = f"http://127.0.0.1:{self.oServidor.server_address[1]}"
+
+
+   def fAnadirEmpresas(self, sIndice: str, lEmpresas: list) -> None:
+      """
+      Añade empresas [(sSlug, sNombre, sTicker), ...] a la tabla de componentes de un índice.
+      """
+      self.dComponentes[sIndice] = self.dComponentes[sIndice] + list(lEmpresas)
+      self.dEmpresas.update({sSlug: (sNombre, sTicker) for sSlug, sNombre, sTicker in lEmpresas})
+
+
+   def fPagina(self, sRuta: str, bSuperaDesafio: bool = False) -> tuple:
+      """
+      Retorna:
+         tuple: (iEstado, sHtml) de la ruta pedida.
+      """
+      sRuta = sRuta.split("?")[0]
+      if sRuta.startswith("/indices/") and sRuta.endswith("-components"):
+         lEmpresas = self.dComponentes.get(sRuta[len("/indices/"):-len("-components")])
+         if lEmpresas is None:
+            return 404, "<html><body><h1>Page not found</h1></body></html>"
+         sFilas = "".join(
+            f'<tr class="datatable-v2_row__hkEus"><td class="datatable-v2_cell__IwP1U"><input type="checkbox"/></td>'
+            f'<td class="datatable-v2_cell__IwP1U dynamic-table-v2_col-name__Xhsxv"><a href="/equities/{sSlug}" title="{sNombre}">{sNombre}</a></td>'
+            f'<td class="datatable-v2_cell__IwP1U">{random.Random(sSlug).uniform(1, 500):.2f}</td></tr>'
+            for sSlug, sNombre, _ in lEmpresas)
+         return 200, (f'<html><head><title>Components</title></head><body>{self.sRelleno}'
+                      f'<h1 class="text-2xl">Index Components</h1><table class="datatable-v2_table__93S4Y">'
+                      f'<tbody class="datatable-v2_body__8TXQk">{sFilas}</tbody></table></body></html>')
+
+      if sRuta.startswith("/equities/"):
+         sSlug = sRuta[len("/equities/"):]
+         if sSlug in self.setConDesafio and not bSuperaDesafio:
+            return 403, "<html><head><title>Just a moment...</title></head><body><h1>Checking your browser</h1></body></html>"
+         if sSlug not in self.dEmpresas:
+            return 404, "<html><body><h1>Page not found</h1></body></html>"
+         sNombre, sTicker = self.dEmpresas[sSlug]
+         return 200, (f'<html><head><title>{sNombre} Stock Price</title></head><body>{self.sRelleno}'
+                      f'<div class="instrument-header"><h1 class="mb-2.5 text-left text-xl font-bold">{sNombre} ({sTicker})</h1></div>'
+                      f'<div class="instrument-price_instrument-price__xfgbB">{random.Random(sSlug).uniform(1, 500):.2f}</div></body></html>')
+
+      return 404, "<html><body><h1>Page not found</h1></body></html>"
+
+
+   def __enter__(self):
+      threading.Thread(target=self.oServidor.serve_forever, daemon=True).start()
+      return self
+
+
+   def __exit__(self, *args):
+      self.oServidor.shutdown()
+      self.oServidor.server_close()
@@ -15,10 +15,21 @@ import matplotlib.pyplot as plt
 # Módulos de PyQt6
 from PyQt6.QtWidgets import (
    QApplication, QWidget, QVBoxLayout, QLabel,
-   QPushButton, QComboBox, QMessageBox
+   QPushButton, QComboBox, QMessageBox, QCheckBox
 )
 from PyQt6.QtCore import Qt
 
+# --- Detección del directorio base (para importar Lib.*) ---
+if getattr(sys, 'frozen', False):
+   sBaseDir = sys._MEIPASS  # Si el script está empaquetado (PyInstaller)
+else:
+   sBaseDir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(sBaseDir)
+
+from Lib.AlmacenDeDatos import fCargarListado, fRutaListado
+from Lib.FiltradoDeOutliers import fObtenerSinOutliers
+from Lib.EstadisticasDelListado import fObtenerVista
+
 
 class HeatmapApp(QWidget):
    """
@@ -36,20 +47,17 @@ class HeatmapApp(QWidget):
       # --- Layout principal ---
       self.oLayoutPrincipal = QVBoxLayout()
 
-      # --- Detección del directorio base ---
-      if getattr(sys, 'frozen', False):
-         sBaseDir = sys._MEIPASS  # Si el script está empaquetado (PyInstaller)
-      else:
-         sBaseDir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-
-      # --- Ruta del archivo Excel con los datos ---
-      sRutaExcel = os.path.join(sBaseDir, "Data", "ListadoDeMejoresAcciones.xlsx")
-
-      # --- Cargar el archivo Excel ---
+      # --- Cargar el listado desde el almacén principal (Parquet) ---
       try:
-         self.dfDatos = pd.read_excel(sRutaExcel, engine='openpyxl')
+         # Firma del fichero cargado: clave de los resultados memorizados del filtrado de outliers
+         sRuta = fRutaListado()
+         oEstado = os.stat(sRuta)
+         self.tFirmaDatos = (sRuta, oEstado.st_mtime_ns, oEstado.st_size)
+         self.dfDatos = fCargarListado()
+         # Estadísticas precalculadas del listado completo (valores distintos de cada columna categórica)
+         self.dEstadisticas = fObtenerVista("Listado", self.dfDatos)
       except Exception as e:
-         QMessageBox.critical(self, "Error", f"No se pudo cargar el archivo Excel:\n{e}")
+         QMessageBox.critical(self, "Error", f"No se pudo cargar el listado de acciones:\n{e}")
          sys.exit(1)
 
       # --- Definir las columnas numéricas relevantes ---
@@ -75,6 +83,9 @@ class HeatmapApp(QWidget):
       self.cboValor = QComboBox()
       self.cboValor.addItem("(Seleccione un filtro primero)")
 
+      self.chkOutliers = QCheckBox("Excluir outliers (mismas reglas que el visualizador)")
+      self.chkOutliers.setChecked(False)  # Por defecto se usan todas las filas
+
       self.btnGenerar = QPushButton("Generar Heatmap")
       self.btnGenerar.clicked.connect(self.fGenerarHeatmap)
 
@@ -83,6 +94,7 @@ class HeatmapApp(QWidget):
       self.oLayoutPrincipal.addWidget(self.cboFiltro)
       self.oLayoutPrincipal.addWidget(self.lblValor)
       self.oLayoutPrincipal.addWidget(self.cboValor)
+      self.oLayoutPrincipal.addWidget(self.chkOutliers)
       self.oLayoutPrincipal.addStretch()
       self.oLayoutPrincipal.addWidget(self.btnGenerar)
 
@@ -103,8 +115,8 @@ class HeatmapApp(QWidget):
          self.cboValor.addItem("(No se aplica filtro)")
          return
 
-      # Obtener valores únicos del campo seleccionado
-      lstValores = sorted(self.dfDatos[sFiltroSeleccionado].dropna().unique())
+      # Valores del campo seleccionado, del fichero de estadísticas (ya ordenados)
+      lstValores = self.dEstadisticas["dCategoricas"][sFiltroSeleccionado]["lValores"]
       self.cboValor.addItems(lstValores)
 
    # ----------------------------------------------------------------------
@@ -115,8 +127,11 @@ class HeatmapApp(QWidget):
       sFiltro = self.cboFiltro.currentText()
       sValor = self.cboValor.currentText()
 
-      # Copiar el DataFrame original
-      dfFiltrado = self.dfDatos.copy()
+      # Partir del listado sin outliers (calculado una vez por fichero) o del original
+      if self.chkOutliers.isChecked():
+         dfFiltrado = fObtenerSinOutliers(self.dfDatos, self.tFirmaDatos)
+      else:
+         dfFiltrado = self.dfDatos
 
       # Aplicar filtro si corresponde
       if sFiltro != "Sin filtro" and "(Seleccione" not in sValor:
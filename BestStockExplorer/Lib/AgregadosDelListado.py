@@ -0,0 +1,143 @@
+# Lib\AgregadosDelListado.py
+import sys, os
+import numpy as np
+import pandas as pd
+
+from Lib.MotorDePuntuacion import lREGLAS_CALIFICACION, sCALIFICACION_POR_DEFECTO
+from Lib import AlmacenDeDatos
+
+"""
+================================================================================
+Tablas Agregadas del Listado (por País, Sector y Continente)
+--------------------------------------------------------------------------------
+
+GenerarMetricas guarda, junto al listado, una tabla con los agregados de cada
+grupo (Data/AgregadosDelListado.parquet), en formato largo: una fila por
+(Dimension, Grupo) con
+   - num_empresas: empresas del grupo.
+   - num_pe, pe_promedio, pe_mediana, pe_q1, pe_q3, pe_min, pe_max: P/E de las
+     empresas con P/E <= fPE_MAXIMO (el mismo tope que usa el visualizador).
+   - puntuacion_promedio, puntuacion_mediana, puntuacion_q1, puntuacion_q3.
+   - num_<Calificación>: empresas de cada calificación.
+El visualizador y el heatmap leen esta tabla en lugar de agrupar el listado.
+
+La tabla se recalcula entera con cada listado: las medianas y los cuartiles no
+se pueden actualizar a partir de las filas cambiadas, y detectar esas filas
+cuesta más que el propio recálculo.
+
+================================================================================
+"""
+
+
+# Detectar si el script está empaquetado con PyInstaller
+if getattr(sys, 'frozen', False):
+   BASE_DIR = sys._MEIPASS  # Ruta temporal generada por PyInstaller
+else:
+   # Ruta base = carpeta del proyecto
+   BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Ruta de la tabla de agregados del listado
+sAGREGADOS_PATH = os.path.join(BASE_DIR, "Data", "AgregadosDelListado.parquet")
+
+# Columnas por las que se agrupa
+lDIMENSIONES = ["País", "Sector", "Continente"]
+# P/E máximo que entra en las estadísticas de P/E
+fPE_MAXIMO = 100
+# Calificaciones, en orden
+lCALIFICACIONES = [sNombre for _, sNombre in lREGLAS_CALIFICACION] + [sCALIFICACION_POR_DEFECTO]
+oTIPO_CALIFICACION = pd.CategoricalDtype(lCALIFICACIONES)
+
+
+
+def fCalcularAgregados(dfListado: pd.DataFrame, sDimension: str) -> pd.DataFrame:
+   """
+   Agregados de una dimensión.
+
+   Parámetros:
+      dfListado (DataFrame): Listado completo.
+      sDimension (str): Columna por la que se agrupa.
+
+   Retorna:
+      DataFrame: Una fila por grupo, con las columnas descritas en la cabecera del módulo.
+   """
+   dfDatos = dfListado[[sDimension, "P/E", "Puntuación", "Calificación"]]
+
+   # Se factoriza el grupo una sola vez y se agrupa por códigos enteros
+   aCodigos, aGrupos = pd.factorize(dfDatos[sDimension], sort=True, use_na_sentinel=True)
+   aValidas = aCodigos >= 0
+   aCodigos = aCodigos[aValidas]
+
+   sPe = pd.to_numeric(dfDatos["P/E"], errors="coerce").to_numpy(dtype=float, na_value=np.nan)[aValidas]
+   dfValores = pd.DataFrame({
+      "pe": np.where(sPe <= fPE_MAXIMO, sPe, np.nan),
+      "puntuacion": pd.to_numeric(dfDatos["Puntuación"], errors="coerce").to_numpy(dtype=float, na_value=np.nan)[aValidas],
+   })
+   oGrupos = dfValores.groupby(aCodigos, sort=True)
+   dfCuartiles = oGrupos.quantile([0.25, 0.5, 0.75]).unstack().reindex(
+      columns=pd.MultiIndex.from_product([["pe", "puntuacion"], [0.25, 0.5, 0.75]]), index=range(len(aGrupos)))
+
+   dfAgregados = pd.DataFrame({
+      "Dimension": sDimension,
+      "Grupo": pd.array(aGrupos, dtype="string"),
+      "num_empresas": np.bincount(aCodigos, minlength=len(aGrupos)),
+      "num_pe": oGrupos["pe"].count().reindex(range(len(aGrupos)), fill_value=0).to_numpy(),
+      "pe_promedio": oGrupos["pe"].mean().reindex(range(len(aGrupos))).to_numpy(),
+      "pe_mediana": dfCuartiles[("pe", 0.5)].to_numpy(),
+      "pe_q1": dfCuartiles[("pe", 0.25)].to_numpy(),
+      "pe_q3": dfCuartiles[("pe", 0.75)].to_numpy(),
+      "pe_min": oGrupos["pe"].min().reindex(range(len(aGrupos))).to_numpy(),
+      "pe_max": oGrupos["pe"].max().reindex(range(len(aGrupos))).to_numpy(),
+      "puntuacion_promedio": oGrupos["puntuacion"].mean().reindex(range(len(aGrupos))).to_numpy(),
+      "puntuacion_mediana": dfCuartiles[("puntuacion", 0.5)].to_numpy(),
+      "puntuacion_q1": dfCuartiles[("puntuacion", 0.25)].to_numpy(),
+      "puntuacion_q3": dfCuartiles[("puntuacion", 0.75)].to_numpy(),
+   })
+
+   # Empresas por calificación: un bincount sobre (grupo, calificación)
+   aCalificaciones = dfDatos["Calificación"].astype(oTIPO_CALIFICACION).cat.codes.to_numpy()[aValidas]
+   aConCalificacion = aCalificaciones >= 0
+   aCuentas = np.bincount(aCodigos[aConCalificacion] * len(lCALIFICACIONES) + aCalificaciones[aConCalificacion],
+                          minlength=len(aGrupos) * len(lCALIFICACIONES)).reshape(len(aGrupos), len(lCALIFICACIONES))
+   for iCalificacion, sCalificacion in enumerate(lCALIFICACIONES):
+      dfAgregados[f"num_{sCalificacion}"] = aCuentas[:, iCalificacion]
+
+   lEnteros = ["num_empresas", "num_pe"] + [f"num_{sCalificacion}" for sCalificacion in lCALIFICACIONES]
+   dfAgregados[lEnteros] = dfAgregados[lEnteros].astype("int64")
+   return dfAgregados
+
+
+def fCalcularTodos(dfListado: pd.DataFrame) -> pd.DataFrame:
+   """
+   Agregados de todas las dimensiones de lDIMENSIONES.
+   """
+   return pd.concat([fCalcularAgregados(dfListado, sDimension) for sDimension in lDIMENSIONES], ignore_index=True)
+
+
+def fGuardarAgregados(dfAgregados: pd.DataFrame) -> None:
+   sRutaTemporal = sAGREGADOS_PATH + ".tmp"
+   dfAgregados.to_parquet(sRutaTemporal, index=False)
+   os.replace(sRutaTemporal, sAGREGADOS_PATH)
+
+
+def fCargarAgregados(sDimension: str = None) -> pd.DataFrame:
+   """
+   Carga la tabla de agregados (o solo una dimensión).
+
+   Retorna:
+      DataFrame: Los agregados, o None si todavía no se han generado.
+   """
+   if not os.path.exists(sAGREGADOS_PATH):
+      return None
+   lFiltros = [("Dimension", "==", sDimension)] if sDimension is not None else None
+   return pd.read_parquet(sAGREGADOS_PATH, filters=lFiltros)
+
+
+def fObtenerAgregados(dfListado: pd.DataFrame) -> pd.DataFrame:
+   """
+   Agregados guardados si están al día respecto al listado guardado; si no (listados generados antes de
+   existir esta tabla), se calculan al momento a partir de dfListado.
+   """
+   sRutaListado = AlmacenDeDatos.fRutaListado()
+   if os.path.exists(sAGREGADOS_PATH) and os.path.exists(sRutaListado) and os.path.getmtime(sAGREGADOS_PATH) >= os.path.getmtime(sRutaListado):
+      return fCargarAgregados()
+   return fCalcularTodos(dfListado)
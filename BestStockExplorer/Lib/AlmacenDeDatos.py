@@ -0,0 +1,106 @@
+# Lib\AlmacenDeDatos.py
+import sys, os
+import pandas as pd
+
+"""
+================================================================================
+Almacén Principal del Listado de Acciones (Parquet)
+--------------------------------------------------------------------------------
+
+El listado que genera GenerarMetricas y leen VisualizadorDeAcciones y
+Graficos/Heatmap.py se guarda en Data/ListadoDeMejoresAcciones.parquet, con
+tipos fijos por columna (textos, categoría, enteros y float64). Leer Parquet es
+órdenes de magnitud más rápido que interpretar el Excel y permite cargar solo
+las columnas necesarias.
+
+El Excel (Data/ListadoDeMejoresAcciones.xlsx) queda como exportación opcional.
+Si todavía no existe el Parquet, se lee el Excel de ejecuciones anteriores.
+
+================================================================================
+"""
+
+
+# Detectar si el script está empaquetado con PyInstaller
+if getattr(sys, 'frozen', False):
+   BASE_DIR = sys._MEIPASS  # Ruta temporal generada por PyInstaller
+else:
+   # Ruta base = carpeta del proyecto
+   BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Ruta del listado con todos los datos de las empresas (almacén principal)
+sLISTADO_PATH = os.path.join(BASE_DIR, "Data", "ListadoDeMejoresAcciones.parquet")
+# Ruta de la exportación opcional del listado a Excel
+sLISTADO_EXCEL_PATH = os.path.join(BASE_DIR, "Data", "ListadoDeMejoresAcciones.xlsx")
+
+# Tipo de cada columna del listado (las columnas no indicadas son float64)
+dTIPOS_LISTADO = {
+   "Ticker": "string",
+   "Nombre": "string",
+   "Sector": "string",
+   "Continente": "string",
+   "País": "string",
+   "Calificación": "category",
+   "Puntuación": "int64",
+}
+
+
+
+def fNormalizarListado(dfListado: pd.DataFrame) -> pd.DataFrame:
+   """
+   Aplica los tipos de dTIPOS_LISTADO; el resto de columnas se convierte a float64.
+   """
+   dfListado = dfListado.copy()
+   for sColumna in dfListado.columns:
+      sTipo = dTIPOS_LISTADO.get(sColumna)
+      if sTipo is None:
+         dfListado[sColumna] = pd.to_numeric(dfListado[sColumna], errors="coerce").astype("float64")
+      elif sTipo == "int64":
+         dfListado[sColumna] = pd.to_numeric(dfListado[sColumna], errors="coerce").fillna(-1).astype("int64")
+      else:
+         dfListado[sColumna] = dfListado[sColumna].astype(sTipo)
+   return dfListado
+
+
+def fGuardarListado(dfListado: pd.DataFrame, bExportarExcel: bool = False) -> None:
+   """
+   Guarda el listado en Parquet (escribiendo primero a un temporal para no dejarlo a medias)
+   y, opcionalmente, lo exporta también a Excel.
+
+   Parámetros:
+      dfListado (DataFrame): Listado final ordenado.
+      bExportarExcel (bool): True escribe además sLISTADO_EXCEL_PATH.
+   """
+   sRutaTemporal = sLISTADO_PATH + ".tmp"
+   fNormalizarListado(dfListado).to_parquet(sRutaTemporal, index=False)
+   os.replace(sRutaTemporal, sLISTADO_PATH)
+
+   if bExportarExcel:
+      dfListado.to_excel(sLISTADO_EXCEL_PATH, index=False)
+
+
+def fRutaListado() -> str:
+   """
+   Ruta del fichero del que se lee el listado: el Parquet o, si aún no existe, el Excel anterior.
+   """
+   return sLISTADO_PATH if os.path.exists(sLISTADO_PATH) else sLISTADO_EXCEL_PATH
+
+
+def fExisteListado() -> bool:
+   return os.path.exists(fRutaListado())
+
+
+def fCargarListado(lColumnas: list = None) -> pd.DataFrame:
+   """
+   Carga el listado desde Parquet o, si aún no existe, desde el Excel de ejecuciones anteriores.
+
+   Parámetros:
+      lColumnas (list): Columnas a cargar (por defecto, todas).
+
+   Retorna:
+      DataFrame: El listado con los tipos de dTIPOS_LISTADO.
+   """
+   if fRutaListado() == sLISTADO_PATH:
+      return pd.read_parquet(sLISTADO_PATH, columns=lColumnas)
+
+   print(f"INFO    - fCargarListado: No existe {sLISTADO_PATH}, se lee {sLISTADO_EXCEL_PATH}")
+   return fNormalizarListado(pd.read_excel(sLISTADO_EXCEL_PATH, usecols=lColumnas))
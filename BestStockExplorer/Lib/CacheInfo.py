@@ -0,0 +1,167 @@
+# Lib\CacheInfo.py
+import sys, os, time
+import json
+import zlib
+import sqlite3
+import threading
+
+"""
+================================================================================
+Caché Persistente de `.info` de Yahoo Finance
+--------------------------------------------------------------------------------
+
+Guarda en SQLite el diccionario `.info` completo de cada ticker (JSON comprimido
+con zlib) junto con la fecha de descarga. Una entrada se reutiliza mientras no
+supere su tiempo de vida (iTTLHoras), de modo que repetir una ejecución el mismo
+día no hace ninguna llamada de red. El TTL es único por ticker y no por campo:
+el `.info` se descarga entero en una sola llamada, así que refrescar un campo
+caducado (el precio) vuelve a descargar también los fundamentales.
+
+================================================================================
+"""
+
+
+# Detectar si el script está empaquetado con PyInstaller
+if getattr(sys, 'frozen', False):
+   BASE_DIR = sys._MEIPASS  # Ruta temporal generada por PyInstaller
+else:
+   # Ruta base = carpeta del proyecto
+   BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Ruta de la base de datos con la caché de `.info`
+sCACHE_INFO_PATH = os.path.join(BASE_DIR, "Data", "CacheInfo.sqlite")
+# Ruta para almacenar la configuracion de la CACHE_INFO
+sCONFIG_PATH = os.path.join(BASE_DIR, "Config", "Config.json")
+
+# Horas de vida de una entrada. Yahoo devuelve el `.info` completo en una sola llamada, así que no se pueden
+# refrescar solo algunos campos: la entrada entera caduca a la vez y el TTL debe ser el del campo más volátil
+# que se use (currentPrice, a diario).
+iTTL_HORAS = 24
+
+
+class CacheInfo:
+   """
+   Caché de lectura a través (read-through) de los `.info` de Yahoo Finance.
+   Es segura para usarse desde varios hilos a la vez.
+   """
+
+   def __init__(self, sRuta: str = sCACHE_INFO_PATH, iTTLHoras: float = iTTL_HORAS):
+      """
+      Parámetros:
+         sRuta (str): Ruta del fichero SQLite.
+         iTTLHoras (float): Horas de vida de cada entrada.
+      """
+      self.sRuta = sRuta
+      self.fTTL = float(iTTLHoras) * 3600
+      self.iAciertos = 0
+      self.iFallos = 0
+      self.oCerrojo = threading.Lock()
+
+      os.makedirs(os.path.dirname(sRuta), exist_ok=True)
+      self.oConexion = sqlite3.connect(sRuta, check_same_thread=False)
+      self.oConexion.execute("CREATE TABLE IF NOT EXISTS info (ticker TEXT PRIMARY KEY, fecha REAL NOT NULL, datos BLOB NOT NULL)")
+      self.oConexion.commit()
+
+
+   def fLeer(self, sTicker: str) -> tuple:
+      """
+      Retorna:
+         tuple: (dInfo, fFecha) guardados para el ticker, o (None, None) si no está en caché.
+      """
+      with self.oCerrojo:
+         oFila = self.oConexion.execute("SELECT datos, fecha FROM info WHERE ticker = ?", (sTicker,)).fetchone()
+      if oFila is None:
+         return None, None
+      return json.loads(zlib.decompress(oFila[0]).decode("utf-8")), oFila[1]
+
+
+   def fGuardar(self, sTicker: str, dInfo: dict, fFecha: float = None) -> None:
+      """
+      Guarda (o reemplaza) el `.info` de un ticker con su fecha de descarga.
+      """
+      bDatos = zlib.compress(json.dumps(dInfo, default=str).encode("utf-8"))
+      with self.oCerrojo:
+         self.oConexion.execute("INSERT OR REPLACE INTO info (ticker, fecha, datos) VALUES (?, ?, ?)", (sTicker, fFecha or time.time(), bDatos))
+         self.oConexion.commit()
+
+
+   def fEsVigente(self, fFecha: float) -> bool:
+      """
+      Indica si una entrada descargada en fFecha no ha superado el TTL.
+      """
+      return time.time() - fFecha < self.fTTL
+
+
+   def fTickersVigentes(self) -> set:
+      """
+      Tickers cuya entrada sigue vigente (sin descomprimir los `.info`).
+      """
+      with self.oCerrojo:
+         lFilas = self.oConexion.execute("SELECT ticker, fecha FROM info").fetchall()
+      return {sTicker for sTicker, fFecha in lFilas if self.fEsVigente(fFecha)}
+
+
+   def fObtener(self, sTicker: str, fDescargar) -> dict:
+      """
+      Devuelve el `.info` de la caché si sigue vigente; si no, lo descarga con `fDescargar`
+      y lo guarda. Solo se guardan respuestas con información útil (con `longName`).
+      """
+      dInfo, _ = self.fObtenerConFecha(sTicker, fDescargar)
+      return dInfo
+
+
+   def fObtenerConFecha(self, sTicker: str, fDescargar) -> tuple:
+      """
+      Igual que fObtener, pero devuelve también la fecha de descarga del `.info`.
+
+      Retorna:
+         tuple: (dInfo, fFecha)
+      """
+      dInfo, fFecha = self.fLeer(sTicker)
+      if dInfo is not None and self.fEsVigente(fFecha):
+         with self.oCerrojo:
+            self.iAciertos += 1
+         return dInfo, fFecha
+
+      with self.oCerrojo:
+         self.iFallos += 1
+
+      fFecha = time.time()
+      dInfo = fDescargar(sTicker)
+      if dInfo and dInfo.get("longName") is not None:
+         self.fGuardar(sTicker, dInfo, fFecha)
+      return dInfo, fFecha
+
+
+   def fResumen(self) -> str:
+      return f"Caché de .info: {self.iAciertos} aciertos, {self.iFallos} fallos"
+
+
+   def fCerrar(self) -> None:
+      with self.oCerrojo:
+         self.oConexion.close()
+
+
+
+def fCrearCacheInfo():
+   """
+   Crea la caché según la sección CACHE_INFO de Config.json.
+
+   Retorna:
+      CacheInfo: La caché, o None si está desactivada.
+   """
+   dConfigGeneral = {
+      "bActivada": True,
+      "iTTLHoras": iTTL_HORAS,
+   }
+   try:
+      with open(sCONFIG_PATH, 'r') as sFicheroConfig:
+         dConfiguracion = json.load(sFicheroConfig)
+      dConfigGeneral.update(dConfiguracion.get('CACHE_INFO', {}))
+   except FileNotFoundError:
+      print(f"ERROR   - fCrearCacheInfo: El archivo {sCONFIG_PATH} no se encuentra, se usan valores por defecto. \n")
+
+   if not dConfigGeneral['bActivada']:
+      return None
+
+   return CacheInfo(sCACHE_INFO_PATH, dConfigGeneral['iTTLHoras'])
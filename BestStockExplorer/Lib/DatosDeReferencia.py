@@ -0,0 +1,210 @@
+# Lib\DatosDeReferencia.py
+import sys, os
+import csv
+import json
+
+"""
+================================================================================
+Datos de Referencia Precompilados
+--------------------------------------------------------------------------------
+
+Tablas de consulta directa (un acceso a diccionario por ticker) para:
+   - País (como lo devuelve Yahoo, en inglés) -> código ISO -> continente.
+   - Sufijo de Yahoo -> bolsa -> moneda por defecto -> país.
+   - Índice (IndicesGlobales.csv) -> sufijo -> país.
+
+Las tablas de países se construyen a partir de pycountry_convert, y las de
+sufijos e índices a partir de Data/IndicesGlobales.csv y
+Data/BolsasPorSufijo.csv. Se construyen una sola vez, se serializan en
+Data/DatosDeReferencia.json y se cargan al importar el módulo. Solo se vuelven
+a construir si el JSON no existe o alguno de los CSV de origen es más reciente.
+El JSON es un fichero generado y no se versiona (ver .gitignore).
+
+================================================================================
+"""
+
+
+# Detectar si el script está empaquetado con PyInstaller
+if getattr(sys, 'frozen', False):
+   BASE_DIR = sys._MEIPASS  # Ruta temporal generada por PyInstaller
+else:
+   # Ruta base = carpeta del proyecto
+   BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Ruta del fichero con los datos de referencia ya compilados
+sDATOS_REFERENCIA_PATH = os.path.join(BASE_DIR, "Data", "DatosDeReferencia.json")
+# Ruta con los índices globales, su país y el sufijo de Yahoo de sus tickers
+sINDICES_GLOBALES_PATH = os.path.join(BASE_DIR, "Data", "IndicesGlobales.csv")
+# Ruta con la bolsa, la moneda y el país de cada sufijo de Yahoo
+sBOLSAS_POR_SUFIJO_PATH = os.path.join(BASE_DIR, "Data", "BolsasPorSufijo.csv")
+
+# Nombre de cada código de continente de pycountry_convert
+dNOMBRES_CONTINENTES = {
+   "NA": "North America",
+   "SA": "South America",
+   "EU": "Europe",
+   "AF": "Africa",
+   "AS": "Asia",
+   "OC": "Oceania"
+}
+
+
+
+def fConstruirTablasDePaises() -> dict:
+   """
+   Construye las tablas de países y continentes a partir de pycountry_convert.
+   Solo se necesita pycountry_convert aquí, no al consultar las tablas.
+
+   Retorna:
+      dict: {"dPaisACodigo", "dCodigoAContinente", "dPaisAContinente"}
+   """
+   from pycountry_convert import map_country_name_to_country_alpha2, map_country_alpha2_to_country_alpha3, \
+      country_name_to_country_alpha2, country_alpha2_to_continent_code
+
+   # Todas las formas de escribir un país que acepta pycountry_convert: nombres, alpha-2 y alpha-3
+   dAlpha2AAlpha3 = map_country_alpha2_to_country_alpha3()
+   lClavesPais = list(map_country_name_to_country_alpha2().keys()) + list(dAlpha2AAlpha3.keys()) + list(dAlpha2AAlpha3.values())
+
+   dPaisACodigo = {}
+   dCodigoAContinente = {}
+   dPaisAContinente = {}
+   for sPais in lClavesPais:
+      try:
+         sCodigoPais = country_name_to_country_alpha2(sPais)
+         dPaisACodigo[sPais] = sCodigoPais
+         sCodigoContinente = country_alpha2_to_continent_code(sCodigoPais)
+      except Exception:
+         # Mismo criterio que la consulta directa a pycountry_convert: lo que no convierte es "Desconocido"
+         continue
+      dCodigoAContinente[sCodigoPais] = sCodigoContinente
+      dPaisAContinente[sPais] = dNOMBRES_CONTINENTES.get(sCodigoContinente, "Desconocido")
+
+   return {
+      "dPaisACodigo": dPaisACodigo,
+      "dCodigoAContinente": dCodigoAContinente,
+      "dPaisAContinente": dPaisAContinente,
+   }
+
+
+def fConstruirTablasDeBolsas() -> dict:
+   """
+   Construye las tablas de sufijos e índices a partir de los CSV de Data (no dependen de pycountry_convert).
+   Si falta un CSV o no tiene filas se lanza la excepción: sin estas tablas el scraper guardaría los tickers
+   sin el sufijo de su bolsa y las monedas por defecto serían siempre USD.
+
+   Retorna:
+      dict: {"dSufijos", "dIndices"}
+   """
+   # Sufijo de Yahoo -> [bolsa, moneda por defecto, código ISO del país]
+   dSufijos = {}
+   with open(sBOLSAS_POR_SUFIJO_PATH, mode="r", newline='', encoding="utf-8") as f:
+      for row in csv.DictReader(f):
+         dSufijos[row["Sufijo"]] = [row["Bolsa"], row["Moneda"], row["CodigoPais"]]
+
+   # Índice -> [sufijo, país]
+   dIndices = {}
+   with open(sINDICES_GLOBALES_PATH, mode="r", newline='', encoding="utf-8") as f:
+      for row in csv.DictReader(f):
+         dIndices[row["Indice"]] = [row["Sufijo"], row["Pais"]]
+
+   if not dSufijos or not dIndices:
+      raise ValueError(f"Sin filas en {sBOLSAS_POR_SUFIJO_PATH if not dSufijos else sINDICES_GLOBALES_PATH}")
+
+   return {"dSufijos": dSufijos, "dIndices": dIndices}
+
+
+def fGuardarDatosDeReferencia(dDatos: dict) -> None:
+   """
+   Serializa las tablas en JSON compacto con una escritura atómica (temporal + os.replace).
+   """
+   sRutaTemporal = sDATOS_REFERENCIA_PATH + ".tmp"
+   with open(sRutaTemporal, mode="w", encoding="utf-8") as f:
+      json.dump(dDatos, f, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+   os.replace(sRutaTemporal, sDATOS_REFERENCIA_PATH)
+
+
+def fCargarDatosDeReferencia() -> dict:
+   """
+   Carga las tablas ya compiladas. Si el JSON no existe, está incompleto o está desactualizado respecto a
+   los CSV de origen, se reconstruye y se guarda.
+
+   Sin pycountry_convert, las tablas de países quedan vacías (todo país es "Desconocido") y el JSON no se
+   guarda, para volver a intentarlo en la siguiente ejecución. Las de sufijos e índices salen de los CSV y,
+   si no se pueden leer, la excepción se propaga (ver fConstruirTablasDeBolsas).
+   """
+   bVigente = os.path.exists(sDATOS_REFERENCIA_PATH) and all(
+      os.path.getmtime(sDATOS_REFERENCIA_PATH) >= os.path.getmtime(sRuta)
+      for sRuta in (sINDICES_GLOBALES_PATH, sBOLSAS_POR_SUFIJO_PATH) if os.path.exists(sRuta)
+   )
+   if bVigente:
+      with open(sDATOS_REFERENCIA_PATH, mode="r", encoding="utf-8") as f:
+         dDatos = json.load(f)
+      # Un JSON con alguna tabla vacía no se da por bueno
+      if all(dDatos.get(sTabla) for sTabla in ("dPaisACodigo", "dCodigoAContinente", "dPaisAContinente", "dSufijos", "dIndices")):
+         return dDatos
+
+   dDatos = fConstruirTablasDeBolsas()
+   try:
+      dDatos.update(fConstruirTablasDePaises())
+   except ImportError as e:
+      print(f"ERROR   - fCargarDatosDeReferencia: Sin pycountry_convert no se pueden construir las tablas de países, "
+            f"todos los países serán 'Desconocido': {e}")
+      dDatos.update({"dPaisACodigo": {}, "dCodigoAContinente": {}, "dPaisAContinente": {}})
+      return dDatos
+
+   try:
+      fGuardarDatosDeReferencia(dDatos)
+   except OSError as e:
+      print(f"ERROR   - fCargarDatosDeReferencia: No se pudo guardar {sDATOS_REFERENCIA_PATH}: {e}")
+
+   return dDatos
+
+
+# Tablas cargadas una sola vez al importar el módulo
+dDatosDeReferencia = fCargarDatosDeReferencia()
+dPaisACodigo = dDatosDeReferencia["dPaisACodigo"]
+dCodigoAContinente = dDatosDeReferencia["dCodigoAContinente"]
+dPaisAContinente = dDatosDeReferencia["dPaisAContinente"]
+dSufijos = dDatosDeReferencia["dSufijos"]
+dIndices = dDatosDeReferencia["dIndices"]
+
+
+
+def fObtenerContinente(sPais) -> str:
+   """
+   Devuelve el continente de un país (nombre en inglés o código ISO), o "Desconocido".
+   """
+   return dPaisAContinente.get(sPais, "Desconocido")
+
+
+def fObtenerSufijo(sTicker: str) -> str:
+   """
+   Devuelve el sufijo de Yahoo de un ticker (ej. ".MC"), o "" si no tiene un sufijo de bolsa conocido.
+   """
+   iPunto = sTicker.rfind(".")
+   sSufijo = sTicker[iPunto:] if iPunto > 0 else ""
+   return sSufijo if sSufijo in dSufijos else ""
+
+
+def fObtenerBolsa(sTicker: str) -> str:
+   """
+   Devuelve el nombre de la bolsa en la que cotiza un ticker según su sufijo.
+   """
+   return dSufijos.get(fObtenerSufijo(sTicker), [None])[0]
+
+
+def fObtenerMonedaPorDefecto(sTicker: str) -> str:
+   """
+   Devuelve la moneda por defecto de la bolsa de un ticker (ej. "EUR" para ".MC"), o "USD".
+   """
+   lBolsa = dSufijos.get(fObtenerSufijo(sTicker))
+   return lBolsa[1] if lBolsa else "USD"
+
+
+def fObtenerIndice(sIndice: str) -> tuple:
+   """
+   Retorna:
+      tuple: (sSufijo, sPais) de un índice de IndicesGlobales.csv, o ("", None) si no se conoce.
+   """
+   lIndice = dIndices.get(sIndice)
+   return (lIndice[0], lIndice[1]) if lIndice else ("", None)
@@ -0,0 +1,206 @@
+# Lib\DatosDelVisualizador.py
+import sys, os, time
+import hashlib
+import pandas as pd
+import streamlit as st
+
+from Lib.AlmacenDeDatos import fCargarListado, fRutaListado
+from Lib.IndiceDeFiltros import IndiceDeFiltros
+from Lib.FiltradoDeOutliers import fObtenerSinOutliers, fAplicarFiltrosExplicitos
+from Lib.EstadisticasDelListado import fCalcularVista, fObtenerVista, lCOLUMNAS_TEXTO, lCOLUMNAS_NUMERICAS
+from Lib.AgregadosDelListado import fObtenerAgregados
+from Lib.ExportacionDelVisualizador import dFORMATOS_EXPORTACION
+from Lib.GraficosDelVisualizador import fGraficosAvanzados, fGraficoValoracionPorDimension
+from Lib.InstrumentacionDelVisualizador import fRegistrarFalloDeCache
+
+"""
+================================================================================
+Capa de Datos Cacheada del Visualizador de Acciones
+--------------------------------------------------------------------------------
+
+Streamlit vuelve a ejecutar VisualizadorDeAcciones.py entero con cada cambio de
+un widget. Todo lo que depende solo del fichero de datos (la carga, el filtrado
+de outliers y los filtros explícitos de Lib/FiltradoDeOutliers.py, las opciones
+y rangos de la barra lateral, el IndiceDeFiltros que los resuelve y los
+agregados por grupo de Lib/AgregadosDelListado.py) se calcula aquí una sola vez
+por versión del fichero. Las opciones y rangos salen de las estadísticas que
+guarda GenerarMetricas (Lib/EstadisticasDelListado.py), sin recorrer los datos:
+   - fHashDelListado (st.cache_data): hash del contenido, recalculado solo cuando
+     cambian la fecha de modificación o el tamaño del fichero.
+   - fPrepararDatos (st.cache_resource): los DataFrames ya preparados, por hash
+     de contenido. Se comparten entre reruns y sesiones sin copiarse, así que
+     no se deben modificar in situ.
+
+Mover un slider solo resuelve los filtros de la barra lateral sobre el índice.
+La exportación de resultados se genera solo al pulsar el botón de descarga y se
+cachea por versión del fichero, firma de filtros y formato
+(fObtenerExportacion).
+
+Las secciones independientes del visualizador (tabla, comparación, gráficos
+avanzados, análisis por país y exportación) son fragmentos de Streamlit: sus
+widgets solo vuelven a ejecutar su propia sección. Las figuras de cada una se
+cachean aquí por sus propias entradas (fObtenerGraficosAvanzados,
+fObtenerGraficoPorDimension), así que un rerun completo tampoco las reconstruye
+si sus filtros no han cambiado.
+
+================================================================================
+"""
+
+
+# Columnas que se filtran con selectbox (lCOLUMNAS_TEXTO) y con sliders de rango (lCOLUMNAS_NUMERICAS):
+# ver Lib/EstadisticasDelListado.py
+# Filas por página de la tabla paginada (solo se envía al navegador la página visible)
+lFILAS_POR_PAGINA = [25, 50, 100, 250]
+
+
+
+def fFirmaDelListado() -> tuple:
+   """
+   Retorna:
+      tuple: (sRuta, iModificacionNs, iTamano) del fichero de datos, sin leer su contenido.
+   """
+   sRuta = fRutaListado()
+   oEstado = os.stat(sRuta)
+   return sRuta, oEstado.st_mtime_ns, oEstado.st_size
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def fHashDelListado(sRuta: str, iModificacionNs: int, iTamano: int) -> str:
+   """
+   Hash del contenido del fichero de datos. La fecha y el tamaño solo forman parte de la clave de la caché:
+   si el fichero se reescribe con el mismo contenido, el hash (y por tanto los datos preparados) no cambia.
+   """
+   fRegistrarFalloDeCache("fHashDelListado")
+   oHash = hashlib.blake2b(digest_size=16)
+   with open(sRuta, "rb") as f:
+      for bBloque in iter(lambda: f.read(1 << 20), b""):
+         oHash.update(bBloque)
+   return oHash.hexdigest()
+
+
+def fOpcionesSidebar(dVista: dict) -> tuple:
+   """
+   Opciones de la barra lateral a partir de las estadísticas de la vista "Visualizador" (ver
+   Lib/EstadisticasDelListado.py).
+
+   Retorna:
+      tuple: (dOpcionesTexto, dRangosNumericos) con las opciones de cada selectbox ("Todos" + valores únicos
+             ordenados) y el rango (min, max) entero de cada slider.
+   """
+   dOpcionesTexto = {col: ["Todos"] + dVista["dCategoricas"][col]["lValores"] for col in lCOLUMNAS_TEXTO}
+
+   dRangosNumericos = {}
+   for col, dColumna in dVista["dNumericas"].items():
+      # Mínimo y máximo de los valores finitos (None si la columna no tiene ninguno)
+      min_val = int(dColumna["fMin"]) if dColumna["fMin"] is not None else 0
+      max_val = int(dColumna["fMax"]) if dColumna["fMax"] is not None else 1
+      dRangosNumericos[col] = (min_val, max_val)
+
+   return dOpcionesTexto, dRangosNumericos
+
+
+def fCalcularOpcionesSidebar(dfFiltradoExplicito: pd.DataFrame) -> tuple:
+   """
+   fOpcionesSidebar recorriendo dfFiltradoExplicito (sin usar el fichero de estadísticas).
+   """
+   return fOpcionesSidebar(fCalcularVista(dfFiltradoExplicito))
+
+
+@st.cache_resource(max_entries=2, show_spinner="Cargando datos...")
+def fPrepararDatos(sRuta: str, sHash: str) -> dict:
+   """
+   Carga el listado y calcula todo lo que depende solo de los datos. Se ejecuta una vez por contenido del fichero.
+
+   Parámetros:
+      sRuta (str): Fichero de datos (forma parte de la clave de la caché).
+      sHash (str): Hash de su contenido (forma parte de la clave de la caché).
+
+   Retorna:
+      dict: sHash, dfOriginal, dfSinOutliers, dfFiltradoExplicito, dOpcionesTexto, dRangosNumericos, oIndiceDeFiltros,
+            dfAgregados y dTiemposMs (duración de cada paso, para el panel de rendimiento).
+   """
+   fRegistrarFalloDeCache("fPrepararDatos")
+   dTiemposMs = {}
+   fInicio = time.perf_counter()
+
+   def fMarcar(sPaso: str) -> None:
+      nonlocal fInicio
+      dTiemposMs[sPaso] = (time.perf_counter() - fInicio) * 1000
+      fInicio = time.perf_counter()
+
+   dfOriginal = fCargarListado()
+   fMarcar("Carga del listado")
+   dfSinOutliers = fObtenerSinOutliers(dfOriginal, sHash)
+   fMarcar("Outliers")
+   dfFiltradoExplicito = fAplicarFiltrosExplicitos(dfSinOutliers)
+   fMarcar("Filtros explícitos")
+   dOpcionesTexto, dRangosNumericos = fOpcionesSidebar(fObtenerVista("Visualizador", dfFiltradoExplicito))
+   oIndiceDeFiltros = IndiceDeFiltros(dfFiltradoExplicito, lCOLUMNAS_TEXTO, lCOLUMNAS_NUMERICAS)
+   fMarcar("Opciones e índice de filtros")
+   dfAgregados = fObtenerAgregados(dfOriginal)
+   fMarcar("Agregados")
+
+   return {
+      "sHash": sHash,
+      "dfOriginal": dfOriginal,
+      "dfSinOutliers": dfSinOutliers,
+      "dfFiltradoExplicito": dfFiltradoExplicito,
+      "dOpcionesTexto": dOpcionesTexto,
+      "dRangosNumericos": dRangosNumericos,
+      "oIndiceDeFiltros": oIndiceDeFiltros,
+      "dfAgregados": dfAgregados,
+      "dTiemposMs": dTiemposMs,
+   }
+
+
+def fObtenerDatos() -> dict:
+   """
+   Punto de entrada del visualizador: datos preparados de la versión actual del fichero (ver fPrepararDatos).
+   """
+   sRuta, iModificacionNs, iTamano = fFirmaDelListado()
+   return fPrepararDatos(sRuta, fHashDelListado(sRuta, iModificacionNs, iTamano))
+
+
+def fFirmaDeFiltros(dFiltrosTexto: dict, dFiltrosNumericos: dict) -> tuple:
+   """
+   Firma hashable de una combinación de filtros de la barra lateral.
+   """
+   return tuple(sorted(dFiltrosTexto.items())), tuple(sorted((sColumna, tuple(tRango)) for sColumna, tRango in dFiltrosNumericos.items()))
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def fObtenerExportacion(sHash: str, tFirmaFiltros: tuple, sFormato: str, _dfFiltrado: pd.DataFrame) -> bytes:
+   """
+   Fichero de descarga de las filas filtradas. _dfFiltrado no forma parte de la clave de la caché
+   (no se hashea): la identifican el hash del fichero de datos y la firma de los filtros.
+
+   Parámetros:
+      sHash (str): Hash del fichero de datos (ver fPrepararDatos).
+      tFirmaFiltros (tuple): Firma de los filtros aplicados (ver fFirmaDeFiltros).
+      sFormato (str): Clave de dFORMATOS_EXPORTACION.
+      _dfFiltrado (DataFrame): Filas a exportar.
+
+   Retorna:
+      bytes: Contenido del fichero.
+   """
+   fRegistrarFalloDeCache("fObtenerExportacion")
+   return dFORMATOS_EXPORTACION[sFormato][2](_dfFiltrado)
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def fObtenerGraficosAvanzados(sHash: str, tFirmaFiltros: tuple, bLigero: bool, _dfFiltrado: pd.DataFrame) -> list:
+   """
+   Figuras de la sección de gráficos avanzados (ver GraficosDelVisualizador.fGraficosAvanzados). Como en
+   fObtenerExportacion, _dfFiltrado no se hashea: lo identifican sHash y tFirmaFiltros.
+   """
+   fRegistrarFalloDeCache("fObtenerGraficosAvanzados")
+   return fGraficosAvanzados(_dfFiltrado, bLigero)
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def fObtenerGraficoPorDimension(sHash: str, sDimension: str, _dfAgregados: pd.DataFrame):
+   """
+   Gráfico de P/E promedio por sDimension a partir de los agregados de la versión sHash del fichero.
+   """
+   fRegistrarFalloDeCache("fObtenerGraficoPorDimension")
+   return fGraficoValoracionPorDimension(_dfAgregados, sDimension)
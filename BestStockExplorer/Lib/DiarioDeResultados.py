@@ -0,0 +1,123 @@
+# Lib\DiarioDeResultados.py
+import sys, os
+import json
+import threading
+
+"""
+================================================================================
+Diario de Resultados (JSONL de solo anexado)
+--------------------------------------------------------------------------------
+
+Registra cada ticker evaluado por fGenerarMetricas en cuanto termina, una línea
+JSON por ticker. Cada línea se escribe con una única llamada `os.write` sobre un
+descriptor abierto con O_APPEND y se fuerza a disco con `fsync`, de modo que un
+corte (crash o Ctrl-C) solo puede dejar, como mucho, una última línea incompleta,
+que se descarta al reanudar. Así una ejecución reanudada nunca pierde filas ya
+anotadas ni las cuenta dos veces.
+
+================================================================================
+"""
+
+
+# Detectar si el script está empaquetado con PyInstaller
+if getattr(sys, 'frozen', False):
+   BASE_DIR = sys._MEIPASS  # Ruta temporal generada por PyInstaller
+else:
+   # Ruta base = carpeta del proyecto
+   BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Ruta del diario de resultados de fGenerarMetricas
+sDIARIO_PATH = os.path.join(BASE_DIR, "Data", "DiarioGenerarMetricas.jsonl")
+
+
+class DiarioDeResultados:
+   """
+   Diario de solo anexado con un registro (dict) por ticker, identificado por la clave "Ticker".
+   """
+
+   def __init__(self, sRuta: str = None):
+      self.sRuta = sRuta or sDIARIO_PATH
+      self.iDescriptor = None
+      self.oCerrojo = threading.Lock()
+
+
+   def fAbrir(self, bReanudar: bool = False) -> dict:
+      """
+      Abre el diario para anexar registros.
+
+      Parámetros:
+         bReanudar (bool): True conserva los registros existentes; False empieza un diario vacío.
+
+      Retorna:
+         dict: Registros ya anotados, por ticker (vacío si no se reanuda).
+      """
+      os.makedirs(os.path.dirname(self.sRuta), exist_ok=True)
+
+      if bReanudar:
+         self.fRepararFinal()
+         dRegistros = self.fLeer()
+         iFlags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+      else:
+         dRegistros = {}
+         iFlags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_TRUNC
+
+      self.iDescriptor = os.open(self.sRuta, iFlags | getattr(os, "O_BINARY", 0), 0o644)
+      return dRegistros
+
+
+   def fRepararFinal(self) -> None:
+      """
+      Elimina una posible última línea incompleta (escritura interrumpida por un corte).
+      """
+      if not os.path.exists(self.sRuta):
+         return
+
+      with open(self.sRuta, "rb+") as f:
+         bContenido = f.read()
+         iFinValido = bContenido.rfind(b"\n") + 1
+         if iFinValido < len(bContenido):
+            f.truncate(iFinValido)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+   def fAnotar(self, dRegistro: dict) -> None:
+      """
+      Anexa un registro de forma atómica y lo fuerza a disco antes de retornar.
+      """
+      bLinea = (json.dumps(dRegistro, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+      with self.oCerrojo:
+         os.write(self.iDescriptor, bLinea)
+         os.fsync(self.iDescriptor)
+
+
+   def fLeer(self) -> dict:
+      """
+      Lee el diario completo. Si un ticker aparece varias veces prevalece el último registro,
+      y las líneas que no se pueden interpretar (incompletas) se ignoran.
+
+      Retorna:
+         dict: Registros por ticker, en orden de primera aparición.
+      """
+      dRegistros = {}
+      if not os.path.exists(self.sRuta):
+         return dRegistros
+
+      with open(self.sRuta, "r", encoding="utf-8") as f:
+         for sLinea in f:
+            if not sLinea.endswith("\n"):
+               continue
+            try:
+               dRegistro = json.loads(sLinea)
+            except json.JSONDecodeError:
+               continue
+            dRegistros[dRegistro["Ticker"]] = dRegistro
+
+      return dRegistros
+
+
+   def fCerrar(self) -> None:
+      with self.oCerrojo:
+         if self.iDescriptor is not None:
+            os.close(self.iDescriptor)
+            self.iDescriptor = None
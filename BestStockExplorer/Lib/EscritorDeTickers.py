@@ -0,0 +1,165 @@
+# Lib\EscritorDeTickers.py
+import os, io, time
+import csv
+import pandas as pd
+
+"""
+================================================================================
+Escritor del CSV de Tickers (Solo Anexado)
+--------------------------------------------------------------------------------
+
+fObtenerTickers ya no reescribe TickersDeEmpresas.csv entero con cada empresa
+nueva: las filas se acumulan en memoria y se anexan al final del CSV por lotes
+(cada iLote filas o cada fSegundosEntreVolcados segundos, lo que llegue antes),
+con una única escritura sobre un descriptor O_APPEND seguida de `fsync`.
+
+Si el proceso se corta, el CSV conserva todos los lotes ya volcados y, como
+mucho, una última línea incompleta que se descarta al volver a abrirlo; las
+empresas que aún no se habían volcado se vuelven a scrapear en la siguiente
+ejecución. Al cerrar, el CSV se compacta una sola vez: se eliminan los tickers
+repetidos (se conserva la primera aparición) y se reescribe de forma atómica.
+
+================================================================================
+"""
+
+
+# Columnas de un CSV de tickers nuevo
+lCOLUMNAS_TICKERS = ['Indice', 'Nombre', 'Ticker']
+
+
+class EscritorDeTickers:
+   """
+   Escritor de solo anexado del CSV de tickers. Se usa como context manager (fAbrir al entrar, fCerrar al salir).
+   """
+
+   def __init__(self, sRuta: str, iLote: int = 50, fSegundosEntreVolcados: float = 10.0):
+      self.sRuta = sRuta
+      self.iLote = max(1, iLote)
+      self.fSegundosEntreVolcados = fSegundosEntreVolcados
+      self.lColumnas = list(lCOLUMNAS_TICKERS)
+      self.lPendientes = []
+      self.fUltimoVolcado = time.monotonic()
+      self.iDescriptor = None
+      self.iFilasAnexadas = 0
+
+
+   def __enter__(self):
+      self.fAbrir()
+      return self
+
+
+   def __exit__(self, *args):
+      self.fCerrar()
+
+
+   def fAbrir(self) -> None:
+      """
+      Abre el CSV para anexar filas: descarta una posible última línea incompleta, toma el orden de columnas de
+      la cabecera existente y, si el fichero no existe o está vacío, escribe la cabecera.
+      """
+      os.makedirs(os.path.dirname(self.sRuta) or ".", exist_ok=True)
+      self.fRepararFinal()
+
+      if os.path.exists(self.sRuta) and os.path.getsize(self.sRuta) > 0:
+         with open(self.sRuta, "r", encoding="utf-8", newline="") as f:
+            self.lColumnas = next(csv.reader(f))
+         bCabecera = False
+      else:
+         bCabecera = True
+
+      self.iDescriptor = os.open(self.sRuta, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+      if bCabecera:
+         self.fEscribir([self.lColumnas])
+      self.fUltimoVolcado = time.monotonic()
+
+
+   def fRepararFinal(self) -> None:
+      """
+      Elimina una posible última línea incompleta (escritura interrumpida por un corte).
+      """
+      if not os.path.exists(self.sRuta):
+         return
+
+      with open(self.sRuta, "rb+") as f:
+         bContenido = f.read()
+         iFinValido = bContenido.rfind(b"\n") + 1
+         if iFinValido < len(bContenido):
+            f.truncate(iFinValido)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+   def fTickersExistentes(self) -> set:
+      """
+      Retorna:
+         set: Tickers ya guardados en el CSV (vacío si no existe), tras descartar una posible última línea incompleta.
+      """
+      self.fRepararFinal()
+      if not os.path.exists(self.sRuta) or os.path.getsize(self.sRuta) == 0:
+         return set()
+      return set(pd.read_csv(self.sRuta, usecols=['Ticker'], dtype=str, keep_default_na=False, encoding="utf-8")['Ticker'])
+
+
+   def fEscribir(self, lFilas: list) -> None:
+      """
+      Anexa las filas con una sola escritura y las fuerza a disco antes de retornar.
+      """
+      oTexto = io.StringIO()
+      csv.writer(oTexto, lineterminator="\n").writerows(lFilas)
+      os.write(self.iDescriptor, oTexto.getvalue().encode("utf-8"))
+      os.fsync(self.iDescriptor)
+
+
+   def fAnadir(self, dEmpresa: dict) -> None:
+      """
+      Añade una empresa (dict con las columnas del CSV). Se vuelca al completar el lote o al pasar el tiempo máximo.
+      """
+      self.lPendientes.append([dEmpresa.get(sColumna, "") for sColumna in self.lColumnas])
+      if len(self.lPendientes) >= self.iLote or time.monotonic() - self.fUltimoVolcado >= self.fSegundosEntreVolcados:
+         self.fVolcar()
+
+
+   def fVolcar(self) -> None:
+      """
+      Anexa al CSV las filas pendientes.
+      """
+      if self.lPendientes:
+         self.fEscribir(self.lPendientes)
+         self.iFilasAnexadas += len(self.lPendientes)
+         self.lPendientes = []
+      self.fUltimoVolcado = time.monotonic()
+
+
+   def fCompactar(self) -> int:
+      """
+      Elimina los tickers repetidos del CSV (se conserva la primera aparición) y lo reescribe de forma atómica.
+      Los valores se leen como texto, sin convertir, para no alterar ninguna fila.
+
+      Retorna:
+         int: Filas eliminadas.
+      """
+      if not os.path.exists(self.sRuta) or os.path.getsize(self.sRuta) == 0:
+         return 0
+
+      dfTickers = pd.read_csv(self.sRuta, dtype=str, keep_default_na=False, encoding="utf-8")
+      dfCompacto = dfTickers.drop_duplicates(subset="Ticker", keep="first")
+      iEliminadas = len(dfTickers) - len(dfCompacto)
+      if iEliminadas:
+         sRutaTemporal = self.sRuta + ".tmp"
+         dfCompacto.to_csv(sRutaTemporal, index=False, encoding="utf-8")
+         os.replace(sRutaTemporal, self.sRuta)
+      return iEliminadas
+
+
+   def fCerrar(self) -> None:
+      """
+      Vuelca las filas pendientes, cierra el fichero y lo compacta.
+      """
+      if self.iDescriptor is None:
+         return
+      self.fVolcar()
+      os.close(self.iDescriptor)
+      self.iDescriptor = None
+      iEliminadas = self.fCompactar()
+      if iEliminadas:
+         print(f"INFO    - EscritorDeTickers: {iEliminadas} tickers repetidos eliminados de {self.sRuta}")
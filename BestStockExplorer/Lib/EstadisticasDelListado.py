@@ -0,0 +1,159 @@
+# Lib\EstadisticasDelListado.py
+import sys, os
+import json
+import numpy as np
+import pandas as pd
+
+from Lib import AlmacenDeDatos
+from Lib.FiltradoDeOutliers import fFiltrarOutliers, fAplicarFiltrosExplicitos
+
+"""
+================================================================================
+Estadísticas por Columna del Listado (Fichero Auxiliar)
+--------------------------------------------------------------------------------
+
+GenerarMetricas guarda, junto al listado, un JSON pequeño
+(Data/EstadisticasDelListado.json) con las estadísticas de cada columna que
+usan los widgets, para que el visualizador y el heatmap no tengan que recorrer
+el listado para construirlos:
+   - Numéricas (lCOLUMNAS_NUMERICAS): mínimo y máximo de los valores finitos,
+     cuantiles (lCUANTILES), número de vacíos y de infinitos.
+   - Categóricas (lCOLUMNAS_TEXTO): valores distintos ordenados y vacíos.
+
+Se guardan dos vistas de los datos:
+   - "Listado": el listado completo (valores de los combos del heatmap).
+   - "Visualizador": tras el filtrado de outliers y los filtros explícitos
+     (opciones y rangos de la barra lateral del visualizador).
+
+Igual que los agregados, solo se usan si son posteriores al listado guardado;
+si no, se calculan al momento con las mismas funciones.
+
+================================================================================
+"""
+
+
+# Detectar si el script está empaquetado con PyInstaller
+if getattr(sys, 'frozen', False):
+   BASE_DIR = sys._MEIPASS  # Ruta temporal generada por PyInstaller
+else:
+   # Ruta base = carpeta del proyecto
+   BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Ruta del fichero de estadísticas del listado
+sESTADISTICAS_PATH = os.path.join(BASE_DIR, "Data", "EstadisticasDelListado.json")
+
+# Columnas categóricas (selectbox del visualizador, combos del heatmap)
+lCOLUMNAS_TEXTO = ["Sector", "Continente", "País"]
+# Columnas numéricas (sliders de rango del visualizador)
+lCOLUMNAS_NUMERICAS = [
+   "Puntuación", "Precio ($)", "Valor en Libros ($)", "Valor Intrínseco ($)", "P/E", "PEG", "EV/EBITDA", "ROE (%)",
+   "Margen Neto (%)", "Margen Operativo (%)", "FCF/Acción ($)", "Dividend Yield (%)", "Beta",
+   "Deuda/Capital (%)", "Crecimiento de Ingresos (%)", "Capitalización ($)"
+]
+# Cuantiles que se guardan de cada columna numérica
+lCUANTILES = [0.05, 0.10, 0.25, 0.50, 0.75, 0.90, 0.95]
+
+
+
+def fNumeroONulo(fValor):
+   """
+   float de Python, o None si no es finito (JSON no admite NaN ni infinitos).
+   """
+   return float(fValor) if fValor is not None and np.isfinite(fValor) else None
+
+
+def fCalcularVista(dfDatos: pd.DataFrame) -> dict:
+   """
+   Estadísticas de las columnas de lCOLUMNAS_NUMERICAS y lCOLUMNAS_TEXTO presentes en dfDatos.
+
+   Retorna:
+      dict: {"iFilas", "dNumericas": {columna: {"fMin", "fMax", "dCuantiles", "iVacios", "iInfinitos"}},
+             "dCategoricas": {columna: {"lValores", "iVacios"}}}.
+   """
+   lNumericas = [sColumna for sColumna in lCOLUMNAS_NUMERICAS if sColumna in dfDatos.columns]
+   dfValores = dfDatos[lNumericas].apply(pd.to_numeric, errors="coerce").astype("float64")
+   aValores = dfValores.to_numpy()
+   aInfinitos = np.isinf(aValores)
+
+   # Una sola pasada por estadística sobre el bloque numérico, sin los infinitos
+   dfFinitos = dfValores.mask(aInfinitos)
+   sMinimos, sMaximos = dfFinitos.min(), dfFinitos.max()
+   dfCuantiles = dfFinitos.quantile(lCUANTILES)
+   sVacios = dfValores.isna().sum()
+
+   dNumericas = {}
+   for iColumna, sColumna in enumerate(lNumericas):
+      dNumericas[sColumna] = {
+         "fMin": fNumeroONulo(sMinimos[sColumna]),
+         "fMax": fNumeroONulo(sMaximos[sColumna]),
+         "dCuantiles": {f"{fCuantil:g}": fNumeroONulo(dfCuantiles.at[fCuantil, sColumna]) for fCuantil in lCUANTILES},
+         "iVacios": int(sVacios[sColumna]),
+         "iInfinitos": int(aInfinitos[:, iColumna].sum()),
+      }
+
+   dCategoricas = {}
+   for sColumna in lCOLUMNAS_TEXTO:
+      if sColumna in dfDatos.columns:
+         sSerie = dfDatos[sColumna]
+         dCategoricas[sColumna] = {
+            "lValores": sorted(sSerie.dropna().unique().tolist()),
+            "iVacios": int(sSerie.isna().sum()),
+         }
+
+   return {"iFilas": len(dfDatos), "dNumericas": dNumericas, "dCategoricas": dCategoricas}
+
+
+def fCalcularEstadisticas(dfListado: pd.DataFrame, dfVistaVisualizador: pd.DataFrame = None) -> dict:
+   """
+   Estadísticas de las dos vistas.
+
+   Parámetros:
+      dfListado (DataFrame): Listado completo (con los tipos de AlmacenDeDatos.fNormalizarListado).
+      dfVistaVisualizador (DataFrame): Listado ya sin outliers y con los filtros explícitos, si ya se tiene
+                                       (por defecto, se calcula a partir de dfListado).
+
+   Retorna:
+      dict: {"dVistas": {"Listado": ..., "Visualizador": ...}} (ver fCalcularVista).
+   """
+   if dfVistaVisualizador is None:
+      dfVistaVisualizador = fAplicarFiltrosExplicitos(fFiltrarOutliers(dfListado))
+   return {"dVistas": {"Listado": fCalcularVista(dfListado), "Visualizador": fCalcularVista(dfVistaVisualizador)}}
+
+
+def fGuardarEstadisticas(dEstadisticas: dict) -> None:
+   sRutaTemporal = sESTADISTICAS_PATH + ".tmp"
+   with open(sRutaTemporal, "w", encoding="utf-8") as f:
+      json.dump(dEstadisticas, f, ensure_ascii=False, indent=1)
+   os.replace(sRutaTemporal, sESTADISTICAS_PATH)
+
+
+def fCargarEstadisticas() -> dict:
+   """
+   Retorna:
+      dict: Las estadísticas guardadas, o None si todavía no se han generado.
+   """
+   if not os.path.exists(sESTADISTICAS_PATH):
+      return None
+   with open(sESTADISTICAS_PATH, "r", encoding="utf-8") as f:
+      return json.load(f)
+
+
+def fEstadisticasAlDia() -> bool:
+   """
+   True si el fichero de estadísticas es posterior al listado guardado (se generó a partir de él).
+   """
+   sRutaListado = AlmacenDeDatos.fRutaListado()
+   return (os.path.exists(sESTADISTICAS_PATH) and os.path.exists(sRutaListado)
+           and os.path.getmtime(sESTADISTICAS_PATH) >= os.path.getmtime(sRutaListado))
+
+
+def fObtenerVista(sVista: str, dfDatos: pd.DataFrame) -> dict:
+   """
+   Estadísticas guardadas de sVista si están al día respecto al listado guardado; si no (listados generados
+   antes de existir este fichero), se calculan al momento a partir de dfDatos, que debe ser esa vista.
+   """
+   if fEstadisticasAlDia():
+      dVista = (fCargarEstadisticas() or {}).get("dVistas", {}).get(sVista)
+      if dVista is not None:
+         return dVista
+   return fCalcularVista(dfDatos)
@@ -0,0 +1,154 @@
+# Lib\FiltradoDeOutliers.py
+import threading
+import numpy as np
+import pandas as pd
+
+"""
+================================================================================
+Filtrado de Outliers (Compartido por el Visualizador y el Heatmap)
+--------------------------------------------------------------------------------
+
+Para cada columna con regla, un valor es atípico si queda fuera de
+[q10 - factor * (q90 - q10), q90 + factor * (q90 - q10)] (por abajo, por arriba
+o por ambos lados, según la regla). Las filas protegidas no se filtran; del
+resto se descartan las que tienen algún valor atípico o vacío en esas columnas.
+
+Todos los cuantiles se calculan en una sola pasada (DataFrame.quantile) y los
+límites se aplican como una única matriz de máscaras de NumPy.
+
+fObtenerSinOutliers memoriza el resultado por clave (por ejemplo, la firma del
+fichero de datos) para no repetir el cálculo.
+
+fAplicarFiltrosExplicitos aplica después los filtros fijos del visualizador
+(sin excepciones); GenerarMetricas los usa también para precalcular las
+estadísticas de esa vista (ver Lib/EstadisticasDelListado.py).
+
+================================================================================
+"""
+
+
+# Umbrales de protección (a estas empresas no se les aplican filtros de outliers)
+UMBRAL_PUNTUACION = 16
+UMBRAL_CAPITALIZACION = 1_000_000_000_000
+
+# Reglas personalizadas: {columna: {"min": filtrar por abajo, "max": filtrar por arriba[, "factor": amplitud]}}
+lReglasOutliers = {
+   "P/E": {"min": True, "max": True},
+   "Dividend Yield (%)": {"min": False, "max": True},
+   "Deuda/Capital (%)": {"min": False, "max": True},
+   "ROE (%)": {"min": True, "max": True},
+   "Margen Neto (%)": {"min": True, "max": True},
+   "Margen Operativo (%)": {"min": True, "max": True},
+   "Crecimiento de Ingresos (%)": {"min": True, "max": True},
+   "Beta": {"min": False, "max": True},
+   "PEG": {"min": True, "max": True},
+   "EV/EBITDA": {"min": False, "max": True},
+}
+
+# Predicados de protección: DataFrame -> Series booleana (True = la fila no se filtra)
+lProteccionesOutliers = [
+   lambda dfDatos: dfDatos["Puntuación"] > UMBRAL_PUNTUACION,
+   lambda dfDatos: dfDatos["Capitalización ($)"] > UMBRAL_CAPITALIZACION,
+]
+
+# Cuantiles inferior y superior del rango de referencia, y amplitud por defecto
+tCUANTILES = (0.10, 0.90)
+fFACTOR = 1.5
+
+# Resultados memorizados por fObtenerSinOutliers
+iMAXIMO_RESULTADOS = 4
+dResultados = {}
+oCerrojoResultados = threading.Lock()
+
+
+
+def fFilasProtegidas(dfDatos: pd.DataFrame, lProtecciones: list = None) -> np.ndarray:
+   """
+   Retorna:
+      ndarray: Máscara booleana de las filas que cumplen algún predicado de protección.
+   """
+   aProtegidas = np.zeros(len(dfDatos), dtype=bool)
+   for fPredicado in (lProteccionesOutliers if lProtecciones is None else lProtecciones):
+      aProtegidas |= pd.Series(fPredicado(dfDatos)).fillna(False).to_numpy(dtype=bool)
+   return aProtegidas
+
+
+def fMascaraOutliers(dfDatos: pd.DataFrame, dReglas: dict = None, fFactor: float = fFACTOR) -> np.ndarray:
+   """
+   Marca las filas con algún valor atípico o vacío en las columnas con regla.
+
+   Parámetros:
+      dfDatos (DataFrame): Filas sobre las que se calculan los cuantiles (sin las protegidas).
+      dReglas (dict): Reglas por columna (por defecto, lReglasOutliers).
+      fFactor (float): Amplitud para las reglas que no indican "factor".
+
+   Retorna:
+      ndarray: Máscara booleana, True = la fila se descarta.
+   """
+   dReglas = lReglasOutliers if dReglas is None else dReglas
+   lColumnas = [sColumna for sColumna in dReglas if sColumna in dfDatos.columns]
+   if not lColumnas or dfDatos.empty:
+      return np.zeros(len(dfDatos), dtype=bool)
+
+   dfValores = dfDatos[lColumnas].apply(pd.to_numeric, errors="coerce").astype("float64")
+   aCuantiles = dfValores.quantile(list(tCUANTILES)).to_numpy()
+   aInferior, aSuperior = aCuantiles[0], aCuantiles[1]
+   aAmplitud = aSuperior - aInferior
+   aFactor = np.array([dReglas[sColumna].get("factor", fFactor) for sColumna in lColumnas], dtype=float)
+
+   # Límites por columna; un lado sin regla no limita
+   aLimiteInferior = np.where([dReglas[sColumna]["min"] for sColumna in lColumnas], aInferior - aFactor * aAmplitud, -np.inf)
+   aLimiteSuperior = np.where([dReglas[sColumna]["max"] for sColumna in lColumnas], aSuperior + aFactor * aAmplitud, np.inf)
+
+   aValores = dfValores.to_numpy()
+   aDescartar = np.isnan(aValores) | (aValores < aLimiteInferior) | (aValores > aLimiteSuperior)
+   return aDescartar.any(axis=1)
+
+
+def fFiltrarOutliers(dfOriginal: pd.DataFrame, dReglas: dict = None, lProtecciones: list = None, fFactor: float = fFACTOR) -> pd.DataFrame:
+   """
+   Filtra los outliers de las empresas no protegidas.
+
+   Parámetros:
+      dfOriginal (DataFrame): Listado completo (no se modifica).
+      dReglas (dict): Reglas por columna (por defecto, lReglasOutliers).
+      lProtecciones (list): Predicados de protección (por defecto, lProteccionesOutliers).
+      fFactor (float): Amplitud para las reglas que no indican "factor".
+
+   Retorna:
+      DataFrame: Las empresas protegidas seguidas de las filtradas limpias, con índice nuevo.
+   """
+   aProtegidas = fFilasProtegidas(dfOriginal, lProtecciones)
+   dfFiltrables = dfOriginal[~aProtegidas]
+   aDescartar = fMascaraOutliers(dfFiltrables, dReglas, fFactor)
+   return pd.concat([dfOriginal[aProtegidas], dfFiltrables[~aDescartar]], ignore_index=True)
+
+
+def fObtenerSinOutliers(dfOriginal: pd.DataFrame, oClave) -> pd.DataFrame:
+   """
+   fFiltrarOutliers con las reglas por defecto, memorizado por oClave (por ejemplo, la firma del fichero
+   de datos). El resultado es compartido: no se debe modificar in situ.
+   """
+   with oCerrojoResultados:
+      dfSinOutliers = dResultados.get(oClave)
+   if dfSinOutliers is not None:
+      return dfSinOutliers
+
+   dfSinOutliers = fFiltrarOutliers(dfOriginal)
+   with oCerrojoResultados:
+      if oClave not in dResultados and len(dResultados) >= iMAXIMO_RESULTADOS:
+         dResultados.pop(next(iter(dResultados)))
+      dResultados[oClave] = dfSinOutliers
+   return dfSinOutliers
+
+
+def fAplicarFiltrosExplicitos(dfSinOutliers: pd.DataFrame) -> pd.DataFrame:
+   """
+   Filtros explícitos que se aplican a TODOS los registros (sin excepciones).
+   """
+   return dfSinOutliers[
+      (dfSinOutliers["ROE (%)"] >= 0) &
+      (dfSinOutliers["ROE (%)"] <= 150) &
+      (dfSinOutliers["PEG"] >= -40) &
+      (dfSinOutliers["P/E"] <= 100)
+   ]
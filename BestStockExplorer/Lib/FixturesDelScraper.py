@@ -0,0 +1,197 @@
+# Lib\FixturesDelScraper.py
+import sys, os, time
+import gzip
+import json
+import hashlib
+
+from Lib.ObtenerTickers import fAbrirNavegador
+
+"""
+================================================================================
+Grabación y Reproducción de Páginas del Scraper de Tickers
+--------------------------------------------------------------------------------
+
+Permite ejecutar fObtenerTickers (y probar fObtenerEmpresasDelIndice y
+fObtenerDatosEmpresas) sin navegador ni red:
+   - AlmacenDeFixtures: carpeta con el HTML de cada página (gzip) y sus
+     metadatos (URL, tipo de página y fecha), un par de ficheros por URL.
+   - NavegadorGrabador: envuelve el navegador real y guarda en el almacén el
+     HTML de cada página que lee el scraper. Si la página requiere un clic
+     (enlace 'Components'), se guarda la última versión leída, la que tiene
+     la tabla.
+   - NavegadorDeReproduccion: sustituto del navegador que sirve las páginas
+     grabadas, sin esperas.
+
+Grabar (con el navegador real; sin la ruta rápida HTTP, para que todas las
+páginas pasen por el navegador):
+   fObtenerTickers(fAbrirNavegador=functools.partial(NavegadorGrabador, fAbrirNavegador, AlmacenDeFixtures()),
+                   bRutaRapidaHttp=False)
+Reproducir:
+   fObtenerTickers(fAbrirNavegador=functools.partial(NavegadorDeReproduccion, AlmacenDeFixtures()),
+                   bRutaRapidaHttp=False)
+
+================================================================================
+"""
+
+
+# Detectar si el script está empaquetado con PyInstaller
+if getattr(sys, 'frozen', False):
+   BASE_DIR = sys._MEIPASS  # Ruta temporal generada por PyInstaller
+else:
+   # Ruta base = carpeta del proyecto
+   BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Carpeta del almacén de páginas grabadas
+sFIXTURES_PATH = os.path.join(BASE_DIR, "Data", "FixturesDelScraper")
+
+
+class AlmacenDeFixtures:
+   """
+   Almacén de páginas por URL. Cada página se escribe de forma atómica en sus propios ficheros, de modo que
+   varios procesos (modo paralelo) pueden grabar a la vez.
+   """
+
+   def __init__(self, sCarpeta: str = None):
+      self.sCarpeta = sCarpeta or sFIXTURES_PATH
+
+
+   def fRutaBase(self, sUrl: str) -> str:
+      return os.path.join(self.sCarpeta, hashlib.sha1(sUrl.encode("utf-8")).hexdigest())
+
+
+   def fGuardar(self, sUrl: str, sHtml: str) -> None:
+      os.makedirs(self.sCarpeta, exist_ok=True)
+      sRutaBase = self.fRutaBase(sUrl)
+      dMetadatos = {"sUrl": sUrl, "sTipo": "indice" if "/indices/" in sUrl else "empresa", "fFecha": time.time()}
+      for sRuta, bContenido in [(sRutaBase + ".html.gz", gzip.compress(sHtml.encode("utf-8"))),
+                                (sRutaBase + ".json", json.dumps(dMetadatos, ensure_ascii=False).encode("utf-8"))]:
+         with open(sRuta + ".tmp", "wb") as f:
+            f.write(bContenido)
+         os.replace(sRuta + ".tmp", sRuta)
+
+
+   def fLeer(self, sUrl: str) -> str:
+      """
+      Retorna:
+         str: HTML grabado de sUrl, o None si no está en el almacén.
+      """
+      sRuta = self.fRutaBase(sUrl) + ".html.gz"
+      if not os.path.exists(sRuta):
+         return None
+      with open(sRuta, "rb") as f:
+         return gzip.decompress(f.read()).decode("utf-8")
+
+
+   def fListar(self, sTipo: str = None) -> list:
+      """
+      Retorna:
+         list: Metadatos de las páginas grabadas ({"sUrl", "sTipo", "fFecha"}), opcionalmente solo las de sTipo
+               ("indice" o "empresa"), ordenados por URL.
+      """
+      if not os.path.isdir(self.sCarpeta):
+         return []
+      lMetadatos = []
+      for sFichero in os.listdir(self.sCarpeta):
+         if sFichero.endswith(".json"):
+            with open(os.path.join(self.sCarpeta, sFichero), "r", encoding="utf-8") as f:
+               dMetadatos = json.load(f)
+            if sTipo is None or dMetadatos["sTipo"] == sTipo:
+               lMetadatos.append(dMetadatos)
+      return sorted(lMetadatos, key=lambda dMetadatos: dMetadatos["sUrl"])
+
+
+class NavegadorGrabador:
+   """
+   Envuelve el navegador de fAbrirNavegador (context manager) y graba cada página cuyo HTML lee el scraper,
+   con la URL abierta como clave. El resto de métodos se delegan en el navegador real.
+   """
+
+   def __init__(self, fAbrirNavegador=fAbrirNavegador, oAlmacen: AlmacenDeFixtures = None):
+      self.fAbrirNavegador = fAbrirNavegador
+      self.oAlmacen = oAlmacen or AlmacenDeFixtures()
+      self.oContexto = None
+      self.oDriver = None
+      self.sUrlAbierta = None
+      self.iPaginas = 0
+
+
+   def __enter__(self):
+      self.oContexto = self.fAbrirNavegador()
+      self.oDriver = self.oContexto.__enter__()
+      return self
+
+
+   def __exit__(self, *args):
+      return self.oContexto.__exit__(*args)
+
+
+   def __getattr__(self, sNombre: str):
+      return getattr(self.oDriver, sNombre)
+
+
+   def open(self, sUrl: str) -> None:
+      self.sUrlAbierta = sUrl
+      self.oDriver.open(sUrl)
+
+
+   def get_page_source(self) -> str:
+      sHtml = self.oDriver.get_page_source()
+      self.oAlmacen.fGuardar(self.sUrlAbierta, sHtml)
+      self.iPaginas += 1
+      return sHtml
+
+
+class NavegadorDeReproduccion:
+   """
+   Sustituto del navegador que sirve las páginas del almacén (se usa como context manager). No hay JavaScript:
+   las esperas no esperan, no hay banner de cookies y wait_for_element/click fallan con TimeoutError.
+   """
+
+   def __init__(self, oAlmacen: AlmacenDeFixtures = None):
+      self.oAlmacen = oAlmacen or AlmacenDeFixtures()
+      self.sUrl = None
+      self.sHtml = ""
+      self.iPaginas = 0
+      self.iFallos = 0
+
+
+   def __enter__(self):
+      return self
+
+
+   def __exit__(self, *args):
+      pass
+
+
+   def open(self, sUrl: str) -> None:
+      self.sUrl = sUrl
+      self.sHtml = self.oAlmacen.fLeer(sUrl)
+      if self.sHtml is None:
+         print(f"ERROR   - NavegadorDeReproduccion: Página no grabada: {sUrl} \n")
+         self.sHtml = "<html><body></body></html>"
+         self.iFallos += 1
+      self.iPaginas += 1
+
+
+   def sleep(self, fSegundos: float) -> None:
+      pass
+
+
+   def is_element_visible(self, sSelector: str) -> bool:
+      return False
+
+
+   def get_current_url(self) -> str:
+      return self.sUrl
+
+
+   def get_page_source(self) -> str:
+      return self.sHtml
+
+
+   def wait_for_element(self, sSelector: str, timeout: float = None):
+      raise TimeoutError(f"NavegadorDeReproduccion no ejecuta JavaScript: {sSelector}")
+
+
+   def click(self, sSelector: str) -> None:
+      raise TimeoutError(f"NavegadorDeReproduccion no ejecuta JavaScript: {sSelector}")
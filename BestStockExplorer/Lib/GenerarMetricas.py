@@ -1,15 +1,24 @@
 # Lib\GenerarMetricas.py
 import re, sys, os, time
-import csv
+import json
 import random
-import requests
 import numpy as np
 import pandas as pd
 from tqdm import tqdm
 import yfinance as yf
-from datetime import datetime
 from dotenv import load_dotenv
-from pycountry_convert import country_name_to_country_alpha2, country_alpha2_to_continent_code
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from Lib.LimitadorDePeticiones import LimitadorTokenBucket
+from Lib.CacheInfo import CacheInfo, fCrearCacheInfo
+from Lib.DiarioDeResultados import DiarioDeResultados
+from Lib.ValidadorDeTickers import fCrearValidadorDeTickers
+from Lib.MotorDePuntuacion import fPuntuarAcciones
+from Lib.TiposDeCambio import fObtenerFactoresCambio
+from Lib.DatosDeReferencia import fObtenerContinente, fObtenerMonedaPorDefecto
+from Lib import AlmacenDeDatos
+from Lib import AgregadosDelListado
+from Lib import EstadisticasDelListado
 
 
 # Detectar si el script está empaquetado con PyInstaller
@@ -21,383 +30,412 @@ else:
 
 # Ruta para almacenar las empresas, sus nombres y Ticker
 sTICKER_LIST_PATH = os.path.join(BASE_DIR, "Data", "TickersDeEmpresas.csv")
-# Ruta para almacenar el listado con todos los datos de las empresas obtenidos de yfinance
-sDATA_STOCKS_PATH = os.path.join(BASE_DIR, "Data", "ListadoDeMejoresAcciones.xlsx")
-# Ruta para almacenar los tipos de cambio obtenido de FIXER API
-sTIPOS_CAMBIO_PATH = os.path.join(BASE_DIR, "Data", "TiposDeCambio.csv")
+# Ruta para almacenar la tabla de datos brutos de yfinance, a partir de la cual se puntúa sin red
+sDATOS_BRUTOS_PATH = os.path.join(BASE_DIR, "Data", "MetricasBrutas.parquet")
+# Ruta para almacenar la configuracion del GENERADOR_DE_METRICAS
+sCONFIG_PATH = os.path.join(BASE_DIR, "Config", "Config.json")
 
 # Cargar el archivo .env
 load_dotenv()
 
-# Diccionario global para almacenar tipos de cambio ya consultados
-dTiposDeCambio = {}
-# Diccionario para registrar fecha por combinación
-dFechasTipoCambio = {}
+# Campos de `.info` que se guardan en la tabla de datos brutos (determinan también la vigencia de la caché)
+lCAMPOS_TEXTO_INFO = ["longName", "sector", "financialCurrency", "country"]
+lCAMPOS_NUMERICOS_INFO = [
+   "currentPrice", "bookValue", "trailingPE", "enterpriseToEbitda", "returnOnEquity", "profitMargins",
+   "operatingMargins", "freeCashflow", "dividendYield", "beta", "debtToEquity", "revenueGrowth",
+   "marketCap", "trailingEps", "earningsGrowth"
+]
+lCAMPOS_INFO_UTILIZADOS = lCAMPOS_TEXTO_INFO + lCAMPOS_NUMERICOS_INFO
+# Valor que se guarda para un campo sin número en `.info` (None, texto...), igual que hacía fEvaluarAccion.
+# Los demás campos sin número, y cualquier NaN numérico de Yahoo, se guardan como NaN
+dVALORES_SI_NO_NUMERICO = {
+   "returnOnEquity": 0.0, "profitMargins": 0.0, "operatingMargins": 0.0, "freeCashflow": 0.0,
+   "dividendYield": 0.0, "beta": 1.0, "debtToEquity": 0.0, "revenueGrowth": 0.0
+}
+# Valor de un campo que no aparece en `.info` (marketCap ausente cuenta como 0, pero marketCap None es NaN)
+dVALORES_SI_AUSENTE = {"marketCap": 0.0}
+# Columnas de la tabla de datos brutos
+lCOLUMNAS_DATOS_BRUTOS = ["Ticker", "FechaDescarga"] + lCAMPOS_INFO_UTILIZADOS
+
+# Columnas del listado final, en el mismo orden que la tupla que devuelve fEvaluarAccion
+lCOLUMNAS_RESULTADO = [
+   "Ticker", "Nombre", "Sector", "Continente", "País", "Calificación", "Puntuación", 
+   "Precio ($)", "Valor en Libros ($)", "Valor Intrínseco ($)", "P/E", "PEG", "EV/EBITDA", "ROE (%)", 
+   "Margen Neto (%)", "Margen Operativo (%)", "FCF/Acción ($)", "Dividend Yield (%)", "Beta", 
+   "Deuda/Capital (%)", "Crecimiento de Ingresos (%)", "Capitalización ($)"
+]
 
 
-def fObtenerContinente(sPais):
+def fCargarConfiguracion() -> dict:
+   """
+   Carga la configuración del GENERADOR_DE_METRICAS desde Config.json.
+   Si el archivo o la sección no existen, se usan los valores por defecto.
+   """
+   dConfigGeneral = {
+      "iNumeroDeWorkers": 8,
+      "fPeticionesPorSegundo": 2.0,
+      "iHorasDeCaducidad": 24,
+      "bExportarExcel": False,
+   }
    try:
-      sCodigoPais = country_name_to_country_alpha2(sPais)
-      sCodigoContinente = country_alpha2_to_continent_code(sCodigoPais)
-      lContinentes = {
-         "NA": "North America",
-         "SA": "South America",
-         "EU": "Europe",
-         "AF": "Africa",
-         "AS": "Asia",
-         "OC": "Oceania"
-      }
+      with open(sCONFIG_PATH, 'r') as sFicheroConfig:
+         dConfiguracion = json.load(sFicheroConfig)
+      dConfigGeneral.update(dConfiguracion.get('GENERADOR_DE_METRICAS', {}))
+   except FileNotFoundError:
+      print(f"ERROR   - fCargarConfiguracion: El archivo {sCONFIG_PATH} no se encuentra, se usan valores por defecto. \n")
+   return dConfigGeneral
 
-      return lContinentes.get(sCodigoContinente, "Desconocido")
-   except:
-      return "Desconocido"
 
+def fObtenerMonedas(dfCrudo: pd.DataFrame) -> pd.Series:
+   """
+   Moneda financiera de cada ticker. Si Yahoo no la informa, se usa la moneda por defecto de su bolsa.
+   """
+   return dfCrudo["financialCurrency"].fillna(dfCrudo["Ticker"].map(fObtenerMonedaPorDefecto))
 
 
-def fObtenerTipoCambio():
+
+def fDescargarInfoYahoo(sTicker: str) -> dict:
    """
-   Carga los tipos de cambio previamente guardados en el archivo CSV
-   y los almacena en el diccionario global `dTiposDeCambio`.
-   Si el archivo no existe, lo crea con los encabezados necesarios.
+   Descarga el diccionario `.info` de un ticker desde Yahoo Finance.
    """
-   if not sTIPOS_CAMBIO_PATH:
-      print("ERROR - Ruta al archivo CSV no definida.")
-      return
+   lAccion = yf.Ticker(sTicker)
+   return lAccion.info
 
-   # Si no existe el archivo, crearlo con encabezados
-   if not os.path.exists(sTIPOS_CAMBIO_PATH):
-      with open(sTIPOS_CAMBIO_PATH, mode="w", newline='', encoding="utf-8") as f:
-         writer = csv.DictWriter(f, fieldnames=["sMonedaOrigen", "sMonedaDestino", "sTipoCambio", "sFecha"])
-         writer.writeheader()
-      return  # Ya está creado, pero aún no hay datos que cargar
 
-   # Leer archivo existente
-   with open(sTIPOS_CAMBIO_PATH, mode="r", newline='', encoding="utf-8") as f:
-      reader = csv.DictReader(f)
-      for row in reader:
-         sMonedaOrigen = row["sMonedaOrigen"]
-         sMonedaDestino = row["sMonedaDestino"]
-         sTipoCambio = float(row["sTipoCambio"])
-         sFecha = row.get("sFecha", "")
-         clave = f"{sMonedaOrigen}_{sMonedaDestino}"
-         dTiposDeCambio[clave] = sTipoCambio
-         dFechasTipoCambio[clave] = sFecha
 
+def fObtenerDatosBrutos(sTicker: str, oLimitador: LimitadorTokenBucket = None, fProveedorDatos=None, oCache: CacheInfo = None) -> dict:
+   """
+   Descarga el `.info` de una acción y extrae los campos brutos que necesita el cálculo de indicadores.
+   
+   Parámetros:
+      sTicker (str): Símbolo de la acción en el mercado bursátil.
+      oLimitador (LimitadorTokenBucket): Limitador global de peticiones. Si no se indica, se hace una pausa fija.
+      fProveedorDatos (callable): Función que devuelve el `.info` de un ticker (por defecto Yahoo Finance).
+      oCache (CacheInfo): Caché persistente de `.info`. Si no se indica, siempre se descarga.
+   
+   Retorna:
+      dict: Fila de la tabla de datos brutos (Ticker, FechaDescarga y los campos de lCAMPOS_INFO_UTILIZADOS).
+   """
+   fProveedorDatos = fProveedorDatos or fDescargarInfoYahoo
+
+   def fDescargar(sTickerDescarga):
+      # Esperar turno en el limitador global o, sin limitador, hacer la pausa clásica
+      if oLimitador is not None:
+         oLimitador.fAdquirir()
+      else:
+         time.sleep(2)  # Pausa para evitar bloqueos
+      return fProveedorDatos(sTickerDescarga)
+
+   # Obtener los datos de la acción desde la caché o, si no están vigentes, desde Yahoo Finance
+   if oCache is not None:
+      lDatos, fFechaDescarga = oCache.fObtenerConFecha(sTicker, fDescargar)
+   else:
+      lDatos, fFechaDescarga = fDescargar(sTicker), time.time()
+
+   # Validar que se haya obtenido información útil
+   if not lDatos or lDatos.get("longName") is None:
+      raise ValueError(f"No se pudo obtener información del ticker")
+
+   dDatosBrutos = {"Ticker": sTicker, "FechaDescarga": fFechaDescarga}
 
+   # Solo se conservan textos y números; cualquier otro valor (None, "Infinity"...) se guarda como vacío
+   # o, en los campos numéricos con valor por defecto, como ese valor
+   for sCampo in lCAMPOS_TEXTO_INFO:
+      valor = lDatos.get(sCampo)
+      dDatosBrutos[sCampo] = valor if isinstance(valor, str) else None
+   for sCampo in lCAMPOS_NUMERICOS_INFO:
+      valor = lDatos.get(sCampo, dVALORES_SI_AUSENTE.get(sCampo))
+      dDatosBrutos[sCampo] = float(valor) if isinstance(valor, (int, float)) else dVALORES_SI_NO_NUMERICO.get(sCampo)
 
-def fGuardarTipoCambio(sMonedaOrigen, sMonedaDestino, sTipoCambio):
+   return dDatosBrutos
+
+
+def fNormalizarDatosBrutos(lRegistros: list) -> pd.DataFrame:
    """
-   Guarda o actualiza un tipo de cambio en el archivo CSV, incluyendo la fecha de actualización.
+   Convierte una lista de filas de datos brutos en un DataFrame con columnas y tipos fijos.
+   """
+   dfCrudo = pd.DataFrame(lRegistros, columns=lCOLUMNAS_DATOS_BRUTOS)
+   for sCampo in ["Ticker"] + lCAMPOS_TEXTO_INFO:
+      dfCrudo[sCampo] = dfCrudo[sCampo].astype("string")
+   for sCampo in ["FechaDescarga"] + lCAMPOS_NUMERICOS_INFO:
+      dfCrudo[sCampo] = pd.to_numeric(dfCrudo[sCampo], errors="coerce").astype("float64")
+   return dfCrudo
 
-   Si la combinación de monedas ya existe en el archivo, se actualiza tanto el valor del tipo de cambio
-   como la fecha correspondiente. Si no existe, se añade una nueva fila con la información.
 
-   Parámetros:
-      sMonedaOrigen (str): Código de la moneda origen (ej. "MXN").
-      sMonedaDestino (str): Código de la moneda destino (ej. "USD").
-      sTipoCambio (float): Tipo de cambio de sMonedaOrigen a sMonedaDestino.
+def fGuardarDatosBrutos(dfCrudo: pd.DataFrame) -> None:
    """
-   if not sTIPOS_CAMBIO_PATH:
-      print("ERROR - Ruta al archivo CSV no definida.")
-      return
+   Guarda la tabla de datos brutos en Parquet, escribiendo primero a un temporal para no dejarla a medias.
+   """
+   sRutaTemporal = sDATOS_BRUTOS_PATH + ".tmp"
+   dfCrudo.to_parquet(sRutaTemporal, index=False)
+   os.replace(sRutaTemporal, sDATOS_BRUTOS_PATH)
+
 
-   oHoy = datetime.today().strftime("%Y-%m-%d")
-   datos_actualizados = []
-   clave_objetivo = f"{sMonedaOrigen}_{sMonedaDestino}"
-   ya_existia = False
-
-   # Leer datos existentes (si el archivo existe)
-   if os.path.exists(sTIPOS_CAMBIO_PATH):
-      with open(sTIPOS_CAMBIO_PATH, mode="r", newline='', encoding="utf-8") as f:
-         reader = csv.DictReader(f)
-         for row in reader:
-               clave = row["sMonedaOrigen"] + "_" + row["sMonedaDestino"]
-               if clave == clave_objetivo:
-                  row["sTipoCambio"] = str(sTipoCambio)  # Actualizar el valor
-                  row["sFecha"] = oHoy
-                  ya_existia = True
-               datos_actualizados.append(row)
-
-   # Si no existía la clave, añadirla
-   if not ya_existia:
-      datos_actualizados.append({
-         "sMonedaOrigen": sMonedaOrigen,
-         "sMonedaDestino": sMonedaDestino,
-         "sTipoCambio": sTipoCambio,
-         "sFecha": oHoy
-      })
-
-   # Escribir todo al archivo (sobrescribir)
-   with open(sTIPOS_CAMBIO_PATH, mode="w", newline='', encoding="utf-8") as f:
-      writer = csv.DictWriter(f, fieldnames=["sMonedaOrigen", "sMonedaDestino", "sTipoCambio", "sFecha"])
-      writer.writeheader()
-      writer.writerows(datos_actualizados)
-
-
-
-def fObtenerCambioFixer(sMonedaOrigen, sMonedaDestino="USD"):
+def fRedondear(aValores: np.ndarray) -> np.ndarray:
    """
-   Obtiene el tipo de cambio entre dos monedas usando la API de Fixer, con control diario.
+   Redondea a 2 decimales con el mismo resultado que round() de Python, como el cálculo original por ticker.
+   np.round multiplica por 100 antes de redondear y no coincide en valores cercanos a un empate, como 1.685
+   (1.68 en vez de 1.69). Solo esos valores, muy pocos, se vuelven a redondear uno a uno con round().
+   """
+   aRedondeados = np.round(aValores, 2)
+   with np.errstate(invalid="ignore"):
+      aEscalados = aValores * 100
+      aCercaDeEmpate = np.abs(aEscalados - np.floor(aEscalados) - 0.5) <= 4 * np.spacing(np.abs(aEscalados))
+   aIndices = np.flatnonzero(aCercaDeEmpate)
+   aRedondeados[aIndices] = [round(fValor, 2) for fValor in aValores[aIndices].tolist()]
+   return aRedondeados
+
 
-   Si el tipo de cambio ya ha sido obtenido en la fecha actual, se reutiliza desde la caché en memoria.
-   Si no, se consulta la API de Fixer, se actualiza la caché y se guarda en el archivo CSV con la fecha.
-   En caso de error en la consulta, intenta cargar el valor previamente almacenado en el archivo CSV.
+def fCalcularIndicadores(dfCrudo: pd.DataFrame, dFactoresCambio: dict) -> pd.DataFrame:
+   """
+   Calcula los indicadores financieros de todo el universo a la vez a partir de la tabla de datos brutos.
+   Los valores por defecto ya vienen aplicados en la tabla (ver fObtenerDatosBrutos), así que aquí un NaN se
+   propaga como NaN, igual que en el cálculo original por ticker.
 
    Parámetros:
-      sMonedaOrigen (str): Código de la moneda origen (ej. "MXN").
-      sMonedaDestino (str): Código de la moneda destino (por defecto "USD").
+      dfCrudo (DataFrame): Tabla de datos brutos (ver fNormalizarDatosBrutos).
+      dFactoresCambio (dict): Factor de conversión a USD por moneda.
 
    Retorna:
-      float: El tipo de cambio de sMonedaOrigen a sMonedaDestino.
+      DataFrame: Una fila por ticker con las columnas de lCOLUMNAS_RESULTADO, sin puntuar.
+   """
+   def fCampo(sCampo):
+      return dfCrudo[sCampo].to_numpy(dtype=float, na_value=np.nan)
+
+   def fPorcentaje(sCampo):
+      return fRedondear(fCampo(sCampo) * 100)
+
+   def fRedondeo(sCampo):
+      return fRedondear(fCampo(sCampo))
+
+   # Obtener información de la empresa
+   sPais = dfCrudo["country"].fillna("Desconocido")
+   dContinentes = {sPaisUnico: fObtenerContinente(sPaisUnico) for sPaisUnico in sPais.unique()}
+   aFactorCambio = fObtenerMonedas(dfCrudo).map(lambda sMoneda: dFactoresCambio.get(sMoneda, 1)).to_numpy(dtype=float)
+
+   dfIndicadores = pd.DataFrame({
+      "Ticker": dfCrudo["Ticker"].to_numpy(),
+      "Nombre": dfCrudo["longName"].fillna("Nombre no disponible").to_numpy(),
+      "Sector": dfCrudo["sector"].fillna("Sector no disponible").to_numpy(),
+      "Continente": sPais.map(dContinentes).to_numpy(),
+      "País": sPais.to_numpy(),
+   })
+
+   # Extraer indicadores financieros clave (los importes se convierten a USD)
+   dfIndicadores["Precio ($)"] = fRedondear(fCampo("currentPrice") * aFactorCambio)
+   dfIndicadores["Valor en Libros ($)"] = fRedondear(fCampo("bookValue") * aFactorCambio)
+   dfIndicadores["P/E"] = fRedondeo("trailingPE")
+   dfIndicadores["EV/EBITDA"] = fRedondeo("enterpriseToEbitda")
+   dfIndicadores["ROE (%)"] = fPorcentaje("returnOnEquity")
+   dfIndicadores["Margen Neto (%)"] = fPorcentaje("profitMargins")
+   dfIndicadores["Margen Operativo (%)"] = fPorcentaje("operatingMargins")
+   dfIndicadores["FCF/Acción ($)"] = fRedondear(fCampo("freeCashflow") * aFactorCambio)
+   dfIndicadores["Dividend Yield (%)"] = fPorcentaje("dividendYield")
+   dfIndicadores["Beta"] = fRedondeo("beta")
+   dfIndicadores["Deuda/Capital (%)"] = fRedondeo("debtToEquity")
+   dfIndicadores["Crecimiento de Ingresos (%)"] = fPorcentaje("revenueGrowth")
+   dfIndicadores["Capitalización ($)"] = fRedondear(fCampo("marketCap") * aFactorCambio / 1e6)
+
+   # Calcular valor intrínseco según fórmula de Benjamin Graham (G entre 0% y 20%)
+   aGNormalizado = np.clip(fCampo("earningsGrowth") * 100, 0, 20)
+   dfIndicadores["Valor Intrínseco ($)"] = fRedondear(fCampo("trailingEps") * (8.5 + 2 * aGNormalizado))
+
+   # Calcular PEG si hay datos suficientes
+   aPE = dfIndicadores["P/E"].to_numpy()
+   aCrecimiento = dfIndicadores["Crecimiento de Ingresos (%)"].to_numpy()
+   with np.errstate(divide="ignore", invalid="ignore"):
+      dfIndicadores["PEG"] = np.where(~np.isnan(aPE) & (aCrecimiento != 0), fRedondear(aPE / aCrecimiento), np.nan)
+
+   # La puntuación se calcula después con el motor de puntuación
+   dfIndicadores["Calificación"] = None
+   dfIndicadores["Puntuación"] = 0
+
+   return dfIndicadores[lCOLUMNAS_RESULTADO]
+
+
+def fConstruirListado(dfCrudo: pd.DataFrame, bConsultarApi: bool = True, bExportarExcel: bool = False) -> pd.DataFrame:
    """
-   global dTiposDeCambio, dFechasTipoCambio
+   Construye, puntúa, ordena y guarda el listado final a partir de la tabla de datos brutos.
 
-   # Cargar tipos de cambio desde el CSV solo una vez
-   if not dTiposDeCambio:
-      fObtenerTipoCambio()
+   Parámetros:
+      dfCrudo (DataFrame): Tabla de datos brutos.
+      bConsultarApi (bool): False convierte monedas solo con los tipos guardados, sin red.
+      bExportarExcel (bool): True exporta además el listado a Excel.
 
-   sClaveCache = f"{sMonedaOrigen}_{sMonedaDestino}"
-   oHoy = datetime.today().strftime("%Y-%m-%d")
+   Retorna:
+      DataFrame: El listado final ordenado.
+   """
+   dFactoresCambio = fObtenerFactoresCambio(fObtenerMonedas(dfCrudo).unique().tolist(), bConsultarApi)
 
-   # Si ya está en caché y es de Hoy, usarlo
-   if sClaveCache in dTiposDeCambio and dFechasTipoCambio.get(sClaveCache) == oHoy:
-      return dTiposDeCambio[sClaveCache]
+   # Calcular los indicadores y puntuar todo el universo de una vez
+   dfFinal = fPuntuarAcciones(fCalcularIndicadores(dfCrudo, dFactoresCambio))
 
-   # Obtener clave API desde variables de entorno
-   sFIXER_API_KEY = os.getenv("FIXER_API_KEY")
-   if not sFIXER_API_KEY:
-      raise Exception("No se encontró FIXER_API_KEY en las variables de entorno")
 
-   # Construir URL para consultar tipo de cambio con base en EUR
-   sUrl = f"http://data.fixer.io/api/latest?access_key={sFIXER_API_KEY}&base=EUR&symbols={sMonedaOrigen},{sMonedaDestino}"
-   sResponse = requests.get(sUrl)
-   sDatos = sResponse.json()
+   ################### LIMPIO COLUMNAS ##################
+   # Reemplazar NaN en "Puntuación" con un valor negativo para evitar errores en ordenamiento
+   dfFinal["Puntuación"] = dfFinal["Puntuación"].fillna(-1)
 
-   # Verificar si la respuesta fue exitosa
-   if not sDatos.get("success", False):
-      raise Exception(sDatos.get("error", {}).get("info", "Error desconocido en respuesta de Fixer"))
+   # Aplicar redondeo a las columnas relevantes
+   for col in ["Precio ($)", "Valor en Libros ($)", "Valor Intrínseco ($)", "P/E", "EV/EBITDA", "Dividend Yield (%)",
+            "Deuda/Capital (%)", "Crecimiento de Ingresos (%)", "ROE (%)", "Margen Neto (%)",
+            "Margen Operativo (%)", "Beta", "PEG"]:
+      dfFinal[col] = dfFinal[col].round(2)
 
-   # Calcular el tipo de cambio
-   try:
-      sTasaOrigen = sDatos["rates"][sMonedaOrigen]
-      sTasaDestino = sDatos["rates"][sMonedaDestino]
-   except KeyError as e:
-      raise Exception(f"Moneda no encontrada en respuesta de Fixer: {str(e)}")
-   
-   sTipoCambio = round(sTasaDestino / sTasaOrigen, 3)
+   dfFinal["FCF/Acción ($)"] = dfFinal["FCF/Acción ($)"].round(0)
+   dfFinal["Capitalización ($)"] = dfFinal["Capitalización ($)"].round(0)
+   ######################################################
+
+   # Ordenar por Puntuación y, en caso de empate, por ROE (%) y P/E
+   dfFinal = dfFinal.sort_values(by=["Puntuación", "ROE (%)", "P/E"], ascending=[False, False, True])
+
+   # Guardar en el almacén principal (Parquet) y, si se pide, exportar a Excel
+   AlmacenDeDatos.fGuardarListado(dfFinal, bExportarExcel)
 
-   # Guardar en caché y CSV
-   dTiposDeCambio[sClaveCache] = sTipoCambio
-   dFechasTipoCambio[sClaveCache] = oHoy
-   fGuardarTipoCambio(sMonedaOrigen, sMonedaDestino, sTipoCambio)
+   # Agregados por País, Sector y Continente
+   dfListadoNormalizado = AlmacenDeDatos.fNormalizarListado(dfFinal)
+   AgregadosDelListado.fGuardarAgregados(AgregadosDelListado.fCalcularTodos(dfListadoNormalizado))
+   print(f"INFO    - Agregados guardados en: {AgregadosDelListado.sAGREGADOS_PATH}")
 
-   return sTipoCambio
+   # Estadísticas por columna (rangos de los sliders del visualizador, valores de los combos del heatmap)
+   EstadisticasDelListado.fGuardarEstadisticas(EstadisticasDelListado.fCalcularEstadisticas(dfListadoNormalizado))
+   print(f"INFO    - Estadísticas guardadas en: {EstadisticasDelListado.sESTADISTICAS_PATH}")
 
+   return dfFinal
 
 
-def fEvaluarAccion(sTicker: str) -> tuple:
+def fEvaluarAccion(sTicker: str, oLimitador: LimitadorTokenBucket = None, fProveedorDatos=None, oCache: CacheInfo = None) -> tuple:
    """
-   Evalúa una acción y le asigna una calificación basada en indicadores financieros avanzados.
+   Evalúa una sola acción y le asigna una calificación basada en indicadores financieros avanzados.
    
    Parámetros:
       sTicker (str): Símbolo de la acción en el mercado bursátil.
+      oLimitador (LimitadorTokenBucket): Limitador global de peticiones. Si no se indica, se hace una pausa fija.
+      fProveedorDatos (callable): Función que devuelve el `.info` de un ticker (por defecto Yahoo Finance).
+      oCache (CacheInfo): Caché persistente de `.info`. Si no se indica, siempre se descarga.
    
    Retorna:
-      tuple: (sTicker, sName, sSector, sCalificacion, sPuntuacion) para ordenar posteriormente.
+      tuple: (sTicker, sName, sSector, sContinente, sPais, sCalificacion, iPuntuacion, *indicadores), en el orden de lCOLUMNAS_RESULTADO.
    """
+   dfCrudo = fNormalizarDatosBrutos([fObtenerDatosBrutos(sTicker, oLimitador, fProveedorDatos, oCache)])
+   dFactoresCambio = fObtenerFactoresCambio(fObtenerMonedas(dfCrudo).unique().tolist())
+   dfFila = fPuntuarAcciones(fCalcularIndicadores(dfCrudo, dFactoresCambio))
+
+   return tuple(dfFila.iloc[0][lCOLUMNAS_RESULTADO])
+
+
+def fObtenerDatosDeTickers(lListaDeTickers: list, iNumeroDeWorkers: int, oLimitador: LimitadorTokenBucket, fProveedorDatos=None, oCache: CacheInfo = None, oDiario: DiarioDeResultados = None) -> tuple:
+   """
+   Obtiene los datos brutos de una lista de tickers en paralelo con un pool de hilos que comparten el mismo limitador.
+
+   Parámetros:
+      lListaDeTickers (list): Tickers a consultar.
+      iNumeroDeWorkers (int): Número de hilos que consultan a la vez.
+      oLimitador (LimitadorTokenBucket): Limitador global de peticiones por segundo.
+      fProveedorDatos (callable): Función que devuelve el `.info` de un ticker (por defecto Yahoo Finance).
+      oCache (CacheInfo): Caché persistente de `.info` compartida por los hilos.
+      oDiario (DiarioDeResultados): Diario donde se anota cada ticker en cuanto termina.
+
+   Retorna:
+      tuple: (lResultados, iContadorExitos, iContadorErrores), con las filas de datos brutos en el orden de entrada.
+   """
+   lResultadosPorPosicion = [None] * len(lListaDeTickers)
+   iContadorExitos = 0
+   iContadorErrores = 0
+
+   oPool = ThreadPoolExecutor(max_workers=max(1, iNumeroDeWorkers))
    try:
-      # Obtener los datos de la acción desde Yahoo Finance
-      lAccion = yf.Ticker(sTicker)
-      time.sleep(2)  # Pausa para evitar bloqueos
-      lDatos = lAccion.info
-
-      # Validar que se haya obtenido información útil
-      if not lDatos or lDatos.get("longName") is None:
-         raise ValueError(f"No se pudo obtener información del ticker")
-      
-      # Obtener información de la empresa
-      sName = lDatos.get("longName", "Nombre no disponible")
-      sSector = lDatos.get("sector", "Sector no disponible")
-      sMoneda = lDatos.get("financialCurrency", "USD")  # Moneda original
-      sPais = lDatos.get("country", "Desconocido")
-      sContinente = fObtenerContinente(sPais)
-
-      # Inicializar el tipo de cambio con 1 por defecto (en caso de USD o error)
-      dFactorCambio = 1
-
-      # Solo convertir si la moneda no es USD
-      if sMoneda != "USD":
+      dFuturos = {
+         oPool.submit(fObtenerDatosBrutos, sTicker, oLimitador, fProveedorDatos, oCache): (iPosicion, sTicker)
+         for iPosicion, sTicker in enumerate(lListaDeTickers)
+      }
+
+      # Los contadores, el diario y la barra de progreso solo se actualizan desde el hilo principal
+      for oFuturo in tqdm(as_completed(dFuturos), total=len(dFuturos), desc="Procesando acciones", unit="acción"):
+         iPosicion, sTicker = dFuturos[oFuturo]
          try:
-            # Intentar obtener el tipo de cambio actual desde Fixer
-            dFactorCambio = fObtenerCambioFixer(sMoneda, "USD")
+            dResultado = oFuturo.result()
+
+            if dResultado is not None:
+               lResultadosPorPosicion[iPosicion] = dResultado
+               iContadorExitos += 1
+               if oDiario is not None:
+                  oDiario.fAnotar(dResultado)
+               print(f"INFO    - Procesado correctamente: {sTicker}")
          except Exception as e:
-            # Mostrar mensaje de error si la API falla
-            print(f"ERROR   - Error obteniendo tipo de cambio de '{sMoneda}' a USD: {e}")
-
-            # Si hay un valor anterior almacenado en caché/CSV, usarlo
-            if f"{sMoneda}_USD" in dTiposDeCambio:
-               print(f"INFO    - Usando tipo de cambio antiguo guardado en CSV para {sMoneda}_USD")
-               dFactorCambio = dTiposDeCambio[f"{sMoneda}_USD"]
-            else:
-               # Como último recurso, usar 1 como tipo de cambio de fallback
-               dFactorCambio = 1
-
-
-      # Función para convertir valores usando el tipo de cambio calculado
-      def fConvertirMoneda(valor):
-         # Solo convierte si es número (int o float), si no, devuelve NaN
-         return valor * dFactorCambio if isinstance(valor, (int, float)) else np.nan
-         
-      # Extraer indicadores financieros clave
-      lIndicadores = {
-         "Precio ($)": round(fConvertirMoneda(lDatos.get("currentPrice")), 2),
-         "Valor en Libros ($)": round(fConvertirMoneda(lDatos.get("bookValue")), 2),
-         "P/E": round(lDatos.get("trailingPE"), 2) if isinstance(lDatos.get("trailingPE"), (int, float)) else np.nan,
-         "PEG": np.nan,  # Se calcula más adelante si hay datos suficientes
-         "EV/EBITDA": round(lDatos.get("enterpriseToEbitda"), 2) if isinstance(lDatos.get("enterpriseToEbitda"), (int, float)) else np.nan,
-         "ROE (%)": round(lDatos.get("returnOnEquity") * 100, 2) if isinstance(lDatos.get("returnOnEquity"), (int, float)) else 0.0,
-         "Margen Neto (%)": round(lDatos.get("profitMargins") * 100, 2) if isinstance(lDatos.get("profitMargins"), (int, float)) else 0.0,
-         "Margen Operativo (%)": round(lDatos.get("operatingMargins") * 100, 2) if isinstance(lDatos.get("operatingMargins"), (int, float)) else 0.0,
-         "FCF/Acción ($)": round(fConvertirMoneda(lDatos.get("freeCashflow")), 2) if isinstance(lDatos.get("freeCashflow"), (int, float)) else 0.0,
-         "Dividend Yield (%)": round(lDatos.get("dividendYield") * 100, 2) if isinstance(lDatos.get("dividendYield"), (int, float)) else 0.0,
-         "Beta": round(lDatos.get("beta"), 2) if isinstance(lDatos.get("beta"), (int, float)) else 1.0,
-         "Deuda/Capital (%)": round(lDatos.get("debtToEquity"), 2) if isinstance(lDatos.get("debtToEquity"), (int, float)) else 0.0,
-         "Crecimiento de Ingresos (%)": round(lDatos.get("revenueGrowth") * 100, 2) if isinstance(lDatos.get("revenueGrowth"), (int, float)) else 0.0,
-         "Capitalización ($)": round(fConvertirMoneda(lDatos.get("marketCap", 0)) / 1e6, 2)
-      }
+            iContadorErrores += 1
+            print(f"ERROR   - No se pudo procesar: {sTicker} | Detalle: {e}")
+   finally:
+      # Ante un Ctrl-C no esperar a los tickers pendientes: lo anotado en el diario ya está a salvo
+      oPool.shutdown(wait=False, cancel_futures=True)
 
-      # Calcular valor intrínseco según fórmula de Benjamin Graham
-      EPS = lDatos.get("trailingEps")
-      G = lDatos.get("earningsGrowth")
+   lResultados = [dResultado for dResultado in lResultadosPorPosicion if dResultado is not None]
 
-      if EPS is not None and G is not None and isinstance(EPS, (int, float)) and isinstance(G, (int, float)):
-         G_normalizado = max(min(G * 100, 20), 0)  # entre 0% y 20%
-         valor_intrinseco = round(EPS * (8.5 + 2 * G_normalizado), 2)
-      else:
-         valor_intrinseco = np.nan
+   return lResultados, iContadorExitos, iContadorErrores
 
-      # Agregar al diccionario de indicadores
-      lIndicadores["Valor Intrínseco ($)"] = valor_intrinseco
 
-      # Reemplazar valores None o no numéricos por np.nan directamente
-      for key, value in lIndicadores.items():
-         if value is None or not isinstance(value, (int, float)):
-            lIndicadores[key] = np.nan
+def fPlanificarRefresco(lListaDeTickers: list, dfCrudoPrevio: pd.DataFrame, fHorasDeCaducidad: float, fAhora: float = None) -> tuple:
+   """
+   Compara la lista de tickers con la tabla de datos brutos anterior para decidir qué hay que descargar.
 
-      # Calcular PEG si hay datos suficientes
-      if not np.isnan(lIndicadores["P/E"]) and lIndicadores["Crecimiento de Ingresos (%)"] != 0:
-         try:
-            lIndicadores["PEG"] = round(lIndicadores["P/E"] / lIndicadores["Crecimiento de Ingresos (%)"], 2)
-         except ZeroDivisionError:
-            lIndicadores["PEG"] = np.nan
-      else:
-         lIndicadores["PEG"] = np.nan
-
-      # Inicializar puntuación
-      iPuntuacion = 0
-
-      # Evaluar lIndicadores y asignar puntuaciones
-      if not np.isnan(lIndicadores["PEG"]):
-         if lIndicadores["PEG"] < 0:
-            iPuntuacion -= 1
-         elif lIndicadores["PEG"] < 1:
-            iPuntuacion += 3
-         elif 1 <= lIndicadores["PEG"] <= 2:
-            iPuntuacion += 2
-         elif lIndicadores["PEG"] > 2:
-            iPuntuacion += 0
-
-      if not np.isnan(lIndicadores["EV/EBITDA"]): 
-         if lIndicadores["EV/EBITDA"] < 8:
-            iPuntuacion += 3
-         elif 8 <= lIndicadores["EV/EBITDA"] <= 12:
-            iPuntuacion += 2
-         else:
-            iPuntuacion += 0
-
-      if not np.isnan(lIndicadores["P/E"]):
-         if lIndicadores["P/E"] < 15:
-            iPuntuacion += 3
-         elif 15 <= lIndicadores["P/E"] <= 20:
-            iPuntuacion += 2
-         elif 20 < lIndicadores["P/E"] <= 50:
-            iPuntuacion += 0
-         else:  # P/E > 50
-            iPuntuacion -= 1
-
-      if lIndicadores["Dividend Yield (%)"] > 3:
-         iPuntuacion += 2
-      elif 1 <= lIndicadores["Dividend Yield (%)"] <= 3:
-         iPuntuacion += 1
-      else:
-         iPuntuacion += 0
-
-      if lIndicadores["Deuda/Capital (%)"] < 50:
-         iPuntuacion += 2
-      elif 50 <= lIndicadores["Deuda/Capital (%)"] <= 100:
-         iPuntuacion += 1
-      else:  # Deuda/Capital > 100
-         iPuntuacion -= 1
-
-      if lIndicadores["Crecimiento de Ingresos (%)"] > 10:
-         iPuntuacion += 3
-      elif 5 <= lIndicadores["Crecimiento de Ingresos (%)"] <= 10:
-         iPuntuacion += 2
-      elif 0 <= lIndicadores["Crecimiento de Ingresos (%)"] < 5:
-         iPuntuacion += 1
-      else:  # Crecimiento negativo
-         iPuntuacion += 0
-
-      if lIndicadores["FCF/Acción ($)"] > 0:
-         iPuntuacion += 2
-
-      if lIndicadores["ROE (%)"] > 15:
-         iPuntuacion += 3
-      elif 10 <= lIndicadores["ROE (%)"] <= 15:
-         iPuntuacion += 2
-      elif 5 <= lIndicadores["ROE (%)"] < 10:
-         iPuntuacion += 1
-      else:
-         iPuntuacion += 0
+   Parámetros:
+      lListaDeTickers (list): Tickers actuales (TickersDeEmpresas.csv).
+      dfCrudoPrevio (DataFrame): Tabla de datos brutos de la ejecución anterior.
+      fHorasDeCaducidad (float): Antigüedad máxima, en horas, de una fila para reutilizarla.
+      fAhora (float): Marca de tiempo de referencia (por defecto, ahora).
 
-      if lIndicadores["Beta"] < 1:
-         iPuntuacion += 2
-      elif 1 <= lIndicadores["Beta"] <= 1.5:
-         iPuntuacion += 1
-      else:
-         iPuntuacion += 0
-      
-      # Asignar calificación basada en la puntuación
-      if iPuntuacion >= 18:
-         sCalificacion = "Excelente"
-      elif iPuntuacion >= 14:
-         sCalificacion = "Muy Buena"
-      elif iPuntuacion >= 10:
-         sCalificacion = "Buena"
-      elif iPuntuacion >= 6:
-         sCalificacion = "Regular"
+   Retorna:
+      tuple: (lNuevos, lCaducados, lReutilizados), cada lista en el orden de lListaDeTickers.
+   """
+   fAhora = time.time() if fAhora is None else fAhora
+   dFechas = dict(zip(dfCrudoPrevio["Ticker"].tolist(), dfCrudoPrevio["FechaDescarga"].tolist()))
+   fFechaLimite = fAhora - float(fHorasDeCaducidad) * 3600
+
+   lNuevos, lCaducados, lReutilizados = [], [], []
+   for sTicker in dict.fromkeys(lListaDeTickers):
+      fFecha = dFechas.get(sTicker)
+      if fFecha is None:
+         lNuevos.append(sTicker)
+      elif pd.isna(fFecha) or fFecha < fFechaLimite:
+         lCaducados.append(sTicker)
       else:
-         sCalificacion = "Débil"
-      
-      # Orden consistente según columnas de Excel
-      lColumnasOrdenadas = [
-         "Precio ($)", "Valor en Libros ($)", "Valor Intrínseco ($)", "P/E", "PEG", "EV/EBITDA", "ROE (%)", 
-         "Margen Neto (%)", "Margen Operativo (%)", "FCF/Acción ($)", "Dividend Yield (%)", "Beta", 
-         "Deuda/Capital (%)", "Crecimiento de Ingresos (%)", "Capitalización ($)"
-      ]
-
-      lValoresOrdenados = [lIndicadores.get(clave, np.nan) for clave in lColumnasOrdenadas]
+         lReutilizados.append(sTicker)
 
-      return (sTicker, sName, sSector, sContinente, sPais, sCalificacion, iPuntuacion, *lValoresOrdenados)
-      
-   except Exception as e:
-      raise e
+   return lNuevos, lCaducados, lReutilizados
 
 
-def fGenerarMetricas():
+def fGenerarMetricas(iNumeroDeWorkers: int = None, fPeticionesPorSegundo: float = None, fProveedorDatos=None, bReanudar: bool = False, bIncremental: bool = False, fComprobarLote=None):
    """
    Función principal para obtener y evaluar las metricas de los tickers.
+
+   Primero se descargan los datos brutos de cada ticker y se guardan en la tabla de datos brutos
+   (Parquet); después se construye el listado final a partir de esa tabla, sin red.
+
+   Parámetros:
+      iNumeroDeWorkers (int): Hilos que consultan tickers a la vez (por defecto, el valor de Config.json).
+      fPeticionesPorSegundo (float): Presupuesto global de peticiones por segundo (por defecto, el valor de Config.json).
+      fProveedorDatos (callable): Función que devuelve el `.info` de un ticker (por defecto Yahoo Finance).
+      bReanudar (bool): True salta los tickers ya anotados en el diario de una ejecución interrumpida.
+      bIncremental (bool): True solo descarga los tickers nuevos o con datos caducados y reutiliza el resto
+                           de la tabla de datos brutos anterior.
+      fComprobarLote (callable): Función lista de tickers -> set de tickers vivos para la prevalidación
+                                 (por defecto, descargas multi-símbolo de Yahoo Finance).
    """
+   ########################### CONFIGURACION ###########################
+   dConfigGeneral = fCargarConfiguracion()
+   if iNumeroDeWorkers is None:
+      iNumeroDeWorkers = int(dConfigGeneral['iNumeroDeWorkers'])
+   if fPeticionesPorSegundo is None:
+      fPeticionesPorSegundo = float(dConfigGeneral['fPeticionesPorSegundo'])
+
+   # Limitador global compartido por todos los hilos
+   oLimitador = LimitadorTokenBucket(fPeticionesPorSegundo)
+   # Caché persistente de `.info` (None si está desactivada en Config.json)
+   oCache = fCrearCacheInfo()
+   # Diario donde se anota cada ticker en cuanto termina
+   oDiario = DiarioDeResultados()
+   # Prevalidación por lotes con caché negativa de tickers sin cotización (None si está desactivada)
+   oValidador = fCrearValidadorDeTickers(fComprobarLote)
+   #####################################################################
 
    # Obtener tickers, omitiendo la primera fila (cabecera)
    df = pd.read_csv(sTICKER_LIST_PATH, encoding='utf-8')
@@ -407,60 +445,106 @@ def fGenerarMetricas():
 
    # Crear la lista de tickers
    lListaDeTickers = df['Ticker'].tolist()
+   #lListaDeTickers = random.sample(lListaDeTickers, 10)
+
+   # Al reanudar, saltar los tickers que ya están anotados en el diario
+   dRegistrosPrevios = oDiario.fAbrir(bReanudar)
+   lTickersPendientes = [sTicker for sTicker in lListaDeTickers if sTicker not in dRegistrosPrevios]
+   if bReanudar:
+      print(f"INFO    - Reanudando: {len(lListaDeTickers) - len(lTickersPendientes)} tickers ya anotados en {oDiario.sRuta}")
+
+   # En modo incremental, descargar solo los tickers nuevos o con datos caducados
+   dfCrudoPrevio = None
+   if bIncremental:
+      if os.path.exists(sDATOS_BRUTOS_PATH):
+         dfCrudoPrevio = pd.read_parquet(sDATOS_BRUTOS_PATH)
+         lNuevos, lCaducados, _ = fPlanificarRefresco(lTickersPendientes, dfCrudoPrevio, dConfigGeneral['iHorasDeCaducidad'])
+         setARefrescar = set(lNuevos) | set(lCaducados)
+         lTickersPendientes = [sTicker for sTicker in lTickersPendientes if sTicker in setARefrescar]
+         print(f"INFO    - Incremental: {len(lNuevos)} tickers nuevos y {len(lCaducados)} con más de {dConfigGeneral['iHorasDeCaducidad']}h de antigüedad")
+      else:
+         print(f"INFO    - Incremental: No existe {sDATOS_BRUTOS_PATH}, se consultan todos los tickers")
+
+   # Prevalidar los tickers que habría que descargar (los vigentes en la caché de `.info` no gastan red)
+   lDescartados = []
+   fTiempoValidacion = 0.0
+   if oValidador is not None:
+      fInicio = time.perf_counter()
+      setVigentes = oCache.fTickersVigentes() if oCache is not None else set()
+      lVivos, lMuertosNuevos, lOmitidos = oValidador.fValidar([sTicker for sTicker in lTickersPendientes if sTicker not in setVigentes], oLimitador)
+      oValidador.fCerrar()
+      lDescartados = lMuertosNuevos + lOmitidos
+      setDescartados = set(lDescartados)
+      lTickersPendientes = [sTicker for sTicker in lTickersPendientes if sTicker not in setDescartados]
+      fTiempoValidacion = time.perf_counter() - fInicio
+      print(f"INFO    - Prevalidación: {len(lMuertosNuevos)} tickers sin cotización y {len(lOmitidos)} omitidos por la caché negativa ({fTiempoValidacion:.1f}s)")
+
+   print(f"INFO    - Consultando {len(lTickersPendientes)} tickers con {iNumeroDeWorkers} workers a {fPeticionesPorSegundo} peticiones/s")
+   fInicio = time.perf_counter()
+   try:
+      _, iContadorExitos, iContadorErrores = fObtenerDatosDeTickers(lTickersPendientes, iNumeroDeWorkers, oLimitador, fProveedorDatos, oCache, oDiario)
+   finally:
+      oDiario.fCerrar()
+   fTiempoConsulta = time.perf_counter() - fInicio
+
+   # Reconstruir la tabla de datos brutos desde el diario (incluye los de ejecuciones anteriores al reanudar)
+   dRegistros = oDiario.fLeer()
+   dfCrudo = fNormalizarDatosBrutos([dRegistros[sTicker] for sTicker in lListaDeTickers if sTicker in dRegistros])
+
+   # En modo incremental, completar con las filas anteriores que no se han vuelto a descargar
+   # (también las caducadas que han fallado: mejor un dato antiguo que ninguno)
+   iContadorReutilizados = 0
+   if dfCrudoPrevio is not None:
+      dfReutilizado = dfCrudoPrevio[
+         dfCrudoPrevio["Ticker"].isin(lListaDeTickers) & ~dfCrudoPrevio["Ticker"].isin(dRegistros.keys()) & ~dfCrudoPrevio["Ticker"].isin(lDescartados)
+      ]
+      iContadorReutilizados = len(dfReutilizado)
+      dfCrudo = pd.concat([dfCrudo, fNormalizarDatosBrutos(dfReutilizado.to_dict("records"))], ignore_index=True)
 
-   lResultados = []
-   iContadorExitos = 0
-   iContadorErrores = 0
-
-   for sTicker in tqdm(lListaDeTickers, desc="Procesando acciones", unit="acción"):
-   #for sTicker in tqdm(random.sample(lListaDeTickers, 10), desc="Procesando acciones", unit="acción"):
-
-      try:
-         lResultado = fEvaluarAccion(sTicker)
-
-         if lResultado is not None:
-            lResultados.append(lResultado)
-            iContadorExitos += 1
-            print(f"INFO    - Procesado correctamente: {sTicker}")
-      except Exception as e:
-         iContadorErrores += 1
-         print(f"ERROR   - No se pudo procesar: {sTicker} | Detalle: {e}")
-
-   # Ordenar por Puntuación, luego por ROE y luego por Crecimiento de Ingresos
-   dfResultadosOrdenados = sorted(lResultados, key=lambda x: (x[6], x[16] if x[16] is not None else -1, x[14] if x[14] is not None else -1), reverse=True)
-
-
-   lColumnas = [
-   "Ticker", "Nombre", "Sector", "Continente", "País", "Calificación", "Puntuación", 
-   "Precio ($)", "Valor en Libros ($)", "Valor Intrínseco ($)", "P/E", "PEG", "EV/EBITDA", "ROE (%)", 
-   "Margen Neto (%)", "Margen Operativo (%)", "FCF/Acción ($)", "Dividend Yield (%)", "Beta", 
-   "Deuda/Capital (%)", "Crecimiento de Ingresos (%)", "Capitalización ($)"
-   ]
-
-   # Crear DataFrame
-   dfFinal = pd.DataFrame(dfResultadosOrdenados, columns=lColumnas)
-
-
-   ################### LIMPIO COLUMNAS ##################
-   # Reemplazar NaN en "Puntuación" con un valor negativo para evitar errores en ordenamiento
-   dfFinal["Puntuación"] = dfFinal["Puntuación"].fillna(-1)
-
-   # Aplicar redondeo a las columnas relevantes
-   for col in ["Precio ($)", "Valor en Libros ($)", "Valor Intrínseco ($)", "P/E", "EV/EBITDA", "Dividend Yield (%)",
-            "Deuda/Capital (%)", "Crecimiento de Ingresos (%)", "ROE (%)", "Margen Neto (%)",
-            "Margen Operativo (%)", "Beta", "PEG"]:
-      dfFinal[col] = dfFinal[col].round(2)
-
-   dfFinal["FCF/Acción ($)"] = dfFinal["FCF/Acción ($)"].round(0)
-   dfFinal["Capitalización ($)"] = dfFinal["Capitalización ($)"].round(0)
-   ######################################################
+      # Mismo orden que la lista de tickers, para que el listado sea idéntico al de una ejecución completa
+      dPosiciones = {sTicker: iPosicion for iPosicion, sTicker in enumerate(lListaDeTickers)}
+      dfCrudo = dfCrudo.sort_values("Ticker", key=lambda sTickers: sTickers.map(dPosiciones), kind="stable", ignore_index=True)
 
-   # Ordenar por Puntuación y, en caso de empate, por ROE (%) y P/E
-   dfFinal = dfFinal.sort_values(by=["Puntuación", "ROE (%)", "P/E"], ascending=[False, False, True])
+   fGuardarDatosBrutos(dfCrudo)
 
-   # Guardar en Excel
-   dfFinal.to_excel(sDATA_STOCKS_PATH, index=False)
+   # Construir el listado final a partir de la tabla de datos brutos
+   fConstruirListado(dfCrudo, bExportarExcel=dConfigGeneral['bExportarExcel'])
 
+   if bReanudar:
+      print(f"INFO    - TOTAL Tickers Reanudados del diario: {len(dfCrudo) - iContadorReutilizados - iContadorExitos}")
+   if bIncremental:
+      print(f"INFO    - TOTAL Tickers Reutilizados: {iContadorReutilizados}")
+      print(f"INFO    - TOTAL Tickers Refrescados: {iContadorExitos}")
    print(f"INFO    - TOTAL Tickers Correctos: {iContadorExitos}")
    print(f"INFO    - TOTAL Tickers Con Error: {iContadorErrores}")
-   print(f"INFO    - Resultados guardados en: {sDATA_STOCKS_PATH}")
+   if oValidador is not None:
+      # Cada ticker descartado habría costado lo mismo que la media de los consultados en esta ejecución
+      fAhorro = len(lDescartados) * fTiempoConsulta / max(1, len(lTickersPendientes)) - fTiempoValidacion
+      print(f"INFO    - TOTAL Tickers Descartados Sin Cotización: {len(lDescartados)} (tiempo ahorrado estimado: {fAhorro:.1f}s)")
+   print(f"INFO    - Datos brutos guardados en: {sDATOS_BRUTOS_PATH}")
+   print(f"INFO    - Resultados guardados en: {AlmacenDeDatos.sLISTADO_PATH}")
+   if dConfigGeneral['bExportarExcel']:
+      print(f"INFO    - Resultados exportados a: {AlmacenDeDatos.sLISTADO_EXCEL_PATH}")
+   if oCache is not None:
+      print(f"INFO    - {oCache.fResumen()}")
+      oCache.fCerrar()
+
+
+def fReevaluarMetricas():
+   """
+   Reconstruye el listado final desde la tabla de datos brutos guardada, sin ninguna llamada de red.
+   Sirve para aplicar cambios en las reglas de puntuación sin volver a descargar los tickers.
+   """
+   if not os.path.exists(sDATOS_BRUTOS_PATH):
+      print(f"ERROR   - fReevaluarMetricas: No existe {sDATOS_BRUTOS_PATH}. Ejecuta antes fGenerarMetricas.")
+      return
+
+   fInicio = time.perf_counter()
+   dfCrudo = pd.read_parquet(sDATOS_BRUTOS_PATH)
+   dConfigGeneral = fCargarConfiguracion()
+   dfFinal = fConstruirListado(dfCrudo, bConsultarApi=False, bExportarExcel=dConfigGeneral['bExportarExcel'])
+
+   print(f"INFO    - Repuntuados {len(dfFinal)} tickers en {time.perf_counter() - fInicio:.2f}s")
+   print(f"INFO    - Resultados guardados en: {AlmacenDeDatos.sLISTADO_PATH}")
+   if dConfigGeneral['bExportarExcel']:
+      print(f"INFO    - Resultados exportados a: {AlmacenDeDatos.sLISTADO_EXCEL_PATH}")
@@ -0,0 +1,200 @@
+# Lib\GraficosDelVisualizador.py
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+"""
+================================================================================
+Gráficos del Visualizador de Acciones (Modo Ligero)
+--------------------------------------------------------------------------------
+
+Con pocas filas los gráficos se dibujan como siempre (SVG, un punto por fila).
+Por encima de iUMBRAL_MODO_LIGERO filas se pasa al modo ligero:
+   - Dispersión: trazas WebGL (render_mode="webgl") y, si hay más de
+     iMAXIMO_PUNTOS filas, un diezmado en el servidor sobre una rejilla que
+     conserva la forma de la nube y sus extremos (un punto por celda, el de
+     mayor capitalización).
+   - Cajas por sector: se envían solo las estadísticas precalculadas (cuartiles,
+     mediana, bigotes y media) en lugar de todos los puntos.
+   - Histograma: las barras se calculan en el servidor con np.histogram.
+
+================================================================================
+"""
+
+
+# Filas a partir de las cuales se usa el modo ligero en modo "Automático"
+iUMBRAL_MODO_LIGERO = 2_000
+# Puntos máximos por gráfico de dispersión en modo ligero
+iMAXIMO_PUNTOS = 4_000
+# Modos de dibujo disponibles
+lMODOS_GRAFICOS = ["Automático", "Completo", "Ligero"]
+
+
+
+def fEsModoLigero(iFilas: int, sModo: str = "Automático") -> bool:
+   if sModo == "Automático":
+      return iFilas > iUMBRAL_MODO_LIGERO
+   return sModo == "Ligero"
+
+
+def fDiezmarPuntos(dfDatos: pd.DataFrame, sColumnaX: str, sColumnaY: str, iMaximo: int = iMAXIMO_PUNTOS, sColumnaPrioridad: str = "Capitalización ($)") -> pd.DataFrame:
+   """
+   Reduce los puntos de un gráfico de dispersión a, como mucho, iMaximo: se divide el plano en una rejilla
+   de sqrt(iMaximo) x sqrt(iMaximo) celdas y se conserva una fila por celda ocupada (la de mayor sColumnaPrioridad).
+
+   Retorna:
+      DataFrame: Las filas conservadas (el mismo DataFrame si ya tenía iMaximo filas o menos).
+   """
+   aX = pd.to_numeric(dfDatos[sColumnaX], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+   aY = pd.to_numeric(dfDatos[sColumnaY], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+   aValidas = np.isfinite(aX) & np.isfinite(aY)
+   if np.count_nonzero(aValidas) <= iMaximo:
+      return dfDatos
+
+   iLado = max(1, int(np.sqrt(iMaximo)))
+
+   def fCeldas(aValores: np.ndarray) -> np.ndarray:
+      fMinimo, fMaximo = aValores.min(), aValores.max()
+      if fMaximo <= fMinimo:
+         return np.zeros(len(aValores), dtype=np.int64)
+      return np.minimum(((aValores - fMinimo) / (fMaximo - fMinimo) * iLado).astype(np.int64), iLado - 1)
+
+   aPosiciones = np.flatnonzero(aValidas)
+   aCelda = fCeldas(aX[aValidas]) * iLado + fCeldas(aY[aValidas])
+
+   if sColumnaPrioridad in dfDatos.columns:
+      aPrioridad = pd.to_numeric(dfDatos[sColumnaPrioridad], errors="coerce").to_numpy(dtype=float, na_value=np.nan)[aValidas]
+      aPrioridad = np.nan_to_num(aPrioridad, nan=-np.inf)
+   else:
+      aPrioridad = np.zeros(len(aPosiciones))
+
+   # Ordenar por celda y, dentro de cada celda, por prioridad descendente; quedarse con la primera de cada celda
+   aOrden = np.lexsort((-aPrioridad, aCelda))
+   aPrimeras = np.ones(len(aOrden), dtype=bool)
+   aPrimeras[1:] = aCelda[aOrden][1:] != aCelda[aOrden][:-1]
+   return dfDatos.take(np.sort(aPosiciones[aOrden[aPrimeras]]))
+
+
+def fGraficoDispersion(dfDatos: pd.DataFrame, bLigero: bool, **dArgumentos) -> go.Figure:
+   """
+   px.scatter con los mismos argumentos; en modo ligero, diezmado y con WebGL.
+   """
+   if not bLigero:
+      return px.scatter(dfDatos, **dArgumentos)
+
+   dfPuntos = fDiezmarPuntos(dfDatos, dArgumentos["x"], dArgumentos["y"])
+   if len(dfPuntos) < len(dfDatos):
+      dArgumentos["title"] = f"{dArgumentos.get('title', '')} (muestra de {len(dfPuntos)} de {len(dfDatos)})"
+   return px.scatter(dfPuntos, render_mode="webgl", **dArgumentos)
+
+
+def fEstadisticasCajas(dfDatos: pd.DataFrame, sColumnaGrupo: str, sColumnaValor: str) -> pd.DataFrame:
+   """
+   Estadísticas de un diagrama de cajas por grupo, como las calcula Plotly: cuartiles (lineales), mediana,
+   media y bigotes hasta el último valor dentro de 1.5 veces el rango intercuartílico.
+   """
+   dfValores = dfDatos[[sColumnaGrupo, sColumnaValor]].dropna()
+   oGrupos = dfValores.groupby(sColumnaGrupo, observed=True)[sColumnaValor]
+   dfEstadisticas = oGrupos.quantile([0.25, 0.5, 0.75]).unstack()
+   dfEstadisticas.columns = ["q1", "median", "q3"]
+   dfEstadisticas["mean"] = oGrupos.mean()
+
+   dfLimites = dfValores.join(dfEstadisticas, on=sColumnaGrupo)
+   fIqr = dfLimites["q3"] - dfLimites["q1"]
+   dfLimites["dentro"] = dfLimites[sColumnaValor].between(dfLimites["q1"] - 1.5 * fIqr, dfLimites["q3"] + 1.5 * fIqr)
+   oDentro = dfLimites[dfLimites["dentro"]].groupby(sColumnaGrupo, observed=True)[sColumnaValor]
+   dfEstadisticas["lowerfence"] = oDentro.min()
+   dfEstadisticas["upperfence"] = oDentro.max()
+   return dfEstadisticas.reset_index()
+
+
+def fGraficoCajasPorSector(dfDatos: pd.DataFrame, bLigero: bool, sColumnaValor: str, sTitulo: str, sColumnaGrupo: str = "Sector") -> go.Figure:
+   """
+   px.box(x=sColumnaGrupo, y=sColumnaValor, color=sColumnaGrupo); en modo ligero, solo las estadísticas por grupo.
+   """
+   if not bLigero:
+      return px.box(dfDatos, x=sColumnaGrupo, y=sColumnaValor, color=sColumnaGrupo, title=sTitulo)
+
+   oFigura = go.Figure()
+   lColores = px.colors.qualitative.Plotly
+   for iGrupo, dFila in enumerate(fEstadisticasCajas(dfDatos, sColumnaGrupo, sColumnaValor).to_dict("records")):
+      oFigura.add_trace(go.Box(
+         name=str(dFila[sColumnaGrupo]), x=[dFila[sColumnaGrupo]], marker_color=lColores[iGrupo % len(lColores)],
+         q1=[dFila["q1"]], median=[dFila["median"]], q3=[dFila["q3"]], mean=[dFila["mean"]],
+         lowerfence=[dFila["lowerfence"]], upperfence=[dFila["upperfence"]],
+      ))
+   oFigura.update_layout(title=sTitulo, xaxis_title=sColumnaGrupo, yaxis_title=sColumnaValor, legend_title_text=sColumnaGrupo)
+   return oFigura
+
+
+def fGraficoHistograma(dfDatos: pd.DataFrame, bLigero: bool, sColumna: str, iBarras: int, sTitulo: str) -> go.Figure:
+   """
+   px.histogram(x=sColumna, nbins=iBarras); en modo ligero, las barras ya contadas en el servidor.
+   """
+   if not bLigero:
+      return px.histogram(dfDatos, x=sColumna, nbins=iBarras, title=sTitulo)
+
+   aValores = pd.to_numeric(dfDatos[sColumna], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+   aValores = aValores[np.isfinite(aValores)]
+   aCuentas, aBordes = np.histogram(aValores, bins=iBarras) if len(aValores) else (np.array([]), np.array([0.0]))
+   oFigura = go.Figure(go.Bar(x=(aBordes[:-1] + aBordes[1:]) / 2, y=aCuentas, width=np.diff(aBordes), name=sColumna))
+   oFigura.update_layout(title=sTitulo, xaxis_title=sColumna, yaxis_title="count", bargap=0)
+   return oFigura
+
+
+def fGraficosAvanzados(dfDatos: pd.DataFrame, bLigero: bool) -> list:
+   """
+   Retorna:
+      list: Las cinco figuras de la sección "Análisis Visual de Rentabilidad y Valor", en orden.
+   """
+   return [
+      fGraficoDispersion(dfDatos, bLigero, x="P/E", y="ROE (%)", size="Capitalización ($)", color="Sector",
+                         title="Relación P/E vs ROE", hover_data=["Nombre"]),
+      fGraficoDispersion(dfDatos, bLigero, x="PEG", y="Crecimiento de Ingresos (%)", color="Sector", size="Capitalización ($)",
+                         title="PEG vs Crecimiento de Ingresos", hover_data=["Nombre"]),
+      fGraficoCajasPorSector(dfDatos, bLigero, "P/E", "Distribución de P/E por Sector"),
+      fGraficoHistograma(dfDatos, bLigero, "Dividend Yield (%)", 30, "Distribución de Dividend Yield"),
+      fGraficoDispersion(dfDatos, bLigero, x="ROE (%)", y="Margen Operativo (%)", color="Sector", size="Capitalización ($)",
+                         title="ROE vs Margen Operativo", hover_data=["Nombre"]),
+   ]
+
+
+def fGraficoValoracionPorDimension(dfAgregados: pd.DataFrame, sDimension: str) -> go.Figure:
+   """
+   Barras del P/E promedio por grupo de sDimension (País, Sector o Continente) a partir de los agregados
+   precalculados (ver Lib/AgregadosDelListado.py).
+   """
+   df_Paises = dfAgregados.loc[dfAgregados["Dimension"] == sDimension, ["Grupo", "pe_promedio", "num_pe"]].rename(
+      columns={"Grupo": sDimension, "num_pe": "num_empresas"})
+
+   # Filtrar grupos con al menos 3 empresas para evitar distorsiones
+   df_Paises = df_Paises[df_Paises["num_empresas"] >= 3]
+
+   # Redondear valores para mejor visualización
+   df_Paises["pe_promedio"] = df_Paises["pe_promedio"].round(2)
+
+   # Ordenar por P/E promedio
+   df_Paises = df_Paises.sort_values(by="pe_promedio", ascending=False)
+
+   # Crear gráfico de barras
+   fig_pe_paises = px.bar(
+      df_Paises,
+      x=sDimension,
+      y="pe_promedio",
+      color="pe_promedio",
+      text="pe_promedio",  # Mostrar el P/E promedio sobre la barra
+      title=f"📈 {sDimension} con Mayor P/E Promedio (potencial sobrevaloración)",
+      labels={"pe_promedio": "P/E Promedio", "num_empresas": "N° de Empresas"},
+      color_continuous_scale="Reds",
+      hover_data={"num_empresas": True, "pe_promedio": True}
+   )
+
+   fig_pe_paises.update_layout(
+      xaxis_tickangle=-45,
+      yaxis_title="P/E Promedio",
+      xaxis_title=sDimension,
+      uniformtext_minsize=8,
+      uniformtext_mode='hide'
+   )
+   return fig_pe_paises
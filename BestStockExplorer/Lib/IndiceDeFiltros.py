@@ -0,0 +1,172 @@
+# Lib\IndiceDeFiltros.py
+import threading
+import numpy as np
+import pandas as pd
+
+"""
+================================================================================
+Índice de Filtros de la Barra Lateral
+--------------------------------------------------------------------------------
+
+Se construye una vez por conjunto de datos y resuelve cualquier combinación de
+filtros de la barra lateral sin crear DataFrames intermedios:
+   - Columnas numéricas: valores ordenados (sin NaN) y su permutación argsort.
+     Un rango [min, max] se traduce con dos `searchsorted` en el tramo de la
+     permutación que lo cumple.
+   - Columnas categóricas: un bitset (bits empaquetados con np.packbits) por
+     cada valor distinto.
+Cada filtro es un bitset de filas y la combinación es un AND bit a bit. Solo al
+final se extraen las filas que cumplen todo con un único `take`.
+
+Las máscaras de rango se memorizan por (columna, min, max), así que los sliders
+que no se han movido no se recalculan en cada rerun.
+
+La tabla paginada también ordena y busca aquí, en el servidor: cada columna
+guarda (la primera vez que se ordena por ella) su permutación completa, y
+ordenar las filas filtradas es quedarse con las de esa permutación que están en
+el filtro, en tiempo lineal y sin ordenar en cada rerun.
+
+================================================================================
+"""
+
+
+class IndiceDeFiltros:
+   """
+   Índice sobre un DataFrame fijo. Es seguro compartirlo entre reruns y sesiones (la memoria de máscaras
+   de rango está protegida por un cerrojo).
+   """
+
+   def __init__(self, dfDatos: pd.DataFrame, lColumnasTexto: list, lColumnasNumericas: list, iMaximoMascarasPorColumna: int = 8):
+      """
+      Parámetros:
+         dfDatos (DataFrame): Datos a filtrar (no se copian ni se modifican).
+         lColumnasTexto (list): Columnas que se filtran por igualdad (selectbox).
+         lColumnasNumericas (list): Columnas que se filtran por rango (sliders).
+         iMaximoMascarasPorColumna (int): Máscaras de rango memorizadas por columna.
+      """
+      self.dfDatos = dfDatos
+      self.iFilas = len(dfDatos)
+      self.iMaximoMascarasPorColumna = iMaximoMascarasPorColumna
+
+      # Columnas numéricas: valores ordenados y posición original de cada uno (los NaN nunca cumplen un rango)
+      self.dOrdenados = {}
+      for sColumna in lColumnasNumericas:
+         if sColumna not in dfDatos.columns:
+            continue
+         aValores = pd.to_numeric(dfDatos[sColumna], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+         aPermutacion = np.argsort(aValores, kind="stable")
+         iValidos = int(np.count_nonzero(~np.isnan(aValores)))
+         aPermutacion = aPermutacion[:iValidos]
+         self.dOrdenados[sColumna] = (aValores[aPermutacion], aPermutacion)
+
+      # Columnas categóricas: un bitset por valor
+      self.dBitsetsCategorias = {}
+      for sColumna in lColumnasTexto:
+         if sColumna not in dfDatos.columns:
+            continue
+         aCodigos, aCategorias = pd.factorize(dfDatos[sColumna], use_na_sentinel=True)
+         self.dBitsetsCategorias[sColumna] = {
+            oValor: np.packbits(aCodigos == iCodigo) for iCodigo, oValor in enumerate(aCategorias.tolist())
+         }
+
+      self.aTodas = np.packbits(np.ones(self.iFilas, dtype=bool))
+      self.aNinguna = np.zeros_like(self.aTodas)
+      self.dMascarasRango = {sColumna: {} for sColumna in self.dOrdenados}
+      self.dPermutaciones = {}
+      self.oCerrojo = threading.Lock()
+
+
+   def fMascaraRango(self, sColumna: str, fMinimo: float, fMaximo: float) -> np.ndarray:
+      """
+      Bitset de las filas con fMinimo <= valor <= fMaximo en la columna.
+      """
+      dMascaras = self.dMascarasRango[sColumna]
+      tClave = (fMinimo, fMaximo)
+      with self.oCerrojo:
+         aBitset = dMascaras.get(tClave)
+      if aBitset is not None:
+         return aBitset
+
+      aValoresOrdenados, aPermutacion = self.dOrdenados[sColumna]
+      iDesde = np.searchsorted(aValoresOrdenados, fMinimo, side="left")
+      iHasta = np.searchsorted(aValoresOrdenados, fMaximo, side="right")
+      aMascara = np.zeros(self.iFilas, dtype=bool)
+      aMascara[aPermutacion[iDesde:iHasta]] = True
+      aBitset = np.packbits(aMascara)
+
+      # Memoria acotada: se olvida la máscara más antigua de la columna
+      with self.oCerrojo:
+         if tClave not in dMascaras and len(dMascaras) >= self.iMaximoMascarasPorColumna:
+            dMascaras.pop(next(iter(dMascaras)))
+         dMascaras[tClave] = aBitset
+      return aBitset
+
+
+   def fFiltrar(self, dFiltrosTexto: dict, dFiltrosNumericos: dict) -> np.ndarray:
+      """
+      Resuelve una combinación de filtros.
+
+      Parámetros:
+         dFiltrosTexto (dict): {sColumna: valor}; "Todos" no filtra.
+         dFiltrosNumericos (dict): {sColumna: (min, max)}.
+
+      Retorna:
+         ndarray: Posiciones (ordenadas) de las filas que cumplen todos los filtros.
+      """
+      aBitset = self.aTodas.copy()
+
+      for sColumna, oValor in dFiltrosTexto.items():
+         if oValor == "Todos" or sColumna not in self.dBitsetsCategorias:
+            continue
+         np.bitwise_and(aBitset, self.dBitsetsCategorias[sColumna].get(oValor, self.aNinguna), out=aBitset)
+
+      for sColumna, (fMinimo, fMaximo) in dFiltrosNumericos.items():
+         if sColumna in self.dOrdenados:
+            np.bitwise_and(aBitset, self.fMascaraRango(sColumna, fMinimo, fMaximo), out=aBitset)
+
+      return np.flatnonzero(np.unpackbits(aBitset, count=self.iFilas))
+
+
+   def fPermutacion(self, sColumna: str, bAscendente: bool = True) -> np.ndarray:
+      """
+      Permutación que ordena todas las filas por la columna, con los valores vacíos siempre al final
+      (como sort_values). Se calcula la primera vez que se pide y se reutiliza.
+      """
+      tClave = (sColumna, bAscendente)
+      with self.oCerrojo:
+         aPermutacion = self.dPermutaciones.get(tClave)
+      if aPermutacion is not None:
+         return aPermutacion
+
+      if sColumna in self.dOrdenados:
+         aValidos = self.dOrdenados[sColumna][1]
+      else:
+         aCodigos = pd.factorize(self.dfDatos[sColumna], sort=True, use_na_sentinel=True)[0]
+         aValidos = np.argsort(aCodigos, kind="stable")[np.count_nonzero(aCodigos < 0):]
+      aVacios = np.setdiff1d(np.arange(self.iFilas), aValidos, assume_unique=True)
+      aPermutacion = np.concatenate([aValidos if bAscendente else aValidos[::-1], aVacios])
+
+      with self.oCerrojo:
+         self.dPermutaciones[tClave] = aPermutacion
+      return aPermutacion
+
+
+   def fOrdenar(self, aFilas: np.ndarray, sColumna: str, bAscendente: bool = True) -> np.ndarray:
+      """
+      Ordena posiciones de filas (por ejemplo, el resultado de fFiltrar) por una columna.
+      """
+      aEnFiltro = np.zeros(self.iFilas, dtype=bool)
+      aEnFiltro[aFilas] = True
+      aPermutacion = self.fPermutacion(sColumna, bAscendente)
+      return aPermutacion[aEnFiltro[aPermutacion]]
+
+
+   def fBuscar(self, aFilas: np.ndarray, sColumna: str, sTexto: str) -> np.ndarray:
+      """
+      Posiciones de aFilas cuyo valor en la columna contiene sTexto (sin distinguir mayúsculas), en el mismo orden.
+      """
+      if not sTexto:
+         return aFilas
+      sSerie = self.dfDatos[sColumna].iloc[aFilas].astype("string")
+      aCoincide = sSerie.str.contains(sTexto, case=False, regex=False, na=False).to_numpy(dtype=bool)
+      return aFilas[aCoincide]
@@ -0,0 +1,262 @@
+# Lib\InstrumentacionDelVisualizador.py
+import sys, os, time
+import json
+import threading
+import contextlib
+from datetime import datetime
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+"""
+================================================================================
+Instrumentación del Visualizador de Acciones (Panel de Rendimiento)
+--------------------------------------------------------------------------------
+
+Mide cada sección de VisualizadorDeAcciones.py en cada rerun: tiempo, filas de
+entrada y de salida, aciertos/fallos de las cachés de DatosDelVisualizador y
+bytes enviados al navegador (tamaño de los mensajes que Streamlit encola
+mientras la sección se ejecuta).
+
+Está desactivada por defecto y no añade coste. Se activa con:
+   - La variable de entorno VISUALIZADOR_DEBUG=1, o
+   - El parámetro de URL ?debug=1.
+
+Con la instrumentación activa, la barra lateral muestra el panel del último
+rerun completo, y cada fragmento que se vuelve a ejecutar solo muestra su
+propio tiempo bajo la sección. Desde el panel se puede anexar cada medición a
+un JSONL (una línea por rerun, con el número de filas del listado) para
+comparar reruns entre tamaños de datos. La ruta se puede cambiar con la
+variable de entorno VISUALIZADOR_DEBUG_JSONL.
+
+================================================================================
+"""
+
+
+# Detectar si el script está empaquetado con PyInstaller
+if getattr(sys, 'frozen', False):
+   BASE_DIR = sys._MEIPASS  # Ruta temporal generada por PyInstaller
+else:
+   # Ruta base = carpeta del proyecto
+   BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Ruta por defecto del JSONL de mediciones
+sMEDICIONES_PATH = os.path.join(BASE_DIR, "Data", "MedicionesDelVisualizador.jsonl")
+
+# Activación por variable de entorno o por parámetro de URL
+sVARIABLE_ACTIVACION = "VISUALIZADOR_DEBUG"
+sVARIABLE_JSONL = "VISUALIZADOR_DEBUG_JSONL"
+sPARAMETRO_URL = "debug"
+lVALORES_DESACTIVADO = ["", "0", "false", "no"]
+
+# Fallos de caché del hilo del script en curso (cada sesión de Streamlit ejecuta su script en su propio hilo)
+oFallosDeCache = threading.local()
+oCerrojoJsonl = threading.Lock()
+
+
+
+def fRegistrarFalloDeCache(sCache: str) -> None:
+   """
+   Se llama desde el cuerpo de una función cacheada: solo se ejecuta cuando la caché falla.
+   """
+   if not hasattr(oFallosDeCache, "lFallos"):
+      oFallosDeCache.lFallos = []
+   oFallosDeCache.lFallos.append(sCache)
+
+
+def fFallosDeCache() -> list:
+   return getattr(oFallosDeCache, "lFallos", [])
+
+
+def fEstaActivada() -> bool:
+   if os.getenv(sVARIABLE_ACTIVACION, "").strip().lower() not in lVALORES_DESACTIVADO:
+      return True
+   return str(st.query_params.get(sPARAMETRO_URL, "")).strip().lower() not in lVALORES_DESACTIVADO
+
+
+def fRutaMediciones() -> str:
+   return os.getenv(sVARIABLE_JSONL) or sMEDICIONES_PATH
+
+
+def fEsRerunDeFragmento() -> bool:
+   """
+   Retorna:
+      bool: True si el rerun en curso solo ejecuta fragmentos (no el script entero).
+   """
+   oContexto = get_script_run_ctx()
+   return bool(oContexto is not None and oContexto.fragment_ids_this_run)
+
+
+class InstrumentacionDelVisualizador:
+   """
+   Mediciones de un rerun: una lista de etapas, cada una con su tiempo, filas, cachés y bytes enviados.
+   """
+
+   def __init__(self, sTipo: str = "completo", dContexto: dict = None):
+      self.sTipo = sTipo
+      self.dContexto = dict(dContexto or {})
+      self.lEtapas = []
+      self.fInicio = time.perf_counter()
+
+
+   @contextlib.contextmanager
+   def fEtapa(self, sNombre: str, iFilasEntrada: int = None, lCaches: list = ()):
+      """
+      Mide el bloque como una etapa. El bloque recibe el dict de la etapa y puede rellenar "iFilasSalida".
+
+      Parámetros:
+         sNombre (str): Nombre de la etapa.
+         iFilasEntrada (int): Filas que recibe la etapa.
+         lCaches (list): Funciones cacheadas que usa (para marcar acierto o fallo).
+      """
+      dEtapa = {"sEtapa": sNombre, "iFilasEntrada": iFilasEntrada, "iFilasSalida": None, "iBytes": 0}
+      iFallosPrevios = len(fFallosDeCache())
+
+      # Contar los bytes de los mensajes que se encolan hacia el navegador durante la etapa.
+      # Depende de un detalle interno de Streamlit (el atributo privado `_enqueue` del ScriptRunContext): si
+      # una versión lo cambia o lo quita, solo se deja de contar bytes (iBytes = 0) y la etapa se mide igual
+      oContexto = get_script_run_ctx()
+      fEncolarOriginal = getattr(oContexto, "_enqueue", None)
+      bContarBytes = callable(fEncolarOriginal)
+
+      def fEncolarContando(oMensaje):
+         try:
+            dEtapa["iBytes"] += oMensaje.ByteSize()
+         except Exception:
+            pass
+         fEncolarOriginal(oMensaje)
+
+      if bContarBytes:
+         try:
+            oContexto._enqueue = fEncolarContando
+         except Exception:
+            bContarBytes = False
+      fInicio = time.perf_counter()
+      try:
+         yield dEtapa
+      finally:
+         dEtapa["fMs"] = round((time.perf_counter() - fInicio) * 1000, 2)
+         if bContarBytes:
+            oContexto._enqueue = fEncolarOriginal
+         lFallos = fFallosDeCache()[iFallosPrevios:]
+         dEtapa["sCache"] = ", ".join(f"{sCache}: {'fallo' if sCache in lFallos else 'acierto'}" for sCache in lCaches)
+         self.lEtapas.append(dEtapa)
+
+
+   def fAnadirEtapa(self, sNombre: str, fMs: float, iFilasEntrada: int = None, iFilasSalida: int = None, sCache: str = "") -> None:
+      """
+      Añade una etapa medida fuera del rerun (por ejemplo, dentro de una función cacheada).
+      """
+      self.lEtapas.append({"sEtapa": sNombre, "iFilasEntrada": iFilasEntrada, "iFilasSalida": iFilasSalida,
+                           "iBytes": 0, "fMs": round(fMs, 2), "sCache": sCache})
+
+
+   def fResumen(self) -> dict:
+      """
+      Retorna:
+         dict: Registro del rerun (una línea del JSONL).
+      """
+      return {
+         "sFecha": datetime.now().isoformat(timespec="seconds"),
+         "sTipo": self.sTipo,
+         **self.dContexto,
+         "fMsTotal": round((time.perf_counter() - self.fInicio) * 1000, 2),
+         "iBytesTotal": sum(dEtapa["iBytes"] for dEtapa in self.lEtapas),
+         "lEtapas": self.lEtapas,
+      }
+
+
+   def fGuardarJsonl(self, sRuta: str = None) -> None:
+      sRuta = sRuta or fRutaMediciones()
+      os.makedirs(os.path.dirname(os.path.abspath(sRuta)), exist_ok=True)
+      sLinea = json.dumps(self.fResumen(), ensure_ascii=False, default=str) + "\n"
+      with oCerrojoJsonl, open(sRuta, "a", encoding="utf-8") as f:
+         f.write(sLinea)
+
+
+# ================================
+# USO DESDE EL VISUALIZADOR
+# ================================
+def fIniciarRerun(dContexto: dict = None):
+   """
+   Empieza las mediciones de un rerun completo.
+
+   Retorna:
+      InstrumentacionDelVisualizador | None: None si la instrumentación está desactivada.
+   """
+   oFallosDeCache.lFallos = []
+   oInstrumentacion = InstrumentacionDelVisualizador("completo", dContexto) if fEstaActivada() else None
+   st.session_state["oInstrumentacion"] = oInstrumentacion
+   return oInstrumentacion
+
+
+def fRegistrarPreparacion(dDatos: dict) -> None:
+   """
+   Añade al rerun en curso los pasos de DatosDelVisualizador.fPrepararDatos con sus filas. Solo cuestan
+   tiempo en el rerun en que falla su caché; en el resto aparecen con 0 ms.
+   """
+   oInstrumentacion = st.session_state.get("oInstrumentacion")
+   if oInstrumentacion is None:
+      return
+
+   bPreparados = "fPrepararDatos" in fFallosDeCache()
+   iOriginal, iSinOutliers, iExplicito = len(dDatos["dfOriginal"]), len(dDatos["dfSinOutliers"]), len(dDatos["dfFiltradoExplicito"])
+   dFilas = {"Carga del listado": (None, iOriginal), "Outliers": (iOriginal, iSinOutliers), "Filtros explícitos": (iSinOutliers, iExplicito)}
+   for sPaso, fMs in dDatos["dTiemposMs"].items():
+      iFilasEntrada, iFilasSalida = dFilas.get(sPaso, (None, None))
+      oInstrumentacion.fAnadirEtapa(f"  · {sPaso}", fMs if bPreparados else 0.0, iFilasEntrada, iFilasSalida,
+                                    "calculado" if bPreparados else "en caché")
+   oInstrumentacion.dContexto.update({"iFilasListado": iOriginal, "sHash": dDatos["sHash"]})
+
+
+@contextlib.contextmanager
+def fEtapa(sNombre: str, iFilasEntrada: int = None, lCaches: list = ()):
+   """
+   Etapa del rerun en curso (ver InstrumentacionDelVisualizador.fEtapa); sin coste si está desactivada.
+   """
+   oInstrumentacion = st.session_state.get("oInstrumentacion")
+   if oInstrumentacion is None:
+      yield {}
+      return
+   with oInstrumentacion.fEtapa(sNombre, iFilasEntrada, lCaches) as dEtapa:
+      yield dEtapa
+
+
+@contextlib.contextmanager
+def fSeccion(sNombre: str, iFilasEntrada: int = None, lCaches: list = ()):
+   """
+   Etapa de un fragmento. En un rerun completo es una etapa más; cuando solo se vuelve a ejecutar el fragmento,
+   se mide aparte, se muestra bajo la sección y se anexa al JSONL si está activado.
+   """
+   oInstrumentacion = st.session_state.get("oInstrumentacion")
+   if oInstrumentacion is None or not fEsRerunDeFragmento():
+      with fEtapa(sNombre, iFilasEntrada, lCaches) as dEtapa:
+         yield dEtapa
+      return
+
+   oFallosDeCache.lFallos = []
+   oFragmento = InstrumentacionDelVisualizador("fragmento", oInstrumentacion.dContexto)
+   with oFragmento.fEtapa(sNombre, iFilasEntrada, lCaches) as dEtapa:
+      yield dEtapa
+   dMedicion = oFragmento.lEtapas[0]
+   st.caption(f"⏱️ {sNombre}: {dMedicion['fMs']} ms · {dMedicion['iBytes'] / 1024:.1f} KB enviados · {dMedicion['sCache'] or 'sin cachés'}")
+   if st.session_state.get("bGuardarMediciones"):
+      oFragmento.fGuardarJsonl()
+
+
+def fFinalizarRerun(oInstrumentacion) -> None:
+   """
+   Muestra el panel de rendimiento del rerun en la barra lateral y, si se pide, lo anexa al JSONL.
+   """
+   if oInstrumentacion is None:
+      return
+
+   dResumen = oInstrumentacion.fResumen()
+   with st.sidebar.expander("⏱️ Rendimiento del rerun", expanded=True):
+      st.caption(f"{dResumen['fMsTotal']} ms · {dResumen['iBytesTotal'] / 1024:.1f} KB enviados")
+      dfEtapas = pd.DataFrame(dResumen["lEtapas"]).rename(columns={
+         "sEtapa": "Etapa", "fMs": "ms", "iFilasEntrada": "Filas entrada", "iFilasSalida": "Filas salida",
+         "iBytes": "Bytes", "sCache": "Caché"})
+      st.dataframe(dfEtapas[["Etapa", "ms", "Filas entrada", "Filas salida", "Bytes", "Caché"]], hide_index=True)
+      if st.checkbox("Anexar mediciones al JSONL", key="bGuardarMediciones", help=fRutaMediciones()):
+         oInstrumentacion.fGuardarJsonl()
@@ -0,0 +1,59 @@
+# Lib\LimitadorDePeticiones.py
+import time
+import threading
+
+"""
+================================================================================
+Limitador de Peticiones (Token Bucket)
+--------------------------------------------------------------------------------
+
+Limitador global compartido entre todos los hilos que consultan Yahoo Finance.
+Sustituye a la pausa fija por llamada: cada petición consume un token y los
+tokens se reponen a un ritmo constante de `fPeticionesPorSegundo`, permitiendo
+ráfagas de hasta `iCapacidad` peticiones.
+
+================================================================================
+"""
+
+
+class LimitadorTokenBucket:
+   """
+   Limitador de peticiones por segundo basado en el algoritmo token bucket.
+   Es seguro para usarse desde varios hilos a la vez.
+   """
+
+   def __init__(self, fPeticionesPorSegundo: float, iCapacidad: int = 1):
+      """
+      Parámetros:
+         fPeticionesPorSegundo (float): Presupuesto de peticiones por segundo (<= 0 desactiva el límite).
+         iCapacidad (int): Número máximo de tokens acumulables (tamaño de ráfaga).
+      """
+      self.fPeticionesPorSegundo = float(fPeticionesPorSegundo)
+      self.iCapacidad = max(1, int(iCapacidad))
+      self.fTokens = float(self.iCapacidad)
+      self.fUltimaRecarga = time.monotonic()
+      self.oCerrojo = threading.Lock()
+
+
+   def fAdquirir(self) -> None:
+      """
+      Bloquea el hilo llamante hasta que haya un token disponible y lo consume.
+      """
+      if self.fPeticionesPorSegundo <= 0:
+         return
+
+      while True:
+         with self.oCerrojo:
+            fAhora = time.monotonic()
+            # Reponer los tokens generados desde la última recarga
+            self.fTokens = min(self.iCapacidad, self.fTokens + (fAhora - self.fUltimaRecarga) * self.fPeticionesPorSegundo)
+            self.fUltimaRecarga = fAhora
+
+            if self.fTokens >= 1:
+               self.fTokens -= 1
+               return
+
+            # Tiempo necesario hasta que se genere el siguiente token
+            fEspera = (1 - self.fTokens) / self.fPeticionesPorSegundo
+
+         time.sleep(fEspera)
@@ -0,0 +1,101 @@
+# Lib\MapaDeEnlaces.py
+import sys, os, time
+import sqlite3
+
+"""
+================================================================================
+Mapa Persistente de Enlaces de Empresas a Tickers
+--------------------------------------------------------------------------------
+
+Guarda en SQLite, por cada enlace de empresa de Investing.com, el nombre y el
+ticker (sin el sufijo del índice) leídos de su página, la fecha en que se leyó
+y la última fecha en que el enlace apareció en la tabla de componentes de un
+índice. Así un nuevo scraping solo carga las páginas de componentes de los
+índices y las páginas de las empresas con enlaces desconocidos (o leídas hace
+más de iDiasRevisitarEmpresas días), en lugar de todas.
+
+================================================================================
+"""
+
+
+# Detectar si el script está empaquetado con PyInstaller
+if getattr(sys, 'frozen', False):
+   BASE_DIR = sys._MEIPASS  # Ruta temporal generada por PyInstaller
+else:
+   # Ruta base = carpeta del proyecto
+   BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Ruta de la base de datos con el mapa de enlaces
+sMAPA_DE_ENLACES_PATH = os.path.join(BASE_DIR, "Data", "MapaDeEnlaces.sqlite")
+
+
+class MapaDeEnlaces:
+   """
+   Mapa enlace -> (nombre, ticker sin sufijo). Lo usa un único proceso (el scraper o el coordinador del modo paralelo).
+   """
+
+   def __init__(self, sRuta: str = None, iDiasRevisitarEmpresas: float = 90):
+      """
+      Parámetros:
+         sRuta (str): Ruta del fichero SQLite (por defecto, sMAPA_DE_ENLACES_PATH).
+         iDiasRevisitarEmpresas (float): Días tras los que se vuelve a leer la página de una empresa conocida
+                                         (0 = no caducan).
+      """
+      self.sRuta = sRuta or sMAPA_DE_ENLACES_PATH
+      self.fSegundosValidez = float(iDiasRevisitarEmpresas) * 86400
+
+      os.makedirs(os.path.dirname(self.sRuta), exist_ok=True)
+      self.oConexion = sqlite3.connect(self.sRuta)
+      self.oConexion.execute(
+         "CREATE TABLE IF NOT EXISTS enlaces (enlace TEXT PRIMARY KEY, nombre TEXT NOT NULL, ticker TEXT NOT NULL, "
+         "leido REAL NOT NULL, visto REAL NOT NULL)"
+      )
+      self.oConexion.commit()
+      # Copia en memoria: una consulta por empresa sería más lenta que el propio scraping de las conocidas
+      self.dEnlaces = {
+         sEnlace: (sNombre, sTicker, fLeido)
+         for sEnlace, sNombre, sTicker, fLeido in self.oConexion.execute("SELECT enlace, nombre, ticker, leido FROM enlaces")
+      }
+
+
+   def fObtener(self, sEnlace: str, sSufijo: str = "") -> dict:
+      """
+      Retorna:
+         dict: Nombre y Ticker (con sSufijo) de un enlace conocido y vigente, o None si hay que leer su página.
+      """
+      tEntrada = self.dEnlaces.get(sEnlace)
+      if tEntrada is None:
+         return None
+      sNombre, sTicker, fLeido = tEntrada
+      if self.fSegundosValidez and time.time() - fLeido > self.fSegundosValidez:
+         return None
+      return {'Nombre': sNombre, 'Ticker': sTicker + sSufijo if sSufijo else sTicker}
+
+
+   def fGuardar(self, sEnlace: str, dDatosEmpresa: dict, sSufijo: str = "") -> None:
+      """
+      Guarda los datos leídos de la página de una empresa (dDatosEmpresa['Ticker'] lleva el sufijo sSufijo, que se quita).
+      """
+      sTicker = dDatosEmpresa['Ticker']
+      if sSufijo and sTicker.endswith(sSufijo):
+         sTicker = sTicker[:-len(sSufijo)]
+      fAhora = time.time()
+      self.dEnlaces[sEnlace] = (dDatosEmpresa['Nombre'], sTicker, fAhora)
+      self.oConexion.execute(
+         "INSERT OR REPLACE INTO enlaces (enlace, nombre, ticker, leido, visto) VALUES (?, ?, ?, ?, ?)",
+         (sEnlace, dDatosEmpresa['Nombre'], sTicker, fAhora, fAhora)
+      )
+      self.oConexion.commit()
+
+
+   def fMarcarVistos(self, lEnlaces: list) -> None:
+      """
+      Actualiza la fecha en que se vieron por última vez los enlaces conocidos de una tabla de componentes.
+      """
+      fAhora = time.time()
+      self.oConexion.executemany("UPDATE enlaces SET visto = ? WHERE enlace = ?", [(fAhora, sEnlace) for sEnlace in lEnlaces])
+      self.oConexion.commit()
+
+
+   def fCerrar(self) -> None:
+      self.oConexion.close()
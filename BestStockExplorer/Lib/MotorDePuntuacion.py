@@ -0,0 +1,112 @@
+# Lib\MotorDePuntuacion.py
+import operator
+import numpy as np
+import pandas as pd
+
+"""
+================================================================================
+Motor de Puntuación por Tabla de Reglas
+--------------------------------------------------------------------------------
+
+Los umbrales y puntos de cada indicador se declaran en `dREGLAS_PUNTUACION`.
+Cada indicador tiene una lista ordenada de tramos (operador, límite, puntos) que
+se evalúan como una cadena if/elif: gana el primer tramo que se cumple. Si no se
+cumple ninguno se suman `iResto` puntos, y si el valor es NaN, `iSiNaN`.
+
+fPuntuarAcciones puntúa todo el universo a la vez con NumPy (np.select).
+
+================================================================================
+"""
+
+
+# Operadores admitidos en los tramos
+dOPERADORES = {
+   "<": operator.lt,
+   "<=": operator.le,
+   ">": operator.gt,
+   ">=": operator.ge,
+}
+
+# Reglas de puntuación por indicador
+dREGLAS_PUNTUACION = {
+   "PEG": {
+      "lTramos": [("<", 0, -1), ("<", 1, 3), ("<=", 2, 2)],
+      "iResto": 0, "iSiNaN": 0,
+   },
+   "EV/EBITDA": {
+      "lTramos": [("<", 8, 3), ("<=", 12, 2)],
+      "iResto": 0, "iSiNaN": 0,
+   },
+   "P/E": {
+      "lTramos": [("<", 15, 3), ("<=", 20, 2), ("<=", 50, 0)],
+      "iResto": -1, "iSiNaN": 0,
+   },
+   "Dividend Yield (%)": {
+      "lTramos": [(">", 3, 2), (">=", 1, 1)],
+      "iResto": 0, "iSiNaN": 0,
+   },
+   "Deuda/Capital (%)": {
+      "lTramos": [("<", 50, 2), ("<=", 100, 1)],
+      "iResto": -1, "iSiNaN": -1,
+   },
+   "Crecimiento de Ingresos (%)": {
+      "lTramos": [(">", 10, 3), (">=", 5, 2), (">=", 0, 1)],
+      "iResto": 0, "iSiNaN": 0,
+   },
+   "FCF/Acción ($)": {
+      "lTramos": [(">", 0, 2)],
+      "iResto": 0, "iSiNaN": 0,
+   },
+   "ROE (%)": {
+      "lTramos": [(">", 15, 3), (">=", 10, 2), (">=", 5, 1)],
+      "iResto": 0, "iSiNaN": 0,
+   },
+   "Beta": {
+      "lTramos": [("<", 1, 2), ("<=", 1.5, 1)],
+      "iResto": 0, "iSiNaN": 0,
+   },
+}
+
+# Calificación según la puntuación total: gana el primer umbral alcanzado
+lREGLAS_CALIFICACION = [
+   (18, "Excelente"),
+   (14, "Muy Buena"),
+   (10, "Buena"),
+   (6, "Regular"),
+]
+sCALIFICACION_POR_DEFECTO = "Débil"
+
+
+def fPuntuarAcciones(dfIndicadores: pd.DataFrame) -> pd.DataFrame:
+   """
+   Puntúa todo el universo a la vez.
+
+   Parámetros:
+      dfIndicadores (DataFrame): Una fila por ticker con las columnas de `dREGLAS_PUNTUACION`.
+
+   Retorna:
+      DataFrame: Copia de la entrada con las columnas "Puntuación" y "Calificación" (re)calculadas.
+   """
+   aPuntuacion = np.zeros(len(dfIndicadores), dtype=np.int64)
+
+   for sIndicador, dRegla in dREGLAS_PUNTUACION.items():
+      aValores = pd.to_numeric(dfIndicadores[sIndicador], errors="coerce").to_numpy(dtype=float)
+
+      # np.select se queda con el primer tramo que se cumple, igual que la cadena if/elif
+      with np.errstate(invalid="ignore"):
+         lCondiciones = [dOPERADORES[sOperador](aValores, fLimite) for sOperador, fLimite, _ in dRegla["lTramos"]]
+      lPuntos = [iPuntos for _, _, iPuntos in dRegla["lTramos"]]
+      aPuntos = np.select(lCondiciones, lPuntos, default=dRegla["iResto"])
+
+      aPuntuacion += np.where(np.isnan(aValores), dRegla["iSiNaN"], aPuntos)
+
+   # Se calcula el código de cada calificación y se construye una columna categórica (evita crear 100k strings)
+   lCondiciones = [aPuntuacion >= iMinimo for iMinimo, _ in lREGLAS_CALIFICACION]
+   lNombres = [sNombre for _, sNombre in lREGLAS_CALIFICACION] + [sCALIFICACION_POR_DEFECTO]
+   aCodigos = np.select(lCondiciones, range(len(lREGLAS_CALIFICACION)), default=len(lREGLAS_CALIFICACION))
+
+   dfPuntuado = dfIndicadores.copy()
+   dfPuntuado["Puntuación"] = aPuntuacion
+   dfPuntuado["Calificación"] = pd.Categorical.from_codes(aCodigos, categories=lNombres)
+
+   return dfPuntuado
@@ -1,14 +1,26 @@
 # Lib\ObtenerTickers.py
 import re, sys, os, time
 import json
+import queue
+import multiprocessing
+import requests
+import lxml.html
 import numpy as np
 import pandas as pd
 from tqdm import tqdm
 from dotenv import load_dotenv
 from unidecode import unidecode
 from bs4 import BeautifulSoup
-from seleniumbase import SB, BaseCase
-from typing import List, Tuple, Optional, Dict
+from urllib.parse import urljoin
+from requests.adapters import HTTPAdapter
+from typing import List, Tuple, Optional, Dict, TYPE_CHECKING
+
+if TYPE_CHECKING:
+   from seleniumbase import BaseCase
+
+from Lib.DatosDeReferencia import fObtenerIndice
+from Lib.EscritorDeTickers import EscritorDeTickers
+from Lib.MapaDeEnlaces import MapaDeEnlaces
 
 """
 ================================================================================
@@ -19,6 +31,27 @@ Este script extrae los tickers de empresas que conforman los principales índice
 bursátiles del mundo, a partir de un archivo CSV basado en Investing.com:
 https://www.investing.com/indices/major-indices
 
+Con iNumeroDeNavegadores > 1 (Config.json, SCRAPEADOR_DE_TICKERS) se reparte el
+trabajo entre varios procesos, cada uno con su propio navegador: primero las
+páginas de componentes de los índices y después las páginas de las empresas,
+que se toman de una cola común. Un único coordinador recibe los resultados,
+los confirma índice a índice en el orden de IndicesGlobales.csv (el mismo
+resultado que la ejecución secuencial) y elimina los tickers repetidos.
+
+Con bRutaRapidaHttp (por defecto activada) las páginas de las empresas se
+descargan primero sin navegador, con una sesión HTTP keep-alive, y el <h1> se
+lee con lxml. Solo se abren en el navegador si la descarga falla, es una
+comprobación anti-bot o el <h1> no está en el HTML (se genera con JavaScript).
+Al terminar se muestra la proporción de páginas resueltas por esta vía y las
+páginas por segundo.
+
+Las empresas nuevas se anexan a TickersDeEmpresas.csv por lotes con
+EscritorDeTickers, que lo compacta (sin tickers repetidos) al terminar.
+
+Con bMapaDeEnlaces (por defecto activado) el ticker de cada enlace de empresa
+se guarda en MapaDeEnlaces: al repetir el scraping solo se cargan las páginas
+de componentes de los índices y las de las empresas con enlaces nuevos.
+
 ================================================================================
 """
 
@@ -37,9 +70,61 @@ sMAYOR_WORLD_INDICES_PATH = os.path.join(BASE_DIR, "Data", "IndicesGlobales.csv"
 # Ruta para almacenar la configuracion del SCRAPEADOR_DE_TICKERS
 sCONFIG_PATH = os.path.join(BASE_DIR, "Config", "Config.json")
 
+# Web de origen (se puede cambiar con la variable de entorno INVESTING_URL, p. ej. a un servidor local de pruebas)
+sINVESTING_URL = "https://www.investing.com"
+# Selector del botón de aceptación de cookies
+sSELECTOR_COOKIES = '#onetrust-accept-btn-handler'
+# Formato del <h1> de la página de una empresa: "Nombre (TICKER)"
+oPATRON_TITULO = re.compile(r'^(.*?)\s+\(([^)]+)\)$')
+# Cabeceras de la ruta rápida por HTTP (las de un Chrome de escritorio)
+dCABECERAS_HTTP = {
+   "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+   "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+   "Accept-Language": "en-US,en;q=0.9",
+}
+# Segundos máximos de cada petición de la ruta rápida
+iTIMEOUT_HTTP = 15
+
 
 # ================= FUNCIONES =================
-def fAbrirURLYObtenerHtml(sbDriver: BaseCase, sUrl: str, sCookies: str, iTiempoSleep: int) -> Optional[BeautifulSoup]:
+def fCargarConfiguracionDelScraper() -> dict:
+   """
+   Lee la sección SCRAPEADOR_DE_TICKERS de Config.json.
+   Si el archivo o alguna clave no existen, se usan los valores por defecto.
+   """
+   dConfigGeneral = {
+      "iSaltarIndice": 0,
+      "iSaltarEmpresa": 0,
+      "iTiempoSleep": 0,
+      "iNumeroDeNavegadores": 1,
+      "bRutaRapidaHttp": True,
+      "iLoteDeEscritura": 50,
+      "iSegundosEntreVolcados": 10,
+      "bMapaDeEnlaces": True,
+      "iDiasRevisitarEmpresas": 90,
+   }
+   try:
+      with open(sCONFIG_PATH, 'r') as sFicheroConfig:
+         dConfiguracion = json.load(sFicheroConfig)
+      dConfigGeneral.update(dConfiguracion.get('SCRAPEADOR_DE_TICKERS', {}))
+   except FileNotFoundError:
+      print(f"ERROR   - fCargarConfiguracionDelScraper: El archivo {sCONFIG_PATH} no se encuentra, se usan valores por defecto. \n")
+   return {sClave: bool(oValor) if sClave.startswith("b") else int(oValor) for sClave, oValor in dConfigGeneral.items()}
+
+
+def fUrlInvesting() -> str:
+   return os.getenv("INVESTING_URL", sINVESTING_URL).rstrip("/")
+
+
+def fAbrirNavegador():
+   """
+   Navegador por defecto: SeleniumBase con undetected-chromedriver (se usa como context manager).
+   """
+   from seleniumbase import SB
+   return SB(uc=True)
+
+
+def fAbrirURLYObtenerHtml(sbDriver: "BaseCase", sUrl: str, sCookies: str, iTiempoSleep: int) -> Optional[BeautifulSoup]:
    """
    Función para inicializar un navegador, visitar una URL y aceptar cookies si es necesario.
 
@@ -77,7 +162,7 @@ def fAbrirURLYObtenerHtml(sbDriver: BaseCase, sUrl: str, sCookies: str, iTiempoS
       return None
 
 
-def fObtenerEmpresasDelIndice(oSoup, sbDriver: BaseCase, iTiempoSleep: int) -> List[str]:
+def fObtenerEmpresasDelIndice(oSoup, sbDriver: "BaseCase", iTiempoSleep: int) -> List[str]:
    """
    Extrae el nombre y enlace de las empresas desde el indice.
    """
@@ -116,90 +201,361 @@ def fObtenerEmpresasDelIndice(oSoup, sbDriver: BaseCase, iTiempoSleep: int) -> L
    return lEmpresasDelIndice
 
 
+def fDatosDesdeTitulo(sTitulo: str, sSufijo: str) -> Optional[Dict[str, str]]:
+   """
+   Nombre y ticker (con el sufijo del índice) a partir del texto de un <h1> "Nombre (TICKER)", o None si no tiene ese formato.
+   """
+   oMatch = oPATRON_TITULO.match(sTitulo)
+   if not oMatch:
+      return None
+   sNombreEmpresa = oMatch.group(1).strip()
+   sTickerEmpresa = oMatch.group(2).strip()
+
+   # Añadir sufijo si existe
+   sTickerConSufijo = sTickerEmpresa + sSufijo if sSufijo else sTickerEmpresa
+
+   return {
+         'Nombre': sNombreEmpresa,
+         'Ticker': sTickerConSufijo,
+   }
+
+
 def fObtenerDatosEmpresas(oSoup, sEnlace, sSufijo):
    """
    Extrae el nombre y ticker de una empresa desde su página.
    """
    for oTitulo in oSoup.find_all('h1'):
-      oMatch = re.match(r'^(.*?)\s+\(([^)]+)\)$', oTitulo.get_text(strip=True))
-      if oMatch:
-         sNombreEmpresa = oMatch.group(1).strip()
-         sTickerEmpresa = oMatch.group(2).strip()
-
-         # Añadir sufijo si existe
-         sTickerConSufijo = sTickerEmpresa + sSufijo if sSufijo else sTickerEmpresa
-         
-         return {
-               'Nombre': sNombreEmpresa,
-               'Ticker': sTickerConSufijo,
-         }
+      dDatosEmpresa = fDatosDesdeTitulo(oTitulo.get_text(strip=True), sSufijo)
+      if dDatosEmpresa:
+         return dDatosEmpresa
 
    print(f"ERROR   - No se encontró un <h1> con formato válido en: {sEnlace} \n")
    return None
 
 
-def fObtenerTickers() -> None:
+def fCrearSesionHttp(iConexiones: int = 4) -> requests.Session:
+   """
+   Sesión HTTP de la ruta rápida: conexiones keep-alive reutilizadas entre páginas y cabeceras de navegador.
+   """
+   oSesion = requests.Session()
+   oSesion.headers.update(dCABECERAS_HTTP)
+   oAdaptador = HTTPAdapter(pool_connections=iConexiones, pool_maxsize=iConexiones)
+   oSesion.mount("http://", oAdaptador)
+   oSesion.mount("https://", oAdaptador)
+   return oSesion
+
+
+def fObtenerDatosEmpresaPorHttp(oSesion: requests.Session, sEnlace: str, sSufijo: str) -> Optional[Dict[str, str]]:
+   """
+   Ruta rápida: descarga la página de la empresa sin navegador y lee sus <h1> con lxml.
+
+   Retorna:
+      dict: Nombre y Ticker, o None si hay que abrirla en el navegador (error o estado distinto de 200, comprobación
+            anti-bot o <h1> generado con JavaScript: en los tres casos el HTML no trae un <h1> válido).
+   """
+   try:
+      oRespuesta = oSesion.get(sEnlace, timeout=iTIMEOUT_HTTP)
+   except requests.RequestException:
+      return None
+   if oRespuesta.status_code != 200:
+      return None
+   return fObtenerDatosEmpresasLxml(oRespuesta.content, sSufijo)
+
+
+def fObtenerDatosEmpresasLxml(bHtml: bytes, sSufijo: str) -> Optional[Dict[str, str]]:
+   """
+   Como fObtenerDatosEmpresas, pero analizando el HTML con lxml (sin BeautifulSoup) y sin mensaje de error.
+   """
+   try:
+      oArbol = lxml.html.fromstring(bHtml)
+   except (ValueError, lxml.etree.ParserError):
+      return None
+
+   for oTitulo in oArbol.iter('h1'):
+      # El mismo texto que get_text(strip=True) de BeautifulSoup
+      dDatosEmpresa = fDatosDesdeTitulo("".join(sTrozo.strip() for sTrozo in oTitulo.itertext()), sSufijo)
+      if dDatosEmpresa:
+         return dDatosEmpresa
+   return None
+
+
+def fObtenerDatosDeLaEmpresa(sbDriver: "BaseCase", oSesion: Optional[requests.Session], sEnlace: str, sSufijo: str,
+                             iTiempoSleep: int, dRendimiento: dict) -> Optional[Dict[str, str]]:
+   """
+   Datos de una empresa por la ruta rápida (si hay oSesion) y, si no se obtienen, con el navegador.
+   Cuenta la página en dRendimiento ("iRutaRapida" o "iNavegador").
+   """
+   if oSesion is not None:
+      dDatosEmpresa = fObtenerDatosEmpresaPorHttp(oSesion, sEnlace, sSufijo)
+      if dDatosEmpresa:
+         dRendimiento["iRutaRapida"] += 1
+         return dDatosEmpresa
+
+   dRendimiento["iNavegador"] += 1
+   oSoup = fAbrirURLYObtenerHtml(sbDriver, sEnlace, sSELECTOR_COOKIES, iTiempoSleep)
+   return fObtenerDatosEmpresas(oSoup, sEnlace, sSufijo) if oSoup else None
+
+
+def fObtenerDatosConMapa(oMapa: Optional[MapaDeEnlaces], sEnlace: str, sSufijo: str, dRendimiento: dict, fLeerPagina) -> Optional[Dict[str, str]]:
+   """
+   Datos de una empresa desde el mapa de enlaces si el enlace es conocido; si no, los lee de su página con
+   fLeerPagina() y los guarda en el mapa.
+   """
+   dDatosEmpresa = oMapa.fObtener(sEnlace, sSufijo) if oMapa is not None else None
+   if dDatosEmpresa:
+      dRendimiento["iConocidas"] += 1
+      return dDatosEmpresa
+
+   dDatosEmpresa = fLeerPagina()
+   if dDatosEmpresa and oMapa is not None:
+      oMapa.fGuardar(sEnlace, dDatosEmpresa, sSufijo)
+   return dDatosEmpresa
+
+
+def fNuevoRendimiento() -> dict:
+   return {"iIndices": 0, "iRutaRapida": 0, "iNavegador": 0, "iConocidas": 0}
+
+
+def fMostrarRendimiento(dRendimiento: dict, fSegundos: float) -> None:
+   """
+   Muestra cuántas páginas de empresas se resolvieron por la ruta rápida, cuántas no se cargaron por estar en el
+   mapa de enlaces y las páginas por segundo del scraping.
+   """
+   iEmpresas = dRendimiento["iRutaRapida"] + dRendimiento["iNavegador"]
+   iPaginas = dRendimiento["iIndices"] + iEmpresas
+   fProporcion = dRendimiento["iRutaRapida"] / iEmpresas if iEmpresas else 0.0
+   print(f"INFO    - Páginas de empresas: {iEmpresas} ({dRendimiento['iRutaRapida']} por la ruta rápida HTTP, {fProporcion:.1%}; "
+         f"{dRendimiento['iNavegador']} con el navegador); {dRendimiento['iConocidas']} empresas ya conocidas sin cargar su página")
+   print(f"INFO    - {iPaginas} páginas en {fSegundos:.1f} s ({iPaginas / fSegundos if fSegundos > 0 else 0.0:.1f} páginas/s) \n")
+
+
+def fObtenerEnlacesDelIndice(sbDriver: "BaseCase", sIndice: str, iTiempoSleep: int) -> List[str]:
+   """
+   Abre la página de componentes de un índice y devuelve los enlaces (absolutos) a sus empresas.
+   """
+   sUrl = f"{fUrlInvesting()}/indices/{sIndice}-components"
+   print(f"\nÍndice: {sIndice} - {sUrl}")
+   oSoup = fAbrirURLYObtenerHtml(sbDriver, sUrl, sSELECTOR_COOKIES, iTiempoSleep)
+   return [urljoin(sUrl, sEnlace) for sEnlace in fObtenerEmpresasDelIndice(oSoup, sbDriver, iTiempoSleep)]
+
+
+# ================= MODO PARALELO =================
+def fTrabajadorDeScraping(oColaTareas, oColaResultados, iTiempoSleep: int, fAbrirNavegador, bRutaRapidaHttp: bool = False) -> None:
+   """
+   Proceso trabajador: abre su propio navegador (y su sesión HTTP de la ruta rápida) y atiende tareas de la cola
+   hasta recibir None.
+
+   Tareas: ("indice", iIndice, None, sIndice, None) o ("empresa", iIndice, iPosicion, sEnlace, sSufijo).
+   Resultados: (sTipo, iIndice, iPosicion, oResultado, dRendimiento), con la lista de enlaces del índice o los
+   datos de la empresa (None si no se pudieron obtener) y la página contada en dRendimiento.
+   """
+   oSesion = fCrearSesionHttp() if bRutaRapidaHttp else None
+   with fAbrirNavegador() as sbDriver:
+      while True:
+         tTarea = oColaTareas.get()
+         if tTarea is None:
+            break
+         sTipo, iIndice, iPosicion, sDato, sSufijo = tTarea
+         dRendimiento = fNuevoRendimiento()
+         try:
+            if sTipo == "indice":
+               dRendimiento["iIndices"] += 1
+               oResultado = fObtenerEnlacesDelIndice(sbDriver, sDato, iTiempoSleep)
+            else:
+               oResultado = fObtenerDatosDeLaEmpresa(sbDriver, oSesion, sDato, sSufijo, iTiempoSleep, dRendimiento)
+         except Exception as e:
+            print(f"\nERROR   - fTrabajadorDeScraping - Error al procesar {sDato}: \n {e} \n")
+            oResultado = [] if sTipo == "indice" else None
+         oColaResultados.put((sTipo, iIndice, iPosicion, oResultado, dRendimiento))
+
+
+def fScrapearEnParalelo(dfIndices: pd.DataFrame, iNumeroDeNavegadores: int, iSaltarEmpresa: int, iTiempoSleep: int,
+                        fAlConfirmarIndice, fAbrirNavegador=fAbrirNavegador, fEsperaMaxima: float = 5.0,
+                        bRutaRapidaHttp: bool = False, oMapa: MapaDeEnlaces = None) -> dict:
+   """
+   Coordinador del modo paralelo: reparte índices y empresas entre iNumeroDeNavegadores procesos y confirma
+   los resultados índice a índice, en el orden de dfIndices.
+
+   Parámetros:
+      dfIndices (DataFrame): Índices a recorrer (columna Indice), ya sin los saltados.
+      iNumeroDeNavegadores (int): Procesos trabajadores, cada uno con su navegador.
+      iSaltarEmpresa (int): Empresas que se saltan del primer índice.
+      iTiempoSleep (int): Espera tras cargar cada página.
+      fAlConfirmarIndice (callable): Recibe (sIndice, lDatosEmpresas) de cada índice completo, en orden; los
+                                     datos están en el orden de la tabla de componentes (sin las fallidas).
+      fAbrirNavegador (callable): Fábrica de navegador de cada trabajador (debe poder importarse desde el proceso hijo).
+      fEsperaMaxima (float): Segundos entre comprobaciones de que quedan trabajadores vivos.
+      bRutaRapidaHttp (bool): Intentar primero las páginas de las empresas sin navegador.
+      oMapa (MapaDeEnlaces): Mapa de enlaces conocidos (no se encolan) donde se guardan los nuevos.
+
+   Retorna:
+      dict: Páginas recorridas por tipo (ver fNuevoRendimiento), sumando las de todos los trabajadores.
+   """
+   dRendimientoTotal = fNuevoRendimiento()
+   lIndices = dfIndices["Indice"].tolist()
+   if not lIndices:
+      return dRendimientoTotal
+
+   # Procesos "spawn": cada trabajador arranca limpio y abre su propio driver (igual en Windows y en Linux)
+   oContexto = multiprocessing.get_context("spawn")
+   oColaTareas, oColaResultados = oContexto.Queue(), oContexto.Queue()
+   lTrabajadores = [
+      oContexto.Process(target=fTrabajadorDeScraping, args=(oColaTareas, oColaResultados, iTiempoSleep, fAbrirNavegador, bRutaRapidaHttp), daemon=True)
+      for _ in range(max(1, iNumeroDeNavegadores))
+   ]
+   for oTrabajador in lTrabajadores:
+      oTrabajador.start()
+
+   # Primero todas las páginas de componentes; las empresas se encolan según llegan sus índices
+   for iIndice, sIndice in enumerate(lIndices):
+      oColaTareas.put(("indice", iIndice, None, sIndice, None))
+
+   lEmpresasPorIndice = [None] * len(lIndices)
+   lEnlacesPorIndice = [None] * len(lIndices)
+   lPendientesPorIndice = [None] * len(lIndices)
+   iSiguienteIndice = 0
+   oBarra = tqdm(total=len(lIndices), desc="Procesando páginas", unit="página")
+   try:
+      while iSiguienteIndice < len(lIndices):
+         try:
+            sTipo, iIndice, iPosicion, oResultado, dRendimiento = oColaResultados.get(timeout=fEsperaMaxima)
+         except queue.Empty:
+            if not any(oTrabajador.is_alive() for oTrabajador in lTrabajadores):
+               print("\nERROR   - fScrapearEnParalelo - Todos los trabajadores han terminado antes de completar el scraping \n")
+               break
+            continue
+         oBarra.update(1)
+         for sClave, iPaginas in dRendimiento.items():
+            dRendimientoTotal[sClave] += iPaginas
+
+         if sTipo == "indice":
+            lEnlaces = oResultado[iSaltarEmpresa:] if iIndice == 0 else oResultado
+            sSufijo, _ = fObtenerIndice(lIndices[iIndice])
+            lEmpresasPorIndice[iIndice] = [None] * len(lEnlaces)
+            lEnlacesPorIndice[iIndice] = lEnlaces
+            lPendientesPorIndice[iIndice] = 0
+            if oMapa is not None:
+               oMapa.fMarcarVistos(lEnlaces)
+            for iPosicionEmpresa, sEnlace in enumerate(lEnlaces):
+               # Las empresas conocidas se resuelven con el mapa, sin encolar su página
+               dConocida = oMapa.fObtener(sEnlace, sSufijo) if oMapa is not None else None
+               if dConocida:
+                  lEmpresasPorIndice[iIndice][iPosicionEmpresa] = dConocida
+                  dRendimientoTotal["iConocidas"] += 1
+               else:
+                  oColaTareas.put(("empresa", iIndice, iPosicionEmpresa, sEnlace, sSufijo))
+                  lPendientesPorIndice[iIndice] += 1
+            oBarra.total += lPendientesPorIndice[iIndice]
+            oBarra.refresh()
+         else:
+            lEmpresasPorIndice[iIndice][iPosicion] = oResultado
+            lPendientesPorIndice[iIndice] -= 1
+            if oResultado and oMapa is not None:
+               oMapa.fGuardar(lEnlacesPorIndice[iIndice][iPosicion], oResultado, fObtenerIndice(lIndices[iIndice])[0])
+
+         # Confirmar en orden los índices ya completos
+         while iSiguienteIndice < len(lIndices) and lPendientesPorIndice[iSiguienteIndice] == 0:
+            fAlConfirmarIndice(lIndices[iSiguienteIndice], [dEmpresa for dEmpresa in lEmpresasPorIndice[iSiguienteIndice] if dEmpresa])
+            lEmpresasPorIndice[iSiguienteIndice] = None
+            lEnlacesPorIndice[iSiguienteIndice] = None
+            iSiguienteIndice += 1
+   finally:
+      oBarra.close()
+      for _ in lTrabajadores:
+         oColaTareas.put(None)
+      for oTrabajador in lTrabajadores:
+         oTrabajador.join(timeout=60)
+         if oTrabajador.is_alive():
+            oTrabajador.terminate()
+   return dRendimientoTotal
+
+
+def fObtenerTickers(iNumeroDeNavegadores: int = None, fAbrirNavegador=fAbrirNavegador, bRutaRapidaHttp: bool = None,
+                    bMapaDeEnlaces: bool = None) -> None:
    """
    Función principal para el scraping de tickers de los mercados en la pagina de https://www.investing.com/indices/major-indices
+
+   Parámetros:
+      iNumeroDeNavegadores (int): Navegadores en paralelo (por defecto, el de Config.json; 1 = secuencial).
+      fAbrirNavegador (callable): Fábrica del navegador (por defecto, SeleniumBase con undetected-chromedriver).
+      bRutaRapidaHttp (bool): Intentar las páginas de las empresas sin navegador (por defecto, el de Config.json).
+      bMapaDeEnlaces (bool): Usar el mapa persistente de enlaces de empresas (por defecto, el de Config.json).
    """
    ########################### CONFIGURACION ###########################
-   try:
-      with open(sCONFIG_PATH, 'r') as sFicheroConfig:
-         dConfiguracion = json.load(sFicheroConfig)
-      # Obtener los valores de SCRAPEADOR_DE_TICKERS
-      dConfigGeneral = dConfiguracion['SCRAPEADOR_DE_TICKERS']
-      iSaltarIndice = int(dConfigGeneral['iSaltarIndice'])
-      iSaltarEmpresa = int(dConfigGeneral['iSaltarEmpresa'])
-      iTiempoSleep = int(dConfigGeneral['iTiempoSleep'])
-   except FileNotFoundError:
-      print(f"ERROR   - fScrapeadorIdealista: El archivo {sCONFIG_PATH} no se encuentra. \n")
-   except KeyError as e:
-      print(f"ERROR   - fScrapeadorIdealista: Clave no encontrada en el archivo JSON: {e} \n")
+   dConfigGeneral = fCargarConfiguracionDelScraper()
+   iSaltarIndice = dConfigGeneral['iSaltarIndice']
+   iSaltarEmpresa = dConfigGeneral['iSaltarEmpresa']
+   iTiempoSleep = dConfigGeneral['iTiempoSleep']
+   if iNumeroDeNavegadores is None:
+      iNumeroDeNavegadores = dConfigGeneral['iNumeroDeNavegadores']
+   if bRutaRapidaHttp is None:
+      bRutaRapidaHttp = dConfigGeneral['bRutaRapidaHttp']
 
-   
    # Lista para almacenar las empresas de los indices
    lEmpresasDelIndice = []
-   # Lista para almacenar los datos extraídos de las empresas
-   lDatosEmpresas = []
    #####################################################################
 
-   # Cargar CSV de empresas ya existentes (si existe)
-   if os.path.exists(sTICKER_LIST_PATH) and os.path.getsize(sTICKER_LIST_PATH) > 0:
-      dfEmpresasExistentes = pd.read_csv(sTICKER_LIST_PATH)
-      setTickersExistentes = set(dfEmpresasExistentes['Ticker'].astype(str))
-   else:
-      dfEmpresasExistentes = pd.DataFrame(columns=['Indice', 'Nombre', 'Ticker'])
-      setTickersExistentes = set()
+   # Escritor de solo anexado del CSV de empresas y tickers ya existentes (si existe)
+   oEscritor = EscritorDeTickers(sTICKER_LIST_PATH, dConfigGeneral['iLoteDeEscritura'], dConfigGeneral['iSegundosEntreVolcados'])
+   setTickersExistentes = oEscritor.fTickersExistentes()
+   # Mapa persistente de enlaces de empresas a tickers
+   if bMapaDeEnlaces is None:
+      bMapaDeEnlaces = dConfigGeneral['bMapaDeEnlaces']
+   oMapa = MapaDeEnlaces(iDiasRevisitarEmpresas=dConfigGeneral['iDiasRevisitarEmpresas']) if bMapaDeEnlaces else None
+
+   # Obtener Indices, omitiendo la primera fila (cabecera)
+   dfIndicesDeMercado = pd.read_csv(sMAYOR_WORLD_INDICES_PATH, encoding='utf-8')
+   # Contamos el numero total de indices
+   iTotalIndices = max(0, len(dfIndicesDeMercado) - iSaltarIndice)
+   print(f"==> iTotalIndices: {iTotalIndices}")
+   fInicio = time.perf_counter()
+
+
+   ######################### Modo Paralelo #############################
+   if iNumeroDeNavegadores > 1:
+      def fAlConfirmarIndice(sIndice: str, lDatosEmpresas: list):
+         # Un único punto de escritura: descarta los tickers ya registrados (o repetidos en el propio índice)
+         iNuevas = 0
+         for dDatosEmpresa in lDatosEmpresas:
+            if dDatosEmpresa['Ticker'] not in setTickersExistentes:
+               setTickersExistentes.add(dDatosEmpresa['Ticker'])
+               oEscritor.fAnadir({**dDatosEmpresa, 'Indice': sIndice})
+               iNuevas += 1
+         print(f"\n[ÍNDICE] {sIndice}: {len(lDatosEmpresas)} empresas, {iNuevas} nuevas")
 
-   # Crear una instancia de SB con undetected-chromedriver
-   with SB(uc=True) as sbDriver:
+      with oEscritor:
+         dRendimiento = fScrapearEnParalelo(dfIndicesDeMercado.iloc[iSaltarIndice:], iNumeroDeNavegadores, iSaltarEmpresa,
+                                            iTiempoSleep, fAlConfirmarIndice, fAbrirNavegador, bRutaRapidaHttp=bRutaRapidaHttp, oMapa=oMapa)
+      if oMapa is not None:
+         oMapa.fCerrar()
+      fMostrarRendimiento(dRendimiento, time.perf_counter() - fInicio)
+      return
 
 
-   ######################## Scrapear Indices ###########################
-      # Obtener Indices, omitiendo la primera fila (cabecera)
-      dfIndicesDeMercado = pd.read_csv(sMAYOR_WORLD_INDICES_PATH, encoding='utf-8')
-      # Contamos el numero total de indices
-      iTotalIndices = max(0, len(dfIndicesDeMercado) - iSaltarIndice)
-      print(f"==> iTotalIndices: {iTotalIndices}")
+   # Sesión HTTP de la ruta rápida para las páginas de las empresas
+   oSesion = fCrearSesionHttp() if bRutaRapidaHttp else None
+   dRendimiento = fNuevoRendimiento()
+
+
+   # Crear una instancia del navegador (por defecto SB con undetected-chromedriver)
+   with oEscritor, fAbrirNavegador() as sbDriver:
 
 
    ####################### Scrapear Empresas ###########################
       # Ahora recorrer cada URL de los indices filtrados
       for iIndice, fila in enumerate(tqdm(dfIndicesDeMercado.iloc[iSaltarIndice:].itertuples(index=False), desc="Procesando índices", unit="Índice"), start=iSaltarIndice):
          sIndice = fila.Indice
-         sSufijo = fila.Sufijo if isinstance(fila.Sufijo, str) else ""
- 
-         # Construir la URL completa
-         sUrl = f"https://www.investing.com/indices/{sIndice}-components"
-         print(f"\nÍndice: {sIndice} - {sUrl}")
-         
+         sSufijo, _ = fObtenerIndice(sIndice)
+
          # Resetear el salto de Empresa al pasar a un nuevo indice
          if iIndice > iSaltarIndice:
             iSaltarEmpresa = 0 
          
-         # Obtener el HTML de la página del indice
-         oSoup = fAbrirURLYObtenerHtml(sbDriver, sUrl, '#onetrust-accept-btn-handler', iTiempoSleep)
-         lEmpresasDelIndice = fObtenerEmpresasDelIndice(oSoup, sbDriver, iTiempoSleep)
+         # Obtener los enlaces de la página de componentes del indice
+         lEmpresasDelIndice = fObtenerEnlacesDelIndice(sbDriver, sIndice, iTiempoSleep)
+         dRendimiento["iIndices"] += 1
+         if oMapa is not None:
+            oMapa.fMarcarVistos(lEmpresasDelIndice)
          # Contamos el numero total de empresas en el indice
          iTotalEmpresas = max(0, len(lEmpresasDelIndice) - iSaltarEmpresa)
          print(f"==> iTotalEmpresas: {iTotalEmpresas}")
@@ -210,9 +566,9 @@ def fObtenerTickers() -> None:
          for iEmpresa, sEnlace in enumerate(lEmpresasDelIndice[iSaltarEmpresa:], start=iSaltarEmpresa):
             print(f"==> [{iEmpresa}/{iTotalEmpresas}] Procesando empresa: {sEnlace}")
 
-            # Obtener el HTML de la página de la empresa
-            oSoup = fAbrirURLYObtenerHtml(sbDriver, sEnlace, '#onetrust-accept-btn-handler', iTiempoSleep)
-            dDatosEmpresa = fObtenerDatosEmpresas(oSoup, sEnlace, sSufijo)
+            # Obtener los datos de la empresa (mapa de enlaces, ruta rápida o navegador)
+            dDatosEmpresa = fObtenerDatosConMapa(oMapa, sEnlace, sSufijo, dRendimiento,
+                                                 lambda: fObtenerDatosDeLaEmpresa(sbDriver, oSesion, sEnlace, sSufijo, iTiempoSleep, dRendimiento))
 
             if dDatosEmpresa:
                sTickerNuevo = dDatosEmpresa['Ticker']
@@ -223,12 +579,12 @@ def fObtenerTickers() -> None:
                   # Añadir 'Indice' a los datos de empresa antes de guardarlo
                   dDatosEmpresa['Indice'] = sIndice
                   
-                  # Añadir al DataFrame en memoria
-                  dfEmpresasExistentes = pd.concat([dfEmpresasExistentes, pd.DataFrame([dDatosEmpresa])], ignore_index=True)
+                  # Anexar al CSV (por lotes)
+                  oEscritor.fAnadir(dDatosEmpresa)
                   setTickersExistentes.add(sTickerNuevo)
-
-                  # Guardar el resultado en un archivo CSV
-                  dfEmpresasExistentes.to_csv(sTICKER_LIST_PATH, index=False, encoding='utf-8')
                else:
                   print(f"[EXISTENTE] Ya registrado: {dDatosEmpresa['Nombre'].encode('ascii', errors='replace').decode()} ({sTickerNuevo})")
 
+   if oMapa is not None:
+      oMapa.fCerrar()
+   fMostrarRendimiento(dRendimiento, time.perf_counter() - fInicio)
@@ -0,0 +1,210 @@
+# Lib\TiposDeCambio.py
+import sys, os
+import csv
+import threading
+import requests
+from datetime import datetime
+from dotenv import load_dotenv
+
+"""
+================================================================================
+Tipos de Cambio (Fixer)
+--------------------------------------------------------------------------------
+
+Tabla en memoria de tipos de cambio, respaldada por Data/TiposDeCambio.csv.
+Antes de convertir importes se precargan todas las monedas necesarias con una
+única petición multi-símbolo a Fixer, y la tabla se persiste una sola vez con
+una escritura atómica (fichero temporal + os.replace).
+
+================================================================================
+"""
+
+
+# Detectar si el script está empaquetado con PyInstaller
+if getattr(sys, 'frozen', False):
+   BASE_DIR = sys._MEIPASS  # Ruta temporal generada por PyInstaller
+else:
+   # Ruta base = carpeta del proyecto
+   BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Ruta para almacenar los tipos de cambio obtenido de FIXER API
+sTIPOS_CAMBIO_PATH = os.path.join(BASE_DIR, "Data", "TiposDeCambio.csv")
+# URL por defecto de la API de Fixer (se puede sustituir con FIXER_API_URL en el .env)
+sFIXER_API_URL = "http://data.fixer.io/api/latest"
+# Columnas del CSV de tipos de cambio
+lCOLUMNAS_TIPOS_CAMBIO = ["sMonedaOrigen", "sMonedaDestino", "sTipoCambio", "sFecha"]
+
+# Cargar el archivo .env
+load_dotenv()
+
+# Diccionario global para almacenar tipos de cambio ya consultados
+dTiposDeCambio = {}
+# Diccionario para registrar fecha por combinación
+dFechasTipoCambio = {}
+# Cerrojo para que los hilos no consulten ni escriban los tipos de cambio a la vez
+oCerrojoTiposDeCambio = threading.RLock()
+
+
+
+def fObtenerTipoCambio():
+   """
+   Carga los tipos de cambio previamente guardados en el archivo CSV
+   y los almacena en el diccionario global `dTiposDeCambio`.
+   Si el archivo no existe, lo crea con los encabezados necesarios.
+   """
+   if not sTIPOS_CAMBIO_PATH:
+      print("ERROR - Ruta al archivo CSV no definida.")
+      return
+
+   # Si no existe el archivo, crearlo con encabezados
+   if not os.path.exists(sTIPOS_CAMBIO_PATH):
+      with open(sTIPOS_CAMBIO_PATH, mode="w", newline='', encoding="utf-8") as f:
+         writer = csv.DictWriter(f, fieldnames=lCOLUMNAS_TIPOS_CAMBIO)
+         writer.writeheader()
+      return  # Ya está creado, pero aún no hay datos que cargar
+
+   # Leer archivo existente
+   with open(sTIPOS_CAMBIO_PATH, mode="r", newline='', encoding="utf-8") as f:
+      reader = csv.DictReader(f)
+      for row in reader:
+         sMonedaOrigen = row["sMonedaOrigen"]
+         sMonedaDestino = row["sMonedaDestino"]
+         sTipoCambio = float(row["sTipoCambio"])
+         sFecha = row.get("sFecha", "")
+         clave = f"{sMonedaOrigen}_{sMonedaDestino}"
+         dTiposDeCambio[clave] = sTipoCambio
+         dFechasTipoCambio[clave] = sFecha
+
+
+
+def fGuardarTiposDeCambio():
+   """
+   Persiste la tabla en memoria completa en el archivo CSV con una escritura atómica:
+   se escribe un temporal en la misma carpeta, se fuerza a disco y se reemplaza el original.
+   """
+   if not sTIPOS_CAMBIO_PATH:
+      print("ERROR - Ruta al archivo CSV no definida.")
+      return
+
+   sRutaTemporal = sTIPOS_CAMBIO_PATH + ".tmp"
+   with open(sRutaTemporal, mode="w", newline='', encoding="utf-8") as f:
+      writer = csv.DictWriter(f, fieldnames=lCOLUMNAS_TIPOS_CAMBIO)
+      writer.writeheader()
+      for clave, sTipoCambio in dTiposDeCambio.items():
+         sMonedaOrigen, sMonedaDestino = clave.split("_", 1)
+         writer.writerow({
+            "sMonedaOrigen": sMonedaOrigen,
+            "sMonedaDestino": sMonedaDestino,
+            "sTipoCambio": sTipoCambio,
+            "sFecha": dFechasTipoCambio.get(clave, ""),
+         })
+      f.flush()
+      os.fsync(f.fileno())
+
+   os.replace(sRutaTemporal, sTIPOS_CAMBIO_PATH)
+
+
+
+def fPrecargarTiposDeCambio(lMonedas, sMonedaDestino="USD"):
+   """
+   Obtiene con una única petición a Fixer todos los tipos de cambio que aún no son de hoy.
+
+   Las monedas ya actualizadas hoy se reutilizan de la tabla en memoria. Las que faltan se piden
+   juntas en una consulta multi-símbolo, se guardan en memoria y la tabla se persiste una sola vez.
+
+   Parámetros:
+      lMonedas (list): Monedas origen distintas que se van a convertir (ej. ["MXN", "EUR"]).
+      sMonedaDestino (str): Código de la moneda destino (por defecto "USD").
+
+   Retorna:
+      int: Número de peticiones HTTP realizadas (0 o 1).
+   """
+   with oCerrojoTiposDeCambio:
+      # Cargar tipos de cambio desde el CSV solo una vez
+      if not dTiposDeCambio:
+         fObtenerTipoCambio()
+
+      oHoy = datetime.today().strftime("%Y-%m-%d")
+
+      # Monedas sin tipo de cambio de Hoy
+      lPendientes = sorted({
+         sMoneda for sMoneda in lMonedas
+         if sMoneda and sMoneda != sMonedaDestino and dFechasTipoCambio.get(f"{sMoneda}_{sMonedaDestino}") != oHoy
+      })
+      if not lPendientes:
+         return 0
+
+      # Obtener clave API desde variables de entorno
+      sFIXER_API_KEY = os.getenv("FIXER_API_KEY")
+      if not sFIXER_API_KEY:
+         raise Exception("No se encontró FIXER_API_KEY en las variables de entorno")
+
+      # Construir URL para consultar todos los tipos de cambio a la vez con base en EUR
+      sUrl = os.getenv("FIXER_API_URL", sFIXER_API_URL)
+      sSimbolos = ",".join(lPendientes + [sMonedaDestino])
+      sResponse = requests.get(sUrl, params={"access_key": sFIXER_API_KEY, "base": "EUR", "symbols": sSimbolos})
+      sDatos = sResponse.json()
+
+      # Verificar si la respuesta fue exitosa
+      if not sDatos.get("success", False):
+         raise Exception(sDatos.get("error", {}).get("info", "Error desconocido en respuesta de Fixer"))
+
+      dTasas = sDatos.get("rates", {})
+      if sMonedaDestino not in dTasas:
+         raise Exception(f"Moneda no encontrada en respuesta de Fixer: '{sMonedaDestino}'")
+
+      # Calcular los tipos de cambio y guardarlos en memoria
+      for sMoneda in lPendientes:
+         if not dTasas.get(sMoneda):
+            print(f"ERROR   - Moneda no encontrada en respuesta de Fixer: '{sMoneda}'")
+            continue
+         clave = f"{sMoneda}_{sMonedaDestino}"
+         dTiposDeCambio[clave] = round(dTasas[sMonedaDestino] / dTasas[sMoneda], 3)
+         dFechasTipoCambio[clave] = oHoy
+
+      # Persistir la tabla una sola vez
+      fGuardarTiposDeCambio()
+
+      return 1
+
+
+
+def fObtenerFactoresCambio(lMonedas: list, bConsultarApi: bool = True) -> dict:
+   """
+   Obtiene el factor de conversión a USD de cada moneda.
+
+   Parámetros:
+      lMonedas (list): Monedas distintas que aparecen en los datos.
+      bConsultarApi (bool): False usa solo los tipos guardados en el CSV, sin ninguna llamada de red.
+
+   Retorna:
+      dict: {sMoneda: dFactorCambio}
+   """
+   if bConsultarApi:
+      try:
+         # Una sola petición a Fixer para todas las monedas que no están al día
+         fPrecargarTiposDeCambio(lMonedas, "USD")
+      except Exception as e:
+         # Mostrar mensaje de error si la API falla: se usarán los tipos antiguos guardados en CSV
+         print(f"ERROR   - Error obteniendo tipos de cambio a USD: {e}")
+   elif not dTiposDeCambio:
+      fObtenerTipoCambio()
+
+   dFactoresCambio = {"USD": 1}
+   oHoy = datetime.today().strftime("%Y-%m-%d")
+
+   for sMoneda in lMonedas:
+      if sMoneda == "USD":
+         continue
+
+      clave = f"{sMoneda}_USD"
+      if clave in dTiposDeCambio:
+         if bConsultarApi and dFechasTipoCambio.get(clave) != oHoy:
+            print(f"INFO    - Usando tipo de cambio antiguo guardado en CSV para {clave}")
+         dFactoresCambio[sMoneda] = dTiposDeCambio[clave]
+      else:
+         # Como último recurso, usar 1 como tipo de cambio de fallback
+         print(f"ERROR   - Sin tipo de cambio para '{sMoneda}' a USD, se usará 1")
+         dFactoresCambio[sMoneda] = 1
+
+   return dFactoresCambio
@@ -0,0 +1,185 @@
+# Lib\ValidadorDeTickers.py
+import sys, os, time
+import json
+import sqlite3
+import threading
+
+"""
+================================================================================
+Validador de Tickers (Prevalidación por Lotes y Caché Negativa)
+--------------------------------------------------------------------------------
+
+Antes de pedir el `.info` de cada ticker (la llamada cara), se comprueba qué
+tickers siguen cotizando con descargas multi-símbolo de `yf.download` en lotes
+grandes: un ticker está vivo si tiene algún precio de cierre reciente.
+
+Los tickers sin cotización se guardan en una caché negativa (SQLite) y se
+omiten en las siguientes ejecuciones. Se vuelven a comprobar con un backoff
+exponencial: tras el fallo n, no se comprueban hasta pasadas
+iHorasBackoffInicial * 2^(n-1) horas (con un máximo de iHorasBackoffMaximo).
+
+================================================================================
+"""
+
+
+# Detectar si el script está empaquetado con PyInstaller
+if getattr(sys, 'frozen', False):
+   BASE_DIR = sys._MEIPASS  # Ruta temporal generada por PyInstaller
+else:
+   # Ruta base = carpeta del proyecto
+   BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Ruta de la base de datos con la caché negativa de tickers sin cotización
+sTICKERS_MUERTOS_PATH = os.path.join(BASE_DIR, "Data", "TickersMuertos.sqlite")
+# Ruta para almacenar la configuracion del VALIDADOR_DE_TICKERS
+sCONFIG_PATH = os.path.join(BASE_DIR, "Config", "Config.json")
+
+
+
+def fComprobarLoteYahoo(lTickers: list) -> set:
+   """
+   Comprueba un lote de tickers con una sola descarga multi-símbolo de Yahoo Finance.
+
+   Retorna:
+      set: Tickers con algún precio de cierre en los últimos días.
+   """
+   import yfinance as yf
+
+   dfPrecios = yf.download(lTickers, period="5d", interval="1d", progress=False, threads=True, auto_adjust=True)
+   if dfPrecios is None or dfPrecios.empty:
+      return set()
+
+   dfCierres = dfPrecios["Close"]
+   if not hasattr(dfCierres, "columns"):
+      # Un único ticker sin columnas por símbolo
+      return set(lTickers) if dfCierres.notna().any() else set()
+
+   return {str(sTicker) for sTicker, bVivo in dfCierres.notna().any().items() if bVivo}
+
+
+
+class ValidadorDeTickers:
+   """
+   Prevalidación por lotes con caché negativa y backoff exponencial.
+   """
+
+   def __init__(self, sRuta: str = sTICKERS_MUERTOS_PATH, iTamanoLote: int = 200, fHorasBackoffInicial: float = 24, fHorasBackoffMaximo: float = 720, fComprobarLote=None):
+      """
+      Parámetros:
+         sRuta (str): Ruta del fichero SQLite de la caché negativa.
+         iTamanoLote (int): Tickers por cada descarga multi-símbolo.
+         fHorasBackoffInicial (float): Horas sin volver a comprobar un ticker tras su primer fallo.
+         fHorasBackoffMaximo (float): Tope de horas sin volver a comprobarlo.
+         fComprobarLote (callable): Función lista de tickers -> set de tickers vivos (por defecto Yahoo Finance).
+      """
+      self.sRuta = sRuta
+      self.iTamanoLote = max(1, int(iTamanoLote))
+      self.fBackoffInicial = float(fHorasBackoffInicial) * 3600
+      self.fBackoffMaximo = float(fHorasBackoffMaximo) * 3600
+      self.fComprobarLote = fComprobarLote or fComprobarLoteYahoo
+      self.oCerrojo = threading.Lock()
+
+      os.makedirs(os.path.dirname(sRuta), exist_ok=True)
+      self.oConexion = sqlite3.connect(sRuta, check_same_thread=False)
+      self.oConexion.execute("CREATE TABLE IF NOT EXISTS muertos (ticker TEXT PRIMARY KEY, fallos INTEGER NOT NULL, fecha REAL NOT NULL, proxima REAL NOT NULL)")
+      self.oConexion.commit()
+
+
+   def fLeerMuertos(self) -> dict:
+      """
+      Retorna:
+         dict: {sTicker: (iFallos, fProximaComprobacion)} de la caché negativa.
+      """
+      with self.oCerrojo:
+         lFilas = self.oConexion.execute("SELECT ticker, fallos, proxima FROM muertos").fetchall()
+      return {sTicker: (iFallos, fProxima) for sTicker, iFallos, fProxima in lFilas}
+
+
+   def fValidar(self, lTickers: list, oLimitador=None) -> tuple:
+      """
+      Separa los tickers vivos de los que no cotizan.
+
+      Los tickers de la caché negativa cuyo backoff no ha vencido se omiten sin comprobarlos.
+      El resto se comprueba por lotes; los que fallan entran (o suben de nivel) en la caché negativa
+      y los que vuelven a cotizar salen de ella. Si un lote entero no devuelve nada o falla la descarga,
+      el resultado no es concluyente y sus tickers se dan por vivos.
+
+      Parámetros:
+         lTickers (list): Tickers a validar.
+         oLimitador (LimitadorTokenBucket): Limitador global; cada lote consume un token.
+
+      Retorna:
+         tuple: (lVivos, lMuertosNuevos, lOmitidos), cada lista en el orden de lTickers.
+      """
+      fAhora = time.time()
+      dMuertos = self.fLeerMuertos()
+
+      lOmitidos = [sTicker for sTicker in lTickers if sTicker in dMuertos and dMuertos[sTicker][1] > fAhora]
+      setOmitidos = set(lOmitidos)
+      lAComprobar = [sTicker for sTicker in lTickers if sTicker not in setOmitidos]
+
+      setMuertos = set()
+      for iInicio in range(0, len(lAComprobar), self.iTamanoLote):
+         lLote = lAComprobar[iInicio:iInicio + self.iTamanoLote]
+         if oLimitador is not None:
+            oLimitador.fAdquirir()
+         try:
+            setVivosLote = self.fComprobarLote(lLote)
+         except Exception as e:
+            print(f"ERROR   - ValidadorDeTickers: No se pudo comprobar un lote de {len(lLote)} tickers | Detalle: {e}")
+            continue
+         if not setVivosLote:
+            # Un lote sin ningún precio suele ser un fallo de red o un bloqueo, no tickers muertos
+            continue
+         setMuertos.update(sTicker for sTicker in lLote if sTicker not in setVivosLote)
+
+      # Actualizar la caché negativa: fallos con backoff exponencial y bajas de los que vuelven a cotizar
+      lFilas = []
+      for sTicker in setMuertos:
+         iFallos = dMuertos.get(sTicker, (0, 0))[0] + 1
+         fBackoff = min(self.fBackoffMaximo, self.fBackoffInicial * 2 ** (iFallos - 1))
+         lFilas.append((sTicker, iFallos, fAhora, fAhora + fBackoff))
+      lRevividos = [(sTicker,) for sTicker in lAComprobar if sTicker in dMuertos and sTicker not in setMuertos]
+
+      with self.oCerrojo:
+         self.oConexion.executemany("INSERT OR REPLACE INTO muertos (ticker, fallos, fecha, proxima) VALUES (?, ?, ?, ?)", lFilas)
+         self.oConexion.executemany("DELETE FROM muertos WHERE ticker = ?", lRevividos)
+         self.oConexion.commit()
+
+      lVivos = [sTicker for sTicker in lAComprobar if sTicker not in setMuertos]
+      lMuertosNuevos = [sTicker for sTicker in lAComprobar if sTicker in setMuertos]
+
+      return lVivos, lMuertosNuevos, lOmitidos
+
+
+   def fCerrar(self) -> None:
+      with self.oCerrojo:
+         self.oConexion.close()
+
+
+
+def fCrearValidadorDeTickers(fComprobarLote=None):
+   """
+   Crea el validador según la sección VALIDADOR_DE_TICKERS de Config.json.
+
+   Retorna:
+      ValidadorDeTickers: El validador, o None si está desactivado.
+   """
+   dConfigGeneral = {
+      "bActivado": True,
+      "iTamanoLote": 200,
+      "iHorasBackoffInicial": 24,
+      "iHorasBackoffMaximo": 720,
+   }
+   try:
+      with open(sCONFIG_PATH, 'r') as sFicheroConfig:
+         dConfiguracion = json.load(sFicheroConfig)
+      dConfigGeneral.update(dConfiguracion.get('VALIDADOR_DE_TICKERS', {}))
+   except FileNotFoundError:
+      print(f"ERROR   - fCrearValidadorDeTickers: El archivo {sCONFIG_PATH} no se encuentra, se usan valores por defecto. \n")
+
+   if not dConfigGeneral['bActivado']:
+      return None
+
+   return ValidadorDeTickers(sTICKERS_MUERTOS_PATH, dConfigGeneral['iTamanoLote'], dConfigGeneral['iHorasBackoffInicial'],
+                             dConfigGeneral['iHorasBackoffMaximo'], fComprobarLote)
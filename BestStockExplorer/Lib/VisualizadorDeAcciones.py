@@ -17,8 +17,15 @@ else:
    # Ruta base = carpeta del proyecto
    BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 
-# Ruta para almacenar el listado con todos los datos de las empresas obtenidos de yfinance
-sDATA_STOCKS_PATH = os.path.join(BASE_DIR, "Data", "ListadoDeMejoresAcciones.xlsx")
+# Streamlit ejecuta este script desde Lib/, se añade la carpeta del proyecto para importar Lib.*
+sys.path.append(BASE_DIR)
+
+from Lib.AlmacenDeDatos import fExisteListado, sLISTADO_PATH
+from Lib.DatosDelVisualizador import (fObtenerDatos, fFirmaDeFiltros, fObtenerExportacion, fObtenerGraficosAvanzados,
+                                      fObtenerGraficoPorDimension, lFILAS_POR_PAGINA)
+from Lib.ExportacionDelVisualizador import dFORMATOS_EXPORTACION
+from Lib.GraficosDelVisualizador import fEsModoLigero, iUMBRAL_MODO_LIGERO, lMODOS_GRAFICOS
+from Lib.InstrumentacionDelVisualizador import fIniciarRerun, fEtapa, fRegistrarPreparacion, fSeccion, fFinalizarRerun
 
 
 # ================================
@@ -29,118 +36,46 @@ st.set_page_config(page_title="📊 Visualizador de Acciones", layout="wide")
 # ================================
 # CARGA DE DATOS
 # ================================
-if not os.path.exists(sDATA_STOCKS_PATH):
-   st.error(f"⚠️ El archivo `{sDATA_STOCKS_PATH}` no se encuentra.")
+if not fExisteListado():
+   st.error(f"⚠️ El archivo `{sLISTADO_PATH}` no se encuentra.")
    st.stop()
 
-dfOriginal = pd.read_excel(sDATA_STOCKS_PATH)
+# Panel de rendimiento opcional (VISUALIZADOR_DEBUG=1 o ?debug=1, ver Lib/InstrumentacionDelVisualizador.py)
+oInstrumentacion = fIniciarRerun()
 
+# Carga, filtrado de outliers y filtros explícitos cacheados por versión del fichero (ver Lib/DatosDelVisualizador.py)
+with fEtapa("Datos preparados", lCaches=["fHashDelListado", "fPrepararDatos"]) as dEtapa:
+   dDatos = fObtenerDatos()
+   dEtapa["iFilasSalida"] = len(dDatos["dfFiltradoExplicito"])
+dfOriginal = dDatos["dfOriginal"]
+dfSinOutliers = dDatos["dfSinOutliers"]
+dfFiltradoExplicito = dDatos["dfFiltradoExplicito"]
 
-# ================================
-# FILTRADO DE OUTLIERS Y FILTRADO EXPLÍCITO
-# ================================
-dfFiltrado = dfOriginal.copy()
-
-# Definir umbrales de protección
-UMBRAL_PUNTUACION = 16
-UMBRAL_CAPITALIZACION = 1_000_000_000_000
-
-# Empresas protegidas (no se les aplican filtros de outliers)
-dfProtegidas = dfOriginal[
-   (dfOriginal["Puntuación"] > UMBRAL_PUNTUACION) |
-   (dfOriginal["Capitalización ($)"] > UMBRAL_CAPITALIZACION)
-]
-
-# Empresas que sí serán filtradas
-dfFiltrables = dfOriginal.drop(dfProtegidas.index)
-
-# Reglas personalizadas
-lReglasOutliers = {
-   "P/E": {"min": True, "max": True},
-   "Dividend Yield (%)": {"min": False, "max": True},
-   "Deuda/Capital (%)": {"min": False, "max": True},
-   "ROE (%)": {"min": True, "max": True},
-   "Margen Neto (%)": {"min": True, "max": True},
-   "Margen Operativo (%)": {"min": True, "max": True},
-   "Crecimiento de Ingresos (%)": {"min": True, "max": True},
-   "Beta": {"min": False, "max": True},
-   "PEG": {"min": True, "max": True},
-   "EV/EBITDA": {"min": False, "max": True},
-}
-
-# Aplicamos filtrado de outliers solo a las empresas no protegidas
-for col, reglas in lReglasOutliers.items():
-   if col in dfFiltrables.columns:
-      q10 = dfFiltrables[col].quantile(0.10)
-      q90 = dfFiltrables[col].quantile(0.90)
-      iqr = q90 - q10
-      factor = 1.5
-      lower_bound = q10 - factor * iqr
-      upper_bound = q90 + factor * iqr
-
-      if reglas["min"] and reglas["max"]:
-         dfFiltrables.loc[(dfFiltrables[col] < lower_bound) | (dfFiltrables[col] > upper_bound), col] = None
-      elif reglas["min"]:
-         dfFiltrables.loc[(dfFiltrables[col] < lower_bound), col] = None
-      elif reglas["max"]:
-         dfFiltrables.loc[(dfFiltrables[col] > upper_bound), col] = None
-
-# Eliminar filas con NaN en los campos filtrados
-dfFiltrables = dfFiltrables.dropna(subset=list(lReglasOutliers.keys()))
-
-# Reconstruir el DataFrame con protegidas + filtradas limpias
-dfSinOutliers = pd.concat([dfProtegidas, dfFiltrables], ignore_index=True)
-
-# Aplicar filtros explícitos a TODOS los registros (sin excepciones)
-dfFiltradoExplicito = dfSinOutliers[
-   (dfSinOutliers["ROE (%)"] >= 0) &
-   (dfSinOutliers["ROE (%)"] <= 150) &
-   (dfSinOutliers["PEG"] >= -40) &
-   (dfSinOutliers["P/E"] <= 100)
-]
+fRegistrarPreparacion(dDatos)
 
 
 # ================================
 # FILTROS (SIDEBAR)
 # ================================
-st.sidebar.header("🔍 Filtros")
-# Lista de columnas categóricas que se filtrarán con selectbox
-lColumnasTexto = ["Sector", "Continente", "País"]
-lFiltrosTexto = {}
-# Crea un selectbox en la barra lateral con la opción "Todos" + las opciones únicas ordenadas de esa columna
-for col in lColumnasTexto:
-   opciones = ["Todos"] + sorted(dfFiltradoExplicito[col].dropna().unique().tolist())
-   lFiltrosTexto[col] = st.sidebar.selectbox(f"📌 Filtrar por {col}:", opciones)
-
-# Lista de columnas numéricas que se filtrarán con sliders (rangos)
-lColumnasNumericas = [
-"Puntuación", "Precio ($)", "Valor en Libros ($)", "Valor Intrínseco ($)", "P/E", "PEG", "EV/EBITDA", "ROE (%)", 
-"Margen Neto (%)", "Margen Operativo (%)", "FCF/Acción ($)", "Dividend Yield (%)", "Beta", 
-"Deuda/Capital (%)", "Crecimiento de Ingresos (%)", "Capitalización ($)"
-]
-lFiltrosNumericos = {}
-
-# Para cada columna numérica, crea un slider en la barra lateral
-for col in lColumnasNumericas:
-   if col in dfFiltradoExplicito.columns:
-      # Primero reemplaza infinitos por NaN y luego elimina los NaN
-      serie = dfFiltradoExplicito[col].replace([np.inf, -np.inf], np.nan).dropna()
-      # Define valores mínimo y máximo de la serie
-      min_val = int(serie.min()) if not serie.empty else 0
-      max_val = int(serie.max()) if not serie.empty else 1
-      # Crea un slider para seleccionar el rango deseado
-      lFiltrosNumericos[col] = st.sidebar.slider(f"📊 Rango {col}:", min_value=min_val, max_value=max_val, value=(min_val, max_val), step=1)
+with fEtapa("Filtros de la barra lateral", iFilasEntrada=len(dfFiltradoExplicito)) as dEtapa:
+   st.sidebar.header("🔍 Filtros")
+   lFiltrosTexto = {}
+   # Crea un selectbox en la barra lateral con la opción "Todos" + las opciones únicas ordenadas de esa columna
+   for col, opciones in dDatos["dOpcionesTexto"].items():
+      lFiltrosTexto[col] = st.sidebar.selectbox(f"📌 Filtrar por {col}:", opciones)
 
-dfFiltradoSideBar = dfFiltradoExplicito.copy()
+   lFiltrosNumericos = {}
 
-# Aplica los filtros categóricos (texto)
-for col, filtro in lFiltrosTexto.items():
-   if filtro != "Todos":
-      dfFiltradoSideBar = dfFiltradoSideBar[dfFiltradoSideBar[col] == filtro]
+   # Para cada columna numérica, crea un slider en la barra lateral con su rango precalculado
+   for col, (min_val, max_val) in dDatos["dRangosNumericos"].items():
+      lFiltrosNumericos[col] = st.sidebar.slider(f"📊 Rango {col}:", min_value=min_val, max_value=max_val, value=(min_val, max_val), step=1)
 
-# Aplica los filtros numéricos (por rangos)
-for col, (min_val, max_val) in lFiltrosNumericos.items():
-   dfFiltradoSideBar = dfFiltradoSideBar[(dfFiltradoSideBar[col] >= min_val) & (dfFiltradoSideBar[col] <= max_val)]
+   # Aplica los filtros categóricos y numéricos con el índice precalculado (AND de bitsets, una sola copia final)
+   aFilasFiltradas = dDatos["oIndiceDeFiltros"].fFiltrar(lFiltrosTexto, lFiltrosNumericos)
+   dfFiltradoSideBar = dfFiltradoExplicito.take(aFilasFiltradas)
+   # Identifica la combinación de filtros en las cachés de las secciones (gráficos y exportación)
+   tFirmaFiltros = fFirmaDeFiltros(lFiltrosTexto, lFiltrosNumericos)
+   dEtapa["iFilasSalida"] = len(aFilasFiltradas)
 
 
 # ================================
@@ -174,16 +109,17 @@ st.write("")
 # ================================
 # ESTADÍSTICAS DE FILTRADO
 # ================================
-st.subheader("📊 Estadísticas de Filtrado")
-col1, col2, col3, col4 = st.columns(4)
-with col1:
-   st.metric("Total original", len(dfOriginal))
-with col2:
-   st.metric("Tras outliers", len(dfSinOutliers))
-with col3:
-   st.metric("Tras filtros explícitos", len(dfFiltradoExplicito))
-with col4:
-   st.metric("Tras filtros del sidebar", len(dfFiltradoSideBar))
+with fEtapa("Estadísticas de filtrado"):
+   st.subheader("📊 Estadísticas de Filtrado")
+   col1, col2, col3, col4 = st.columns(4)
+   with col1:
+      st.metric("Total original", len(dfOriginal))
+   with col2:
+      st.metric("Tras outliers", len(dfSinOutliers))
+   with col3:
+      st.metric("Tras filtros explícitos", len(dfFiltradoExplicito))
+   with col4:
+      st.metric("Tras filtros del sidebar", len(dfFiltradoSideBar))
 st.write("")
 st.write("")
 st.write("")
@@ -192,13 +128,59 @@ st.write("")
 # ================================
 # TABLA FILTRADA
 # ================================
-st.subheader("📜 Datos Filtrados")
-st.write("""
-En esta sección, se muestran los datos que han sido filtrados según los criterios seleccionados, como el sector, 
+# Cada sección siguiente es un fragmento: sus widgets solo vuelven a ejecutar esa sección, con los datos
+# que recibió en el último rerun completo (los de la barra lateral de arriba).
+@st.fragment
+def fSeccionTabla(aFilasFiltradas, dfFiltradoSideBar):
+   with fSeccion("Tabla", iFilasEntrada=len(aFilasFiltradas)) as dEtapa:
+      st.subheader("📜 Datos Filtrados")
+      st.write("""
+   En esta sección, se muestran los datos que han sido filtrados según los criterios seleccionados, como el sector, 
 el continente, los rangos de los indicadores financieros y la eliminación de outliers. Esta tabla incluye solo 
 las acciones que cumplen con estos criterios.""")
 
-st.dataframe(dfFiltradoSideBar, height=500, use_container_width=True)
+      sModoTabla = st.radio("Modo de tabla", ["Paginada", "Completa"], horizontal=True,
+                            help="Paginada: se ordena y filtra en el servidor y solo se envía la página visible. Completa: se envían todas las filas.")
+
+      if sModoTabla == "Paginada":
+         oIndiceDeFiltros = dDatos["oIndiceDeFiltros"]
+         lColumnasTabla = dfFiltradoExplicito.columns.tolist()
+
+         col1, col2, col3, col4 = st.columns([2, 1, 2, 2])
+         with col1:
+            sColumnaOrden = st.selectbox("Ordenar por", lColumnasTabla, index=lColumnasTabla.index("Puntuación") if "Puntuación" in lColumnasTabla else 0)
+         with col2:
+            bAscendente = st.selectbox("Orden", ["Descendente", "Ascendente"]) == "Ascendente"
+         with col3:
+            sColumnaBusqueda = st.selectbox("Buscar en", lColumnasTabla, index=lColumnasTabla.index("Nombre") if "Nombre" in lColumnasTabla else 0)
+         with col4:
+            sTextoBusqueda = st.text_input("Contiene", "")
+
+         # Orden y búsqueda sobre posiciones del frame cacheado: solo se copian las filas de la página
+         aFilasTabla = oIndiceDeFiltros.fOrdenar(aFilasFiltradas, sColumnaOrden, bAscendente)
+         aFilasTabla = oIndiceDeFiltros.fBuscar(aFilasTabla, sColumnaBusqueda, sTextoBusqueda.strip())
+
+         col1, col2, col3 = st.columns([1, 1, 4])
+         with col1:
+            iFilasPorPagina = st.selectbox("Filas por página", lFILAS_POR_PAGINA, index=1)
+         iPaginas = max(1, math.ceil(len(aFilasTabla) / iFilasPorPagina))
+         # Si los filtros dejan menos páginas, se vuelve a la última que existe
+         if st.session_state.get("iPaginaTabla", 1) > iPaginas:
+            st.session_state["iPaginaTabla"] = iPaginas
+         with col2:
+            iPagina = st.number_input("Página", min_value=1, max_value=iPaginas, step=1, key="iPaginaTabla")
+         with col3:
+            st.caption(f"{len(aFilasTabla)} filas · página {iPagina} de {iPaginas}")
+
+         iInicio = (iPagina - 1) * iFilasPorPagina
+         dEtapa["iFilasSalida"] = len(aFilasTabla[iInicio:iInicio + iFilasPorPagina])
+         st.dataframe(dfFiltradoExplicito.take(aFilasTabla[iInicio:iInicio + iFilasPorPagina]), height=500, use_container_width=True)
+      else:
+         dEtapa["iFilasSalida"] = len(dfFiltradoSideBar)
+         st.dataframe(dfFiltradoSideBar, height=500, use_container_width=True)
+
+
+fSeccionTabla(aFilasFiltradas, dfFiltradoSideBar)
 st.write("")
 st.write("")
 st.write("")
@@ -207,17 +189,24 @@ st.write("")
 # ================================
 # COMPARACIÓN DE ACCIONES
 # ================================
-st.subheader("🆚 Comparar Acciones")
-st.write("""
+@st.fragment
+def fSeccionComparacion(dfFiltradoSideBar):
+   with fSeccion("Comparación", iFilasEntrada=len(dfFiltradoSideBar)) as dEtapa:
+      st.subheader("🆚 Comparar Acciones")
+      st.write("""
    Aquí puedes seleccionar varias acciones para compararlas en función de su puntuación. Al seleccionar las acciones 
    que te interesen, podrás ver cómo se comparan entre sí en términos de puntuación y sector. Esto te permitirá 
    hacer una selección más informada entre las mejores opciones.""")
-seleccion = st.multiselect("🆚 Comparar Acciones", dfFiltradoSideBar["Nombre"].unique())
-if seleccion:
-   df_Comparacion = dfFiltradoSideBar[dfFiltradoSideBar["Nombre"].isin(seleccion)]
-   st.dataframe(df_Comparacion)
-   fig_comp = px.bar( df_Comparacion, x="Nombre", y="Puntuación", color="Sector", title="Comparación de Puntuación")
-   st.plotly_chart(fig_comp, use_container_width=True)
+      seleccion = st.multiselect("🆚 Comparar Acciones", dfFiltradoSideBar["Nombre"].unique())
+      if seleccion:
+         df_Comparacion = dfFiltradoSideBar[dfFiltradoSideBar["Nombre"].isin(seleccion)]
+         dEtapa["iFilasSalida"] = len(df_Comparacion)
+         st.dataframe(df_Comparacion)
+         fig_comp = px.bar( df_Comparacion, x="Nombre", y="Puntuación", color="Sector", title="Comparación de Puntuación")
+         st.plotly_chart(fig_comp, use_container_width=True)
+
+
+fSeccionComparacion(dfFiltradoSideBar)
 st.write("")
 st.write("")
 st.write("")
@@ -226,25 +215,22 @@ st.write("")
 # ================================
 # GRÁFICAS AVANZADAS
 # ================================
-st.subheader("📊 Análisis Visual de Rentabilidad y Valor")
-
-fig1 = px.scatter(dfFiltradoSideBar, x="P/E", y="ROE (%)", size="Capitalización ($)", color="Sector",
-               title="Relación P/E vs ROE", hover_data=["Nombre"])
-st.plotly_chart(fig1, use_container_width=True)
+@st.fragment
+def fSeccionGraficos(tFirmaFiltros, dfFiltradoSideBar):
+   with fSeccion("Gráficos avanzados", iFilasEntrada=len(dfFiltradoSideBar), lCaches=["fObtenerGraficosAvanzados"]):
+      st.subheader("📊 Análisis Visual de Rentabilidad y Valor")
 
-fig2 = px.scatter(dfFiltradoSideBar, x="PEG", y="Crecimiento de Ingresos (%)", color="Sector", size="Capitalización ($)",
-               title="PEG vs Crecimiento de Ingresos", hover_data=["Nombre"])
-st.plotly_chart(fig2, use_container_width=True)
+      # Por encima del umbral: WebGL, puntos diezmados y estadísticas precalculadas (ver Lib/GraficosDelVisualizador.py)
+      sModoGraficos = st.radio("Modo de gráficos", lMODOS_GRAFICOS, horizontal=True,
+                               help=f"Automático: modo ligero con más de {iUMBRAL_MODO_LIGERO} filas.")
+      bLigero = fEsModoLigero(len(dfFiltradoSideBar), sModoGraficos)
 
-fig3 = px.box(dfFiltradoSideBar, x="Sector", y="P/E", color="Sector", title="Distribución de P/E por Sector")
-st.plotly_chart(fig3, use_container_width=True)
+      # Las cinco figuras se cachean por versión de los datos, firma de filtros y modo
+      for fig in fObtenerGraficosAvanzados(dDatos["sHash"], tFirmaFiltros, bLigero, dfFiltradoSideBar):
+         st.plotly_chart(fig, use_container_width=True)
 
-fig4 = px.histogram(dfFiltradoSideBar, x="Dividend Yield (%)", nbins=30, title="Distribución de Dividend Yield")
-st.plotly_chart(fig4, use_container_width=True)
 
-fig5 = px.scatter(dfFiltradoSideBar, x="ROE (%)", y="Margen Operativo (%)", color="Sector", size="Capitalización ($)",
-               title="ROE vs Margen Operativo", hover_data=["Nombre"])
-st.plotly_chart(fig5, use_container_width=True)
+fSeccionGraficos(tFirmaFiltros, dfFiltradoSideBar)
 st.write("")
 st.write("")
 st.write("")
@@ -252,57 +238,46 @@ st.write("")
 # ================================
 # NUEVO GRÁFICO: Países Sobrevalorados (P/E promedio)
 # ================================
-st.subheader("🌍 Análisis de Valoración por País")
+@st.fragment
+def fSeccionAnalisisPorPais():
+   with fSeccion("Análisis por país", iFilasEntrada=len(dDatos["dfAgregados"]), lCaches=["fObtenerGraficoPorDimension"]):
+      st.subheader("🌍 Análisis de Valoración por País")
 
-df_PER_Paises = dfOriginal[dfOriginal["P/E"] <= 100]
+      sDimension = st.selectbox("Agrupar por", ["País", "Sector", "Continente"])
 
+      # Agregados precalculados por GenerarMetricas (P/E de las empresas con P/E <= 100, ver Lib/AgregadosDelListado.py);
+      # no dependen de los filtros de la barra lateral
+      fig_pe_paises = fObtenerGraficoPorDimension(dDatos["sHash"], sDimension, dDatos["dfAgregados"])
+      st.plotly_chart(fig_pe_paises, use_container_width=True)
 
-# Agrupar por país y calcular estadísticas
-df_Paises = df_PER_Paises.groupby("País").agg(
-   pe_promedio=("P/E", "mean"),
-   num_empresas=("Nombre", "count")
-).reset_index()
 
-# Filtrar países con al menos 3 empresas para evitar distorsiones
-df_Paises = df_Paises[df_Paises["num_empresas"] >= 3]
+fSeccionAnalisisPorPais()
 
-# Redondear valores para mejor visualización
-df_Paises["pe_promedio"] = df_Paises["pe_promedio"].round(2)
 
-# Ordenar por P/E promedio
-df_Paises = df_Paises.sort_values(by="pe_promedio", ascending=False)
+# ================================
+# EXPORTAR RESULTADOS
+# ================================
+@st.fragment
+def fSeccionExportacion(tFirmaFiltros, dfFiltradoSideBar):
+   with fSeccion("Exportación", iFilasEntrada=len(dfFiltradoSideBar)):
+      st.subheader("📥 Exportar Resultados")
+      st.write("""
+   Si deseas guardar los resultados filtrados en un archivo (CSV, Parquet o Excel), puedes descargar el archivo desde el 
+   siguiente botón. Este archivo incluirá los datos que has filtrado y comparado, lo que te permitirá tener un registro de 
+   tus selecciones y análisis para su posterior revisión o inversión.""")
+      sFormato = st.radio("Formato", list(dFORMATOS_EXPORTACION), horizontal=True,
+                          help="CSV y Parquet son los más rápidos. Excel tarda bastante más con muchas filas.")
+      sExtension, sMime, _ = dFORMATOS_EXPORTACION[sFormato]
 
-# Crear gráfico de barras
-fig_pe_paises = px.bar(
-   df_Paises,
-   x="País",
-   y="pe_promedio",
-   color="pe_promedio",
-   text="pe_promedio",  # Mostrar el P/E promedio sobre la barra
-   title="📈 Países con Mayor P/E Promedio (potencial sobrevaloración)",
-   labels={"pe_promedio": "P/E Promedio", "num_empresas": "N° de Empresas"},
-   color_continuous_scale="Reds",
-   hover_data={"num_empresas": True, "pe_promedio": True}
-)
+      # El fichero solo se genera al pulsar el botón (y se reutiliza mientras no cambien los datos ni los filtros)
+      st.download_button("📥 Descargar Filtro", lambda: fObtenerExportacion(dDatos["sHash"], tFirmaFiltros, sFormato, dfFiltradoSideBar),
+                         file_name=f"ResultadosFiltrados.{sExtension}", mime=sMime, on_click="ignore")
 
-fig_pe_paises.update_layout(
-   xaxis_tickangle=-45,
-   yaxis_title="P/E Promedio",
-   xaxis_title="País",
-   uniformtext_minsize=8,
-   uniformtext_mode='hide'
-)
-st.plotly_chart(fig_pe_paises, use_container_width=True)
+
+fSeccionExportacion(tFirmaFiltros, dfFiltradoSideBar)
 
 
 # ================================
-# EXPORTAR RESULTADOS
+# PANEL DE RENDIMIENTO
 # ================================
-st.subheader("📥 Exportar Resultados")
-st.write("""
-   Si deseas guardar los resultados filtrados en un archivo de Excel, puedes descargar el archivo desde el siguiente 
-   botón. Este archivo incluirá los datos que has filtrado y comparado, lo que te permitirá tener un registro de 
-   tus selecciones y análisis para su posterior revisión o inversión.""")
-output = io.BytesIO()
-dfFiltradoSideBar.to_excel(output, index=False)
-st.download_button("📥 Descargar Filtro", output.getvalue(), file_name="ResultadosFiltrados.xlsx", mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+fFinalizarRerun(oInstrumentacion)
\ No newline at end of file
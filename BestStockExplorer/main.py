@@ -1,5 +1,6 @@
 # main.py
 import re, sys, os, time, io
+import argparse
 from dotenv import load_dotenv
 
 from Lib.ObtenerTickers import *
@@ -31,6 +32,18 @@ if __name__ == "__main__":
    ######################################################
 
 
+   ############### ARGUMENTOS DE EJECUCION ##############
+   oParser = argparse.ArgumentParser(description="BestStockExplorer")
+   oParser.add_argument("--resume", action="store_true", help="Reanuda fGenerarMetricas desde su diario, saltando los tickers ya evaluados")
+   oParser.add_argument("--incremental", action="store_true", help="fGenerarMetricas solo consulta los tickers nuevos o con datos caducados")
+   oParser.add_argument("--rescore", action="store_true", help="Repuntúa el listado desde la tabla de datos brutos, sin llamadas de red")
+   oArgumentos = oParser.parse_args()
+
+   # Reanudar o refrescar de forma incremental implica ejecutar el generador de metricas
+   bEjecutarfGenerarMetricas = bEjecutarfGenerarMetricas or oArgumentos.resume or oArgumentos.incremental
+   ######################################################
+
+
    ############### SCRAPEADOR DE TICKERS ################
    if bEjecutarfObtenerTickers:
       fObtenerTickers()
@@ -38,8 +51,10 @@ if __name__ == "__main__":
 
 
    ########## GENERAR METRICAS DE LAS EMPRESAS ##########
-   if bEjecutarfGenerarMetricas:
-      fGenerarMetricas()
+   if oArgumentos.rescore:
+      fReevaluarMetricas()
+   elif bEjecutarfGenerarMetricas:
+      fGenerarMetricas(bReanudar=oArgumentos.resume, bIncremental=oArgumentos.incremental)
    ######################################################
 
 